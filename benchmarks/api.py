@@ -0,0 +1,109 @@
+"""
+| Per-call cost of each API layer, measured against :class:`.SimulatedBackend`
+| Usage: python -m benchmarks.api [--json results.json]
+"""
+from __future__ import annotations
+
+import array
+import typing
+
+import win_magnification as mag
+from benchmarks import common
+from win_magnification import _functional_wrapper
+from win_magnification import _wrapper
+
+
+def get_cases(api: mag.WinMagnificationAPI, backend: mag.backends.SimulatedBackend) -> typing.List[common.Case]:
+    hwnd = backend.create_window()
+    api.window.hwnd = hwnd
+    effect = mag.const.COLOR_INVERSION_EFFECT
+    c_effect = mag.backends.MAGCOLOREFFECT(*effect)
+    float_effect = array.array('f', effect)
+    matrix = mag.tools.get_transform_matrix(2.0, 2.0, 10.0, 20.0)
+    fullscreen = api.fullscreen
+    window = api.window
+    fullscreen.color_effect.make_transition(mag.const.COLOR_INVERSION_EFFECT, mag.const.COLOR_NO_EFFECT)
+    window.color_effect.make_transition(mag.const.COLOR_INVERSION_EFFECT, mag.const.COLOR_NO_EFFECT, steps=100)
+    baked_inversion = mag.tools.TransitionTable(mag.effects.inversion, steps=100)
+    powers = iter(range(1 << 62))
+    measured = mag.metrics.MetricsBackend(backend)
+    shadowed = mag._objects.FullscreenController()
+    shadowed.use_shadow_state()
+    mapping = mag.mapping.Mapping.from_fullscreen((2.0, (10, 20)))
+    points = array.array('f', range(2000))
+    windows = mag._objects.WindowsController()
+    for _ in range(4):
+        windows.add(backend.create_window())
+
+    def set_raw_color_effect():
+        fullscreen.color_effect.raw = effect
+
+    def set_transition_power():
+        fullscreen.color_effect.transition_power = next(powers) % 100 / 100
+
+    def set_baked_transition_power():
+        window.color_effect.transition_power = next(powers) % 100 / 100
+
+    def get_scale_same():
+        return window.transform.scale.same
+
+    def set_scale_same():
+        window.transform.scale.same = 2.0
+
+    def get_source_start():
+        return window.source.start
+
+    def set_source_start():
+        window.source.start = (10, 20)
+
+    return [
+        ('tools', 'effects.inversion(...)', lambda: mag.effects.inversion(next(powers) % 100 / 100)),
+        ('tools', 'TransitionTable(effects.inversion)(...)',
+         lambda: baked_inversion(next(powers) % 100 / 100)),
+        ('tools', "Mapping.points(1000 points, array('f'))", lambda: mapping.points(points)),
+        ('backend', 'MagSetFullscreenColorEffect(prebuilt array)',
+         lambda: backend.MagSetFullscreenColorEffect(c_effect)),
+        ('backend', 'MagSetFullscreenTransform', lambda: backend.MagSetFullscreenTransform(2.0, 10, 20)),
+        ('backend', 'MagSetFullscreenTransform (metrics enabled)',
+         lambda: measured.MagSetFullscreenTransform(2.0, 10, 20)),
+        ('wrapper', 'set_fullscreen_color_effect',
+         lambda: _wrapper.set_fullscreen_color_effect(effect)),
+        ('wrapper', "set_fullscreen_color_effect(array('f'))",
+         lambda: _wrapper.set_fullscreen_color_effect(float_effect)),
+        ('wrapper', 'get_fullscreen_color_effect', _wrapper.get_fullscreen_color_effect),
+        ('wrapper', 'set_fullscreen_transform',
+         lambda: _wrapper.set_fullscreen_transform(2.0, (10, 20))),
+        ('wrapper', 'get_fullscreen_transform', _wrapper.get_fullscreen_transform),
+        ('wrapper', 'set_transform', lambda: _wrapper.set_transform(hwnd, matrix)),
+        ('wrapper', 'get_transform', lambda: _wrapper.get_transform(hwnd)),
+        ('wrapper', 'set_source', lambda: _wrapper.set_source(hwnd, (0, 0, 100, 100))),
+        ('wrapper', 'get_source', lambda: _wrapper.get_source(hwnd)),
+        ('functional', 'set_transform',
+         lambda: _functional_wrapper.set_transform(hwnd, 2.0, (10.0, 20.0))),
+        ('functional', 'get_transform', lambda: _functional_wrapper.get_transform(hwnd)),
+        ('objects', 'fullscreen.color_effect.raw = ...', set_raw_color_effect),
+        ('objects', 'fullscreen.color_effect.raw', lambda: fullscreen.color_effect.raw),
+        ('objects', 'fullscreen.color_effect.raw (shadow state)', lambda: shadowed.color_effect.raw),
+        ('objects', 'fullscreen.transform.scale (shadow state)', lambda: shadowed.transform.scale),
+        ('objects', 'windows.set_color_effect(...) (4 windows)', lambda: windows.set_color_effect(effect)),
+        ('objects', 'fullscreen.color_effect.transition_power = ...', set_transition_power),
+        ('objects', 'window.color_effect.transition_power = ... (baked)', set_baked_transition_power),
+        ('objects', 'window.transform.scale.same (Vector2)', get_scale_same),
+        ('objects', 'window.transform.scale.same = ... (Vector2)', set_scale_same),
+        ('objects', 'window.source.start (RectangleWrapper)', get_source_start),
+        ('objects', 'window.source.start = ... (RectangleWrapper)', set_source_start),
+    ]
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    backend = mag.backends.SimulatedBackend()
+    with mag.use_backend(backend):
+        api = mag.WinMagnificationAPI()
+        try:
+            return common.run(get_cases(api, backend), __doc__, argv)
+        finally:
+            api.dispose()
+
+
+if __name__ == '__main__':
+    main()
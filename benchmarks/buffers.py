@@ -0,0 +1,84 @@
+"""
+| Fresh ctypes objects per call vs reused per-thread buffers of :mod:`._wrapper`
+| Usage: python -m benchmarks.buffers [--json results.json]
+"""
+from __future__ import annotations
+
+import ctypes
+import typing
+from ctypes import wintypes
+
+import win_magnification as mag
+from benchmarks import common
+from win_magnification import _utils
+from win_magnification import _wrapper
+
+
+def get_cases(backend: mag.backends.SimulatedBackend) -> typing.List[common.Case]:
+    hwnd = backend.create_window()
+    effect = mag.const.COLOR_INVERSION_EFFECT
+    matrix = mag.tools.get_transform_matrix(2.0, 2.0, 10.0, 20.0)
+    rectangle = (0, 0, 100, 100)
+
+    # Allocate everything on each call, as wrapper did before
+    def fresh_set_color_effect():
+        _utils.handle_win_last_error(backend.MagSetFullscreenColorEffect(_utils.to_c_array(effect)))
+
+    def fresh_get_color_effect():
+        result = _utils.to_c_array((0,) * mag.const.COLOR_MATRIX_SIZE)
+        _utils.handle_win_last_error(backend.MagGetFullscreenColorEffect(result))
+        return _utils.to_py_array(result)
+
+    def fresh_get_fullscreen_transform():
+        scale = ctypes.pointer(ctypes.c_float())
+        offset_x = ctypes.pointer(ctypes.c_int())
+        offset_y = ctypes.pointer(ctypes.c_int())
+        _utils.handle_win_last_error(backend.MagGetFullscreenTransform(scale, offset_x, offset_y))
+        return scale.contents.value, (offset_x.contents.value, offset_y.contents.value)
+
+    def fresh_set_transform():
+        _utils.handle_win_last_error(backend.MagSetWindowTransform(hwnd, _utils.to_c_array(matrix)))
+
+    def fresh_get_transform():
+        result = _utils.to_c_array((0,) * mag.const.TRANSFORMATION_MATRIX_SIZE)
+        _utils.handle_win_last_error(backend.MagGetWindowTransform(hwnd, result))
+        return _utils.to_py_array(result)
+
+    def fresh_set_source():
+        _utils.handle_win_last_error(backend.MagSetWindowSource(hwnd, wintypes.RECT(*rectangle)))
+
+    def fresh_get_source():
+        result = ctypes.pointer(wintypes.RECT(0, 0, 0, 0))
+        _utils.handle_win_last_error(backend.MagGetWindowSource(hwnd, result))
+        return _utils.to_py_rectangle(result.contents)
+
+    return [
+        ('fresh', 'set_fullscreen_color_effect', fresh_set_color_effect),
+        ('reused', 'set_fullscreen_color_effect', lambda: _wrapper.set_fullscreen_color_effect(effect)),
+        ('fresh', 'get_fullscreen_color_effect', fresh_get_color_effect),
+        ('reused', 'get_fullscreen_color_effect', _wrapper.get_fullscreen_color_effect),
+        ('fresh', 'get_fullscreen_transform', fresh_get_fullscreen_transform),
+        ('reused', 'get_fullscreen_transform', _wrapper.get_fullscreen_transform),
+        ('fresh', 'set_transform', fresh_set_transform),
+        ('reused', 'set_transform', lambda: _wrapper.set_transform(hwnd, matrix)),
+        ('fresh', 'get_transform', fresh_get_transform),
+        ('reused', 'get_transform', lambda: _wrapper.get_transform(hwnd)),
+        ('fresh', 'set_source', fresh_set_source),
+        ('reused', 'set_source', lambda: _wrapper.set_source(hwnd, rectangle)),
+        ('fresh', 'get_source', fresh_get_source),
+        ('reused', 'get_source', lambda: _wrapper.get_source(hwnd)),
+    ]
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    backend = mag.backends.SimulatedBackend()
+    with mag.use_backend(backend):
+        mag.initialize()
+        try:
+            return common.run(get_cases(backend), __doc__, argv)
+        finally:
+            mag.finalize()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+| Shared helpers for benchmarks
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import typing
+
+Case = typing.Tuple[str, str, typing.Callable[[], typing.Any]]
+"""Tuple of (**layer**, **name**, **function** to measure)"""
+
+
+class Result(typing.NamedTuple):
+    layer: str
+    name: str
+    calls: int
+    ns_per_call: float
+    alloc_bytes_per_call: float
+    """Peak of memory allocated during call (freed or not)"""
+    blocks_per_call: float
+    """Memory blocks left allocated after call"""
+
+
+def _time_calls(function: typing.Callable[[], typing.Any], calls: int) -> int:
+    loop = range(calls)
+    start = time.perf_counter_ns()
+    for _ in loop:
+        function()
+    return time.perf_counter_ns() - start
+
+
+def _measure_allocations(function: typing.Callable[[], typing.Any], calls: int):
+    peak_total = 0
+    tracemalloc.start()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        for _ in range(calls):
+            current, _ = tracemalloc.get_traced_memory()
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            function()
+            peak_total += tracemalloc.get_traced_memory()[1] - current
+        blocks = sys.getallocatedblocks() - blocks_before
+    finally:
+        tracemalloc.stop()
+    return peak_total / calls, blocks / calls
+
+
+def measure(
+    layer: str,
+    name: str,
+    function: typing.Callable[[], typing.Any],
+    calls: int = 10000,
+    repeat: int = 5,
+) -> Result:
+    """
+    Measures **function** call cost: best of **repeat** runs for time,
+    separate traced run for allocations
+
+    :param layer: Group name
+    :param name: Case name
+    :param function: Function to call
+    :param calls: Calls per run
+    :param repeat: Count of runs
+    :return: Measurement result
+    """
+    function()  # Warm up caches
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        best = min(_time_calls(function, calls) for _ in range(repeat))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    alloc_bytes, blocks = _measure_allocations(function, min(calls, 1000))
+    return Result(layer, name, calls, best / calls, alloc_bytes, blocks)
+
+
+def report(results: typing.Sequence[Result], json_path: typing.Optional[str] = None):
+    """
+    Prints results table and optionally saves them as JSON
+
+    :param results: Measurement results
+    :param json_path: Path to JSON output file or '-' for stdout
+    """
+    if json_path:
+        data = {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'results': [result._asdict() for result in results],
+        }
+        if json_path == '-':
+            json.dump(data, sys.stdout, indent=2)
+            print()
+            return
+        with open(json_path, 'w') as file:
+            json.dump(data, file, indent=2)
+    name_width = max((len(f"{result.layer}: {result.name}") for result in results), default=0)
+    print(f"{'case':<{name_width}} {'ns/call':>10} {'bytes/call':>11} {'blocks/call':>12}")
+    for result in results:
+        print(
+            f"{result.layer + ': ' + result.name:<{name_width}} "
+            f"{result.ns_per_call:>10.1f} "
+            f"{result.alloc_bytes_per_call:>11.1f} "
+            f"{result.blocks_per_call:>12.2f}"
+        )
+
+
+def run(
+    cases: typing.Iterable[Case],
+    description: str,
+    argv: typing.Optional[typing.List[str]] = None,
+    calls: int = 10000,
+    repeat: int = 5,
+):
+    """
+    Command line entry point of benchmark modules
+
+    :param cases: Cases to measure
+    :param description: Help message
+    :param argv: Command line arguments (default: sys.argv)
+    :param calls: Default calls per run
+    :param repeat: Default count of runs
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--calls', type=int, default=calls, help="calls per run")
+    parser.add_argument('--repeat', type=int, default=repeat, help="runs per case, best one is used")
+    parser.add_argument('--filter', default='', help="run only cases containing this text")
+    parser.add_argument('--json', metavar='PATH', help="save machine-readable results ('-' for stdout)")
+    args = parser.parse_args(argv)
+    results = [
+        measure(layer, name, function, args.calls, args.repeat)
+        for layer, name, function in cases
+        if args.filter in f"{layer}: {name}"
+    ]
+    report(results, args.json)
+    return results
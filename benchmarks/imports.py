@@ -0,0 +1,36 @@
+"""
+| Import time of :mod:`win_magnification`, each call is a new interpreter
+| Usage: python -m benchmarks.imports [--json results.json]
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+import typing
+
+from benchmarks import common
+
+
+def _python(code: str) -> typing.Callable[[], None]:
+    def run():
+        subprocess.run((sys.executable, '-c', code), check=True)
+    return run
+
+
+def get_cases() -> typing.List[common.Case]:
+    return [
+        ('baseline', 'empty interpreter', _python('pass')),
+        ('import', 'win_magnification', _python('import win_magnification')),
+        ('import', 'win_magnification.const', _python('import win_magnification.const')),
+        ('import', 'win_magnification.effects', _python('import win_magnification.effects')),
+        ('import', 'win_magnification + WinMagnificationAPI',
+         _python('import win_magnification; win_magnification.WinMagnificationAPI')),
+    ]
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    return common.run(get_cases(), __doc__, argv, calls=20, repeat=3)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+| Construction and arithmetic of :class:`.tools.Matrix`
+| Usage: python -m benchmarks.matrix [--json results.json]
+"""
+from __future__ import annotations
+
+import typing
+
+import win_magnification as mag
+from benchmarks import common
+
+Matrix = mag.tools.Matrix
+
+
+def get_cases() -> typing.List[common.Case]:
+    grayscale = mag.const.COLOR_GRAYSCALE_EFFECT
+    square = tuple(
+        grayscale[i:i + 5] for i in range(0, mag.const.COLOR_MATRIX_SIZE, 5)
+    )
+    first = Matrix.from_linear(grayscale)
+    second = Matrix.from_linear(mag.const.COLOR_INVERSION_EFFECT)
+    rounded = Matrix.from_linear(grayscale, precision=Matrix._ACCURACY)
+    inversion = mag.const.COLOR_INVERSION_EFFECT
+    general = mag.effects.contrast(0.5)[:-1] + (0.5,)
+    transform = mag.tools.get_transform_matrix(2.0, 2.0, 10.0, 20.0)
+    frames = [mag.effects.inversion(i / 60) for i in range(60)]
+
+    def generic_chain():
+        result = frames[0]
+        for frame in frames[1:]:
+            result = mag.tools._combine_generic(result, frame)
+        return result
+
+    def pairwise_chain():
+        result = frames[0]
+        for frame in frames[1:]:
+            result = mag.tools.combine_matrices(result, frame)
+        return result
+
+    def generic_each():
+        return [mag.tools._combine_generic(grayscale, frame) for frame in frames]
+
+    return [
+        ('construct', 'Matrix.from_linear', lambda: Matrix.from_linear(grayscale)),
+        ('construct', 'Matrix.from_any(linear)', lambda: Matrix.from_any(grayscale)),
+        ('construct', 'Matrix.from_any(square)', lambda: Matrix.from_any(square)),
+        ('construct', 'Matrix.from_linear(precision=9)',
+         lambda: Matrix.from_linear(grayscale, precision=Matrix._ACCURACY)),
+        ('multiply', 'generic 5x5', lambda: mag.tools._combine_generic(grayscale, inversion)),
+        ('multiply', 'combine_matrices 5x5 (affine)', lambda: mag.tools.combine_matrices(grayscale, inversion)),
+        ('multiply', 'generic 5x5 (non-affine)', lambda: mag.tools._combine_generic(grayscale, general)),
+        ('multiply', 'combine_matrices 5x5 (non-affine)', lambda: mag.tools.combine_matrices(grayscale, general)),
+        ('multiply', 'generic 3x3', lambda: mag.tools._combine_generic(transform, transform)),
+        ('multiply', 'combine_matrices 3x3 (affine)', lambda: mag.tools.combine_matrices(transform, transform)),
+        ('batch', 'generic chain of 60', generic_chain),
+        ('batch', 'combine_matrices chain of 60', pairwise_chain),
+        ('batch', 'combine_chain of 60', lambda: mag.tools.combine_chain(frames)),
+        ('batch', 'generic each of 60', generic_each),
+        ('batch', 'combine_each of 60', lambda: mag.tools.combine_each(grayscale, frames)),
+        ('arithmetic', 'Matrix @ Matrix', lambda: first @ second),
+        ('arithmetic', 'Matrix @ Matrix (precision=9)', lambda: rounded @ second),
+        ('arithmetic', 'Matrix * number', lambda: first * 0.5),
+        ('arithmetic', 'Matrix + Matrix', lambda: first + second),
+        ('arithmetic', 'Matrix - number', lambda: first - 1),
+        ('access', 'Matrix.linear', lambda: first.linear),
+        ('access', 'Matrix.square', lambda: first.square),
+    ]
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    return common.run(get_cases(), __doc__, argv)
+
+
+if __name__ == '__main__':
+    main()
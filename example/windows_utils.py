@@ -259,14 +259,33 @@ class BasicWindow(AbstractWindow, abc.ABC):
 class MagnifierWindow(BasicWindow):
     window_class_name = "Py_CustomMagnifierWindowHost"
 
+    frame_rate = 60
+
     def __init__(self):
         super().__init__()
         self.magnifier_hwnd: typing.Optional[int] = None
         self.__magnifier: typing.Optional[mag.WinMagnificationAPI] = None
+        self.__frame_timer: typing.Optional[int] = None
+        # Move/size/paint come in bursts while dragging,
+        # so source is written once per frame timer tick and only when changed
+        self.source_tracker = mag.tracking.SourceTracker(self._write_source, fps=self.frame_rate)
 
     def create_window(self):
         self.__magnifier = mag.WinMagnificationAPI()
+        self.source_tracker.reset()
         super().create_window()
+        self.__frame_timer = timer.set_timer(int(1000 / self.frame_rate), self._on_frame)
+
+    def _write_source(self, rectangle: mag.types.Rectangle):
+        self.controller.source.raw = rectangle
+
+    # noinspection PyUnusedLocal
+    def _on_frame(self, timer_id: int, time: int):
+        self.source_tracker.flush(force=True)
+
+    def _sync_source(self):
+        self.source_tracker.notify(self.current_rectangle)
+        self.source_tracker.flush(force=True)
 
     def _create_window(self):
         self._create_host_window()
@@ -306,6 +325,9 @@ class MagnifierWindow(BasicWindow):
         win32gui.SetLayeredWindowAttributes(self.hwnd, 0, 255, win32con.LWA_ALPHA)
 
     def _close(self):
+        if self.__frame_timer is not None:
+            timer.kill_timer(self.__frame_timer)
+            self.__frame_timer = None
         super()._close()
         self.magnifier_hwnd = None
 
@@ -317,11 +339,18 @@ class MagnifierWindow(BasicWindow):
     def controller(self):
         return self.__magnifier.window
 
+    @BasicWindow.fullscreen_mode.setter  # type: ignore
+    def fullscreen_mode(self, value):
+        BasicWindow.fullscreen_mode.fset(self, value)
+        if self.is_alive:
+            self._execute(self._sync_source)
+
     @win_event(win32con.WM_SIZE)
     def _on_resize(self):
         if not self.fullscreen_mode:
             self.size = win32gui.GetClientRect(self.hwnd)[2:]
         win32gui.SetWindowPos(self.magnifier_hwnd, 0, *win32gui.GetClientRect(self.hwnd), 0)
+        self.source_tracker.notify(self.current_rectangle)
 
     @win_event(win32con.WM_MOVE)
     def _on_move(self):
@@ -331,13 +360,14 @@ class MagnifierWindow(BasicWindow):
         self.position[0] += 2*win32api.GetSystemMetrics(win32con.SM_CXFRAME)
         self.position[1] += 2*win32api.GetSystemMetrics(win32con.SM_CYFRAME)
         self.position[1] += win32api.GetSystemMetrics(win32con.SM_CYCAPTION)
+        self.source_tracker.notify(self.current_rectangle)
 
     @win_event(win32con.WM_PAINT)
     def _draw(self):
         if not self.is_alive:
             return
 
-        self.controller.source.raw = self.current_rectangle
+        self.source_tracker.notify(self.current_rectangle)
 
         if self.hwnd is None:
             return
@@ -1,8 +1,18 @@
+import array
+import asyncio
+import ctypes
+import decimal
 import doctest
+import fractions
 import inspect
+import io
+import random
+import subprocess
+import sys
 import threading
 import time
 import unittest
+import unittest.mock
 from contextlib import suppress
 from itertools import cycle
 
@@ -26,6 +36,15 @@ def load_tests(loader, tests, ignore):
     return tests
 
 
+class SimulatedBackendTestCase(unittest.TestCase):
+    """Runs each test with fresh :class:`.SimulatedBackend` set as current one"""
+    backend_options: dict = {}
+
+    def setUp(self):
+        self.backend = mag.backends.SimulatedBackend(**self.backend_options)
+        self.addCleanup(mag.set_backend, mag.set_backend(self.backend))
+
+
 # noinspection PyMethodMayBeStatic
 class InitFinalizeTest(unittest.TestCase):
     def test_init_finalize(self):
@@ -208,6 +227,1270 @@ class NoControlWindowThreaded(unittest.TestCase):
             task.join()
 
 
+class SimulatedBackendTest(SimulatedBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        mag.initialize()
+        self.hwnd = self.backend.create_window()
+
+    def tearDown(self):
+        mag.finalize()
+
+    def test_baked_transition_matches(self):
+        baked = mag._objects.CustomWindowController(self.hwnd)
+        computed = mag._objects.CustomWindowController(self.backend.create_window())
+        steps = 20
+        end, start = mag.const.COLOR_INVERSION_EFFECT, mag.const.COLOR_GRAYSCALE_EFFECT
+        baked.color_effect.make_transition(end, start, steps=steps)
+        computed.color_effect.make_transition(end, start)
+        for step in range(steps + 1):
+            baked.color_effect.transition_power = computed.color_effect.transition_power = step / steps
+            expected = self.backend.windows[computed.hwnd].color_effect
+            for actual, value in zip(self.backend.windows[baked.hwnd].color_effect, expected):
+                self.assertAlmostEqual(actual, value, delta=1e-6 * max(1.0, abs(value)))
+
+    def test_fullscreen_state(self):
+        mag.set_fullscreen_transform(2.0, (10, 20))
+        self.assertEqual(mag.get_fullscreen_transform(), (2.0, (10, 20)))
+        self.assertEqual(self.backend.fullscreen_transform, (2.0, (10, 20)))
+        mag.set_fullscreen_color_effect(mag.effects.inversion(0.3))
+        # Values are stored with float precision
+        self.assertNotEqual(mag.get_fullscreen_color_effect(), mag.effects.inversion(0.3))
+        for actual, expected in zip(mag.get_fullscreen_color_effect(), mag.effects.inversion(0.3)):
+            self.assertAlmostEqual(actual, expected, 6)
+        mag.set_cursor_visibility(False)
+        self.assertFalse(self.backend.cursor_visible)
+
+    def test_validation(self):
+        with self.assertRaises(OSError) as context:
+            mag.set_fullscreen_transform(0.5, (0, 0))
+        self.assertEqual(context.exception.winerror, mag.backends.ERROR_INVALID_PARAMETER)
+        self.assertRaises(OSError, mag.set_fullscreen_transform, 2.0, (262145, 0))
+        self.assertEqual(mag.get_fullscreen_transform(), mag.const.DEFAULT_FULLSCREEN_TRANSFORM)
+        with self.assertRaises(OSError) as context:
+            mag.set_input_transform(True, (0, 0, 2, 2), (0, 0, 3, 3))
+        self.assertEqual(context.exception.winerror, mag.backends.ERROR_ACCESS_DENIED)
+        self.backend.ui_access = True
+        self.assertRaises(OSError, mag.set_input_transform, True, (0, 0, 0, 0), (0, 0, 3, 3))
+        mag.set_input_transform(True, (0, 0, 2, 2), (0, 0, 3, 3))
+        self.assertEqual(mag.get_input_transform(), (True, (0, 0, 2, 2), (0, 0, 3, 3)))
+        with self.assertRaises(OSError) as context:
+            mag.get_source(self.hwnd + 1)
+        self.assertEqual(context.exception.winerror, mag.backends.ERROR_INVALID_WINDOW_HANDLE)
+        self.assertRaises(RuntimeError, mag.get_filters, self.hwnd + 1)
+        self.assertRaises(OSError, mag.set_filters, self.hwnd, 1, exclude=False)
+
+    def test_window_state(self):
+        mag.set_transform(self.hwnd, 2.0, (3.0, 4.0))
+        self.assertEqual(mag.get_transform(self.hwnd), ((2.0, 2.0), (3.0, 4.0)))
+        mag.set_source(self.hwnd, (1, 2, 3, 4))
+        self.assertEqual(mag.get_source(self.hwnd), (1, 2, 3, 4))
+        mag.set_filters(self.hwnd, 5, 6, 7)
+        self.assertEqual(mag.get_filters(self.hwnd), (True, (5, 6, 7)))
+        mag.set_color_effect(self.hwnd, mag.const.COLOR_INVERSION_EFFECT)
+        self.assertEqual(mag.get_color_effect(self.hwnd), mag.const.COLOR_INVERSION_EFFECT)
+        mag.set_color_effect(self.hwnd, None)
+        self.assertEqual(mag.get_color_effect(self.hwnd), mag.const.DEFAULT_COLOR_EFFECT)
+
+    def test_object_layer(self):
+        window = mag._objects.CustomWindowController()
+        window.hwnd = self.hwnd
+        window.transform.scale.same = 1.5
+        self.assertEqual(window.transform.pair, ((1.5, 1.5), (0.0, 0.0)))
+        window.source.same = 8
+        self.assertEqual(self.backend.windows[self.hwnd].source, (8, 8, 8, 8))
+
+    def test_observed_fields(self):
+        self.assertEqual(mag._objects.SourceRectangleWrapper._observed_fields, ('left', 'top', 'right', 'bottom'))
+        self.assertEqual(mag._objects.ColorMatrixWrapper._observed_fields, ('_value',))
+        window = mag._objects.CustomWindowController()
+        window.hwnd = self.hwnd
+        mag.set_source(self.hwnd, (1, 2, 3, 4))
+        source = window.source
+        calls = self.backend.calls['MagGetWindowSource']
+        self.assertFalse(source._batching_changes)
+        self.assertEqual(source.default.raw, mag.const.DEFAULT_SOURCE)
+        self.assertEqual(self.backend.calls['MagGetWindowSource'], calls)
+        self.assertEqual(source.left, 1)
+        self.assertEqual(self.backend.calls['MagGetWindowSource'], calls + 1)
+        with source.batch():
+            self.assertEqual((source.right, source.bottom), (3, 4))
+        self.assertEqual(self.backend.calls['MagGetWindowSource'], calls + 2)
+        source.top = 5
+        self.assertEqual(self.backend.windows[self.hwnd].source, (1, 5, 3, 4))
+        del source.top
+        self.assertEqual(self.backend.windows[self.hwnd].source, (1, 0, 3, 4))
+
+    def test_effect_stack(self):
+        window = mag._objects.CustomWindowController()
+        window.hwnd = self.hwnd
+        stack = window.color_effect.stack
+        layers = [
+            stack.add(mag.effects.grayscale, 0.0),
+            stack.add(mag.effects.contrast, 0.0),
+            stack.add(mag.effects.inversion),
+        ]
+        self.assertEqual(window.color_effect.linear, mag.const.COLOR_INVERSION_EFFECT)
+        with unittest.mock.patch.object(
+            mag.tools, 'combine_matrices', wraps=mag.tools.combine_matrices
+        ) as combine_matrices:
+            layers[1].power = 0.5
+            combine_matrices.reset_mock()
+            for power in (0.6, 0.7, 0.8):
+                layers[1].power = power
+            self.assertEqual(combine_matrices.call_count, 6)
+        expected = mag.tools.Matrix.from_linear(mag.const.COLOR_NO_EFFECT)
+        for layer in layers:
+            expected @= layer.matrix
+        for actual, expected in zip(window.color_effect.linear, expected.linear):
+            self.assertAlmostEqual(actual, expected, 6)
+        calls = self.backend.calls['MagSetColorEffect']
+        with stack.batch():
+            layers[0].power = 1.0
+            layers[2].power = 0.0
+            stack.remove(layers[1])
+        self.assertEqual(self.backend.calls['MagSetColorEffect'], calls + 1)
+        self.assertEqual(mag.tools.Matrix.from_linear(stack.result, precision=9).linear, mag.const.COLOR_GRAYSCALE_EFFECT)
+        # Removed layers don't affect stack anymore
+        calls = self.backend.calls['MagSetColorEffect']
+        layers[1].power = 1.0
+        self.assertEqual(self.backend.calls['MagSetColorEffect'], calls)
+        stack.clear()
+        self.assertEqual(window.color_effect.linear, mag.const.COLOR_NO_EFFECT)
+        layers[0].power = 0.5
+        self.assertEqual(window.color_effect.linear, mag.const.COLOR_NO_EFFECT)
+
+    def test_buffers_reused(self):
+        received = []
+        set_effect = self.backend.MagSetFullscreenColorEffect
+        self.backend.MagSetFullscreenColorEffect = lambda effect: received.append(effect) or set_effect(effect)
+        mag.set_fullscreen_color_effect(mag.const.COLOR_INVERSION_EFFECT)
+        mag.set_fullscreen_color_effect(mag.const.DEFAULT_COLOR_EFFECT)
+        self.assertIs(received[0], received[1])
+        self.assertEqual(mag.get_fullscreen_color_effect(), mag.const.DEFAULT_COLOR_EFFECT)
+        self.assertRaises(ValueError, mag.set_fullscreen_color_effect, (1.0,))
+
+    def test_buffer_protocol_setters(self):
+        received = []
+        set_transform = self.backend.MagSetWindowTransform
+        self.backend.MagSetWindowTransform = lambda hwnd, matrix: received.append(matrix) or set_transform(hwnd, matrix)
+        matrix = array.array('f', mag.tools.get_transform_matrix(2.0, 2.0, 1.0, 1.0))
+        mag.set_transform_advanced(self.hwnd, matrix)
+        self.assertEqual(ctypes.addressof(received[-1]), matrix.buffer_info()[0])
+        self.assertEqual(mag.get_transform(self.hwnd), ((2.0, 2.0), (1.0, 1.0)))
+        # Other types are copied
+        mag.set_transform_advanced(self.hwnd, array.array('d', mag.const.DEFAULT_TRANSFORM))
+        self.assertNotEqual(ctypes.addressof(received[-1]), matrix.buffer_info()[0])
+        self.assertEqual(mag.get_transform_advanced(self.hwnd), mag.const.DEFAULT_TRANSFORM)
+        frames = array.array('f', mag.const.COLOR_NO_EFFECT + mag.const.COLOR_INVERSION_EFFECT)
+        mag.set_fullscreen_color_effect(memoryview(frames)[mag.const.COLOR_MATRIX_SIZE:])
+        self.assertEqual(mag.get_fullscreen_color_effect(), mag.const.COLOR_INVERSION_EFFECT)
+        mag.set_color_effect(self.hwnd, frames[:mag.const.COLOR_MATRIX_SIZE])
+        self.assertEqual(mag.get_color_effect(self.hwnd), mag.const.COLOR_NO_EFFECT)
+
+    def test_write_deduplication(self):
+        deduplicator = mag.deduplicator
+        deduplicator.enabled = True
+        self.addCleanup(setattr, deduplicator, 'enabled', False)
+        deduplicator.reset_counters()
+        for _ in range(3):
+            mag.set_fullscreen_color_effect(mag.effects.inversion(0.3))
+            mag.set_fullscreen_transform(2.0, (1, 1))
+            mag.set_source(self.hwnd, (0, 0, 10, 10))
+        self.assertEqual(self.backend.calls['MagSetFullscreenColorEffect'], 1)
+        self.assertEqual(self.backend.calls['MagSetFullscreenTransform'], 1)
+        self.assertEqual(self.backend.calls['MagSetWindowSource'], 1)
+        self.assertEqual((deduplicator.hits, deduplicator.misses), (6, 3))
+        # Compared with float precision
+        almost_same = tuple(value * (1 + 1e-12) for value in mag.effects.inversion(0.3))
+        mag.set_fullscreen_color_effect(almost_same)
+        self.assertEqual(self.backend.calls['MagSetFullscreenColorEffect'], 1)
+        deduplicator.invalidate(deduplicator.FULLSCREEN)
+        mag.set_fullscreen_color_effect(almost_same)
+        mag.set_source(self.hwnd, (0, 0, 10, 10))
+        self.assertEqual(self.backend.calls['MagSetFullscreenColorEffect'], 2)
+        self.assertEqual(self.backend.calls['MagSetWindowSource'], 1)
+        # Failed writes aren't remembered
+        self.assertRaises(OSError, mag.set_fullscreen_transform, 0.5, (1, 1))
+        self.assertRaises(OSError, mag.set_fullscreen_transform, 0.5, (1, 1))
+        self.assertEqual(self.backend.calls['MagSetFullscreenTransform'], 3)
+        # Object layer benefits too
+        window = mag._objects.CustomWindowController()
+        window.hwnd = self.hwnd
+        window.source.raw = (0, 0, 10, 10)
+        self.assertEqual(self.backend.calls['MagSetWindowSource'], 1)
+        # Fullscreen values aren't mistaken for NULL window ones
+        mag.set_fullscreen_color_effect(mag.const.COLOR_INVERSION_EFFECT)
+        self.assertRaises(OSError, mag.set_color_effect, 0, mag.const.COLOR_INVERSION_EFFECT)
+        mag.set_color_effect(self.hwnd, mag.const.COLOR_INVERSION_EFFECT)
+        deduplicator.invalidate(0)
+        mag.set_fullscreen_color_effect(mag.const.COLOR_INVERSION_EFFECT)
+        mag.set_color_effect(self.hwnd, mag.const.COLOR_INVERSION_EFFECT)
+        self.assertEqual(self.backend.calls['MagSetFullscreenColorEffect'], 3)
+        self.assertEqual(self.backend.calls['MagSetColorEffect'], 2)
+        deduplicator.invalidate()
+
+    def test_write_deduplication_backend_switch(self):
+        deduplicator = mag.deduplicator
+        deduplicator.enabled = True
+        self.addCleanup(setattr, deduplicator, 'enabled', False)
+        self.addCleanup(deduplicator.invalidate)
+        other = mag.backends.SimulatedBackend()
+        other.MagInitialize()
+        mag.set_fullscreen_transform(2.0, (1, 1))
+        with mag.use_backend(other):
+            # New backend hasn't seen value written before
+            mag.set_fullscreen_transform(2.0, (1, 1))
+            mag.set_fullscreen_transform(2.0, (1, 1))
+        mag.set_fullscreen_transform(2.0, (1, 1))
+        self.assertEqual(other.calls['MagSetFullscreenTransform'], 1)
+        self.assertEqual(other.fullscreen_transform, (2.0, (1, 1)))
+        self.assertEqual(self.backend.calls['MagSetFullscreenTransform'], 2)
+
+    def test_latency(self):
+        self.backend.latency = {'MagSetFullscreenColorEffect': 0.01}
+        start = time.perf_counter()
+        mag.set_fullscreen_color_effect(mag.const.COLOR_INVERSION_EFFECT)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.01)
+        self.assertEqual(self.backend.calls['MagSetFullscreenColorEffect'], 1)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class TransactionTest(SimulatedBackendTestCase):
+    backend_options = dict(ui_access=True)
+
+    def setUp(self):
+        super().setUp()
+        self.api = mag.WinMagnificationAPI()
+        self.api.window.hwnd = self.backend.create_window()
+        self.written = []
+        for name in mag.backends.FUNCTION_NAMES:
+            if name.startswith('MagSet'):
+                function = getattr(self.backend, name)
+                setattr(self.backend, name, lambda *args, _name=name, _function=function: (
+                    self.written.append(_name) or _function(*args)
+                ))
+
+    def tearDown(self):
+        self.api.dispose()
+
+    def test_transaction(self):
+        fullscreen, window = self.api.fullscreen, self.api.window
+        with self.api.transaction() as api:
+            self.assertIs(api, self.api)
+            fullscreen.color_effect.linear = mag.const.COLOR_INVERSION_EFFECT
+            fullscreen.transform.scale = 2.0
+            fullscreen.transform.offset.same = 10
+            window.color_effect.make_transition(mag.const.COLOR_GRAYSCALE_EFFECT)
+            window.color_effect.transition_power = 1.0
+            window.transform.scale.same = 3.0
+            window.source.end = (10, 20)
+            window.source.start = (1, 2)
+            self.assertEqual(window.transform.scale.x, 3.0)
+            self.assertEqual(self.written, [])
+        self.assertEqual(self.written, [
+            'MagSetFullscreenTransform',
+            'MagSetFullscreenColorEffect',
+            'MagSetWindowSource',
+            'MagSetWindowTransform',
+            'MagSetColorEffect',
+        ])
+        for name in ('MagGetFullscreenTransform', 'MagGetFullscreenColorEffect', 'MagGetColorEffect',
+                     'MagGetWindowTransform', 'MagGetWindowSource'):
+            self.assertLessEqual(self.backend.calls[name], 1, name)
+        self.assertEqual(fullscreen.transform.raw, (2.0, (10, 10)))
+        self.assertEqual(fullscreen.color_effect.raw, mag.const.COLOR_INVERSION_EFFECT)
+        self.assertEqual(window.source.raw, (1, 2, 10, 20))
+        self.assertEqual(window.transform.pair, ((3.0, 3.0), (0.0, 0.0)))
+
+    def test_raw_deferred(self):
+        fullscreen, window = self.api.fullscreen, self.api.window
+        with self.api.transaction():
+            # Set in reverse order of writes
+            window.filters.add(5, 6)
+            window.filters.discard(5)
+            window.color_effect.raw = mag.const.COLOR_INVERSION_EFFECT
+            window.transform.raw = mag.tools.get_transform_matrix(2.0, 2.0)
+            window.source.raw = (0, 0, 10, 10)
+            fullscreen.color_effect.raw = mag.const.COLOR_GRAYSCALE_EFFECT
+            fullscreen.transform.scale = 2.0
+            self.assertEqual(fullscreen.color_effect.raw, mag.const.COLOR_GRAYSCALE_EFFECT)
+            self.assertEqual(window.transform.scale.x, 2.0)
+            self.assertEqual(list(window.filters), [6])
+            self.assertEqual(self.written, [])
+        self.assertEqual(self.written, [
+            'MagSetFullscreenTransform',
+            'MagSetFullscreenColorEffect',
+            'MagSetWindowSource',
+            'MagSetWindowTransform',
+            'MagSetColorEffect',
+            'MagSetWindowFilterList',
+        ])
+        self.assertEqual(self.backend.fullscreen_transform, (2.0, (0, 0)))
+        self.assertEqual(self.backend.windows[window.hwnd].filters, (6,))
+        # Fields changed after raw value set are written too
+        self.written.clear()
+        with self.api.transaction():
+            window.transform.raw = mag.tools.get_transform_matrix(4.0, 4.0)
+            window.transform.offset.x = 5.0
+            window.filters.raw = (7,)
+            window.filters.add(8)
+        self.assertEqual(self.written, ['MagSetWindowTransform', 'MagSetWindowFilterList'])
+        self.assertEqual(window.transform.pair, ((4.0, 4.0), (5.0, 0.0)))
+        self.assertEqual(self.backend.windows[window.hwnd].filters, (7, 8))
+        # Raw value written as is, even if fields can't hold it
+        matrix = (2.0, 0.5, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 1.0)
+        with self.api.transaction():
+            window.transform.raw = matrix
+        self.assertEqual(self.backend.windows[window.hwnd].transform, matrix)
+
+
+class TransitionPlayerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.effect = mag._objects.ColorMatrixWrapper()
+        self.effect.make_transition(
+            end=mag.const.COLOR_INVERSION_EFFECT,
+            start=mag.const.COLOR_NO_EFFECT,
+        )
+
+    def make_player(self, *args, **kwargs):
+        return mag.animation.TransitionPlayer(
+            self.effect, *args, clock=self.clock, sleep=self.clock.sleep, **kwargs
+        )
+
+    def test_run(self):
+        stats = self.make_player(1.0, fps=8).run()
+        self.assertEqual(self.effect.linear, mag.const.COLOR_INVERSION_EFFECT)
+        self.assertEqual(stats.frames, 9)
+        self.assertEqual(stats.dropped, 0)
+        self.assertAlmostEqual(stats.fps, 8.0)
+        self.assertAlmostEqual(stats.jitter, 0.0)
+
+    def test_drop_frames(self):
+        powers = []
+        player = self.make_player(1.0, fps=10)
+        slow_effect = player.target = unittest.mock.Mock()
+
+        def render(value):
+            powers.append(value)
+            self.clock.now += 0.25
+        type(slow_effect).transition_power = unittest.mock.PropertyMock(side_effect=render)
+        stats = player.run()
+        self.assertEqual(powers[-1], 1.0)
+        self.assertLess(len(powers), 11)
+        self.assertGreater(stats.dropped, 0)
+        self.assertLess(stats.fps, 10.0)
+
+    def test_cancel_retarget(self):
+        player = self.make_player(1.0, easing=mag.animation.ease_in_out)
+        player.start()
+        self.assertTrue(player.update(0.5))
+        self.assertEqual(self.effect.linear, mag.effects.inversion(0.5))
+        player.retarget(mag.const.COLOR_NO_EFFECT, duration=2.0)
+        self.assertTrue(player.update(0.5))
+        self.assertTrue(player.update(1.5))
+        self.assertEqual(self.effect.linear, mag.effects.inversion(0.25))
+        player.cancel()
+        self.assertFalse(player.update(2.0))
+        self.assertTrue(player.cancelled)
+        self.assertEqual(self.effect.linear, mag.effects.inversion(0.25))
+
+    def test_baked_transition(self):
+        table = mag.tools.TransitionTable(mag.effects.grayscale, steps=8)
+        self.assertEqual(len(table.table), 9 * mag.const.COLOR_MATRIX_SIZE)
+        self.assertEqual(table(0.0), mag.const.COLOR_NO_EFFECT)
+        self.assertEqual(table(1.0), mag.const.COLOR_GRAYSCALE_EFFECT)
+        self.assertEqual(table(0.5), table(0.55))
+        self.assertEqual(table(1.5), mag.effects.grayscale(1.5))
+        for actual, expected in zip(table.interpolate(0.3), mag.effects.grayscale(0.3)):
+            self.assertAlmostEqual(actual, expected, places=6)
+        self.effect.from_transition(table, 0.5)
+        self.assertEqual(self.effect.linear, table(0.5))
+        self.make_player(1.0, fps=8).run()
+        self.assertEqual(self.effect.linear, mag.const.COLOR_GRAYSCALE_EFFECT)
+        self.effect.make_transition(mag.const.COLOR_INVERSION_EFFECT, steps=4, initial_power=1)
+        self.assertIsInstance(self.effect.transition, mag.tools.TransitionTable)
+        self.assertEqual(self.effect.linear, mag.const.COLOR_INVERSION_EFFECT)
+        self.assertRaises(ValueError, self.effect.from_transition,
+                          mag.tools.get_transition((0,), (1,), steps=2))
+
+
+class ZoomAnimatorTest(SimulatedBackendTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        super().setUp()
+        self.api = mag.WinMagnificationAPI()
+        self.animator = mag.animation.ZoomAnimator(
+            self.api.fullscreen.transform, duration=1.0, fps=10,
+            clock=self.clock, sleep=self.clock.sleep,
+        )
+
+    def tearDown(self):
+        self.api.dispose()
+
+    def test_run(self):
+        self.animator.easing = mag.animation.linear
+        self.animator.zoom_to(2.0, (100, 50))
+        self.animator.zoom_to(4.0, (200, 100))
+        stats = self.animator.run()
+        self.assertEqual(self.backend.fullscreen_transform, (4.0, (200, 100)))
+        self.assertLessEqual(self.backend.calls['MagSetFullscreenTransform'], stats.frames)
+        self.assertEqual(self.backend.calls['MagSetFullscreenTransform'], 10)
+        self.animator.zoom_to(4.0)
+        self.animator.run()
+        self.assertEqual(self.backend.calls['MagSetFullscreenTransform'], 10)
+
+    def test_retarget(self):
+        self.animator.zoom_to(4.0, (300, 0))
+        self.animator.start()
+        scales = []
+        for frame in range(30):
+            if frame == 5:
+                self.animator.zoom_to(1.0, duration=0.5)
+            if not self.animator.update(self.animator.pacer.wait()):
+                break
+            scales.append(self.api.fullscreen.transform.scale)
+        self.assertFalse(self.animator.is_running)
+        self.assertEqual(self.backend.fullscreen_transform, (1.0, (300, 0)))
+        # No jumps on retarget
+        for previous, current in zip(scales, scales[1:]):
+            self.assertLess(abs(current / previous - 1), 0.5)
+        self.assertEqual(scales.index(max(scales)), 4)
+
+    def test_external_change(self):
+        self.animator.easing = mag.animation.linear
+        self.animator.zoom_to(2.0, (100, 0))
+        self.animator.run()
+        mag.set_fullscreen_transform(4.0, (400, 0))
+        self.animator.zoom_to(8.0, (400, 0))
+        self.animator.start()
+        states = []
+        while self.animator.update(self.animator.pacer.wait()):
+            states.append(self.backend.fullscreen_transform)
+        # Motion continues from state changed outside, not from the one animated before
+        self.assertTrue(all(scale >= 4.0 and offset == (400, 0) for scale, offset in states))
+        self.assertEqual(self.backend.fullscreen_transform, (8.0, (400, 0)))
+
+    def test_cancel(self):
+        self.assertEqual(self.api.fullscreen.transform.animator().target, self.api.fullscreen.transform)
+        self.animator.zoom_to(4.0)
+        self.animator.start()
+        self.animator.update(self.animator.pacer.wait())
+        self.animator.update(self.animator.pacer.wait())
+        self.animator.cancel()
+        self.assertFalse(self.animator.update(self.animator.pacer.wait()))
+        self.assertLess(self.backend.fullscreen_transform[0], 4.0)
+        self.assertRaises(ValueError, self.animator.zoom_to, 0.0)
+
+
+class PointerFollowerTest(unittest.TestCase):
+    def test_jitter_suppressed(self):
+        backend = mag.backends.SimulatedBackend()
+        follower = mag.tracking.PointerFollower((0, 0, 1920, 1080), deadzone=0.5)
+        generator = random.Random(0)
+        stream = [(960, 540)] + [
+            (960 + generator.randint(-20, 20), 540 + generator.randint(-20, 20)) for _ in range(199)
+        ]
+        with mag.use_backend(backend):
+            mag.initialize()
+            try:
+                for offset in follower.follow(stream, scale=2.0):
+                    mag.set_fullscreen_transform(2.0, offset)
+            finally:
+                mag.finalize()
+        self.assertEqual(backend.calls['MagSetFullscreenTransform'], 1)
+        self.assertEqual(backend.fullscreen_transform, (2.0, (480, 270)))
+        self.assertEqual((follower.emitted, follower.suppressed), (1, 199))
+
+    def test_follow(self):
+        follower = mag.tracking.PointerFollower((0, 0, 1000, 1000), deadzone=0.0)
+        offsets = list(follower.follow([(x, 500) for x in range(0, 1001, 10)], scale=4.0))
+        # Pointer centered, view clamped to screen
+        self.assertEqual(offsets[0], (0, 375))
+        self.assertEqual(offsets[-1], (750, 375))
+        self.assertEqual(offsets, sorted(set(offsets)))
+        self.assertEqual(follower.emitted + follower.suppressed, 101)
+        self.assertIsNone(follower.update((1000, 500), 4.0))
+        self.assertEqual(follower.update((1000, 500), 2.0), (500, 250))
+
+    def test_smoothing(self):
+        follower = mag.tracking.PointerFollower((0, 0, 1000, 1000), deadzone=0.0, smoothing=0.5)
+        follower.reset((0, 0))
+        offsets = list(follower.follow([(750, 750)] * 20, scale=2.0))
+        self.assertEqual(offsets[:3], [(250, 250), (375, 375), (438, 438)])
+        self.assertEqual(offsets[-1], (500, 500))
+        self.assertEqual(follower.suppressed, 20 - len(offsets))
+
+    def test_limits(self):
+        limit = mag.const.FULLSCREEN_OFFSET_LIMIT
+        follower = mag.tracking.PointerFollower((0, 0, 1000, 1000), clamp_to_screen=False)
+        self.assertEqual(follower.update((10 ** 7, -10 ** 7), 1.0), (limit, -limit))
+        self.assertRaises(ValueError, mag.tracking.PointerFollower, (0, 0, 1, 1), deadzone=2)
+        self.assertRaises(ValueError, mag.tracking.PointerFollower, (0, 0, 1, 1), smoothing=1)
+
+
+class SourceTrackerTest(SimulatedBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        mag.initialize()
+        self.hwnd = self.backend.create_window()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        mag.finalize()
+
+    def test_coalesce(self):
+        tracker = mag.tracking.SourceTracker(
+            lambda rectangle: mag.set_source(self.hwnd, rectangle), fps=50, clock=self.clock,
+        )
+        # Burst of notifications within single frame
+        for x in range(100):
+            tracker.notify((x, 0, x + 400, 400))
+            tracker.flush()
+            self.clock.now += 0.0001
+        self.assertEqual(self.backend.calls['MagSetWindowSource'], 1)
+        self.assertEqual(tracker.pending, (99, 0, 499, 400))
+        self.assertFalse(tracker.flush())
+        self.clock.now = 0.02
+        self.assertTrue(tracker.flush())
+        self.assertIsNone(tracker.pending)
+        self.assertFalse(tracker.flush(force=True))
+        self.assertEqual(self.backend.windows[self.hwnd].source, (99, 0, 499, 400))
+        # Unchanged rectangles (like repaints) aren't written
+        self.clock.now = 1.0
+        for _ in range(10):
+            tracker.notify((99, 0, 499, 400))
+            self.assertFalse(tracker.flush(force=True))
+        tracker.notify((0, 0, 400, 400))
+        self.assertTrue(tracker.flush())
+        tracker.notify((99, 0, 499, 400))
+        self.assertFalse(tracker.flush())
+        self.assertTrue(tracker.flush(force=True))
+        self.assertEqual(self.backend.calls['MagSetWindowSource'], 4)
+        self.assertEqual((tracker.notifications, tracker.writes, tracker.suppressed), (112, 4, 108))
+        tracker.reset()
+        tracker.notify((99, 0, 499, 400))
+        self.assertTrue(tracker.flush())
+        self.assertRaises(ValueError, mag.tracking.SourceTracker, print, fps=0)
+
+    def test_magnifier_window(self):
+        # Stand-ins for win32 modules, so window events can be dispatched without real window
+        rectangle = [0, 0, 400, 300]
+        gui = unittest.mock.Mock()
+        gui.GetWindowRect.side_effect = lambda hwnd: tuple(rectangle)
+        gui.GetClientRect.side_effect = lambda hwnd: (0, 0, rectangle[2] - rectangle[0], rectangle[3] - rectangle[1])
+        api = unittest.mock.Mock()
+        api.GetSystemMetrics.return_value = 0
+        events = windows_utils.AbstractWindow.events
+        with unittest.mock.patch.multiple(windows_utils, win32gui=gui, win32api=api):
+            window = windows_utils.MagnifierWindow()
+            magnifier = mag.WinMagnificationAPI(initialize=False)
+            window._MagnifierWindow__magnifier = magnifier
+            magnifier.window.hwnd = window.magnifier_hwnd = self.hwnd
+            window.hwnd = 1
+            windows_utils.AbstractWindow.windows[window.hwnd] = window
+            window._window_started_event.set()
+
+            def dispatch(message: int):
+                events[message](window.hwnd, message, 0, 0)
+            try:
+                # Dragging: move and paint per mouse event, many events per frame
+                for step in range(1, 61):
+                    rectangle[0] += 1
+                    rectangle[2] += 1
+                    dispatch(windows_utils.win32con.WM_MOVE)
+                    dispatch(windows_utils.win32con.WM_PAINT)
+                    if step % 20 == 0:
+                        window._on_frame(0, 0)
+                # Resize without position change
+                rectangle[2] += 100
+                dispatch(windows_utils.win32con.WM_SIZE)
+                dispatch(windows_utils.win32con.WM_PAINT)
+                window._on_frame(0, 0)
+                window._on_frame(0, 0)
+            finally:
+                del windows_utils.AbstractWindow.windows[window.hwnd]
+        tracker = window.source_tracker
+        self.assertEqual(self.backend.calls['MagSetWindowSource'], 4)
+        self.assertEqual(tracker.writes, 4)
+        self.assertEqual(tracker.notifications, 122)
+        self.assertEqual(self.backend.windows[self.hwnd].source, (60, 0, 500, 300))
+
+
+class MappingTest(unittest.TestCase):
+    def test_fullscreen(self):
+        backend = mag.backends.SimulatedBackend()
+        with mag.use_backend(backend):
+            mag.initialize()
+            try:
+                mag.set_fullscreen_transform(2.5, (100, 40))
+                mapping = mag.mapping.Mapping.from_fullscreen(mag.get_fullscreen_transform())
+            finally:
+                mag.finalize()
+        generator = random.Random(0)
+        points = [(generator.uniform(0, 1920), generator.uniform(0, 1080)) for _ in range(100)]
+        mapped = mapping.points(points)
+        self.assertEqual(len(mapped), 200)
+        for index, point in enumerate(points):
+            x, y = mapping.point(point)
+            self.assertAlmostEqual(mapped[2 * index], x, places=2)
+            self.assertAlmostEqual(mapped[2 * index + 1], y, places=2)
+        for actual, expected in zip(mapping.inverse.points(mapped), array.array('f', (v for p in points for v in p))):
+            self.assertAlmostEqual(actual, expected, places=2)
+        self.assertIs(mapping.inverse, mapping.inverse)
+        self.assertIs(mapping.inverse.inverse, mapping)
+        self.assertEqual(tuple(mapping.points(array.array('f', (100, 40)))), (0.0, 0.0))
+        self.assertRaises(ValueError, mapping.points, (1.0, 2.0, 3.0))
+        self.assertRaises(ValueError, mapping.rectangles, (1.0, 2.0))
+
+    def test_number_types(self):
+        mapping = mag.mapping.Mapping((2.0, 2.0), (1.0, 0.0))
+        for convert in (fractions.Fraction, decimal.Decimal):
+            self.assertEqual(tuple(mapping.points([convert(1), convert(2)])), (3.0, 4.0))
+
+    def test_matrix_and_input_transform(self):
+        matrix = mag.tools.get_transform_matrix(2.0, 4.0, 10.0, 20.0)
+        mapping = mag.mapping.Mapping.from_matrix(matrix)
+        self.assertEqual(mapping.point((5, 5)), (0.0, 0.0))
+        self.assertEqual(mapping.matrix, matrix)
+        mapping = mag.mapping.Mapping.from_input_transform((True, (100, 100, 200, 150), (0, 0, 400, 200)))
+        self.assertEqual(tuple(mapping.rectangles([(100, 100, 200, 150)])), (0.0, 0.0, 400.0, 200.0))
+        self.assertEqual(mapping.inverse.point((200, 100)), (150.0, 125.0))
+        self.assertRaises(ValueError, mag.mapping.Mapping.from_input_transform, (True, (0, 0, 0, 10), (0, 0, 1, 1)))
+        self.assertRaises(ValueError, mag.mapping.Mapping, (0.0, 1.0))
+
+    @unittest.skipIf(mag.mapping.numpy is None, "NumPy isn't installed")
+    def test_numpy(self):
+        numpy = mag.mapping.numpy
+        mapping = mag.mapping.Mapping((2.0, 3.0), (1.0, -1.0))
+        rectangles = numpy.arange(24, dtype=numpy.float64).reshape(2, 3, 4)
+        mapped = mapping.rectangles(rectangles)
+        self.assertEqual(mapped.shape, rectangles.shape)
+        self.assertEqual(mapped.dtype, numpy.float32)
+        self.assertEqual(tuple(mapped[0, 0]), (1.0, 2.0, 5.0, 8.0))
+        self.assertTrue(numpy.allclose(mapping.inverse.rectangles(mapped), rectangles))
+        self.assertEqual(tuple(mapping.points(numpy.array([0.0, 0.0]))), (1.0, -1.0))
+        self.assertEqual(tuple(mapping.points(list(numpy.array([1, 2], dtype=numpy.float32)))), (3.0, 5.0))
+        self.assertRaises(ValueError, mapping.points, numpy.zeros((2, 3)))
+        self.assertRaises(ValueError, mapping.rectangles, numpy.zeros((3, 2)))
+        self.assertRaises(ValueError, mapping.points, numpy.array(1.0))
+
+
+class MatrixTest(unittest.TestCase):
+    def test_from_any_number_types(self):
+        expected = ((0.5, 1.0), (1.5, 2.0))
+        for convert in (fractions.Fraction, decimal.Decimal):
+            values = [convert(value) for row in expected for value in row]
+            self.assertEqual(mag.tools.Matrix.from_any(values).square, expected)
+            self.assertEqual(mag.tools.Matrix.from_any([values[:2], values[2:]]).square, expected)
+
+    def test_from_any_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy isn't installed")
+        expected = ((0.5, 1.0), (1.5, 2.0))
+        rows = numpy.array(expected, dtype=numpy.float32)
+        self.assertEqual(mag.tools.Matrix.from_any(list(rows.ravel())).square, expected)
+        self.assertEqual(mag.tools.Matrix.from_any(rows).square, expected)
+        self.assertEqual(mag.tools.Matrix.from_any(list(rows)).square, expected)
+
+    def test_combine_matrices(self):
+        generator = random.Random(0)
+        for size in (mag.const.TRANSFORMATION_MATRIX_SIZE, mag.const.COLOR_MATRIX_SIZE):
+            side = mag.tools.get_matrix_side(size)
+            affine = list(mag.tools.get_filled_matrix(0.0, size))
+            affine[-1] = 1.0
+            for _ in range(10):
+                first = [generator.uniform(-2, 2) for _ in range(size)]
+                second = [generator.uniform(-2, 2) for _ in range(size)]
+                pairs = [(first, second)]
+                if size == mag.const.COLOR_MATRIX_SIZE:
+                    # Color matrices have fixed last column
+                    pairs.append(tuple(
+                        [a if i % side < side - 1 else b for i, (a, b) in enumerate(zip(matrix, affine))]
+                        for matrix in (first, second)
+                    ))
+                else:
+                    # Transformation matrices have fixed last row
+                    pairs.append(tuple(matrix[:-side] + affine[-side:] for matrix in (first, second)))
+                for a, b in pairs:
+                    expected = mag.tools._combine_generic(a, b)
+                    for actual, value in zip(mag.tools.combine_matrices(a, b), expected):
+                        self.assertAlmostEqual(actual, value)
+            matrices = [
+                [generator.uniform(-2, 2) for _ in range(size)] for _ in range(4)
+            ]
+            expected = matrices[0]
+            for matrix in matrices[1:]:
+                expected = mag.tools._combine_generic(expected, matrix)
+            for actual, value in zip(mag.tools.combine_chain(matrices), expected):
+                self.assertAlmostEqual(actual, value)
+            for actual, matrix in zip(mag.tools.combine_each(matrices[0], matrices, before=False), matrices):
+                self.assertEqual(actual, mag.tools.combine_matrices(matrix, matrices[0]))
+        self.assertRaises(ValueError, mag.tools.combine_chain, [(1.0,), (1.0, 0.0, 0.0, 1.0)])
+
+
+class MagnificationWorkerTest(SimulatedBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.worker = mag.MagnificationWorker().start()
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def test_calls_from_many_threads(self):
+        self.assertRaises(RuntimeError, mag.get_fullscreen_transform)
+        futures = []
+
+        def produce(index: int):
+            for offset in range(25):
+                futures.append(self.worker.submit(mag.set_fullscreen_transform, 2.0, (index, offset)))
+
+        producers = [threading.Thread(target=produce, args=(i,)) for i in range(8)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        for future in futures:
+            self.assertIsNone(future.result(timeout=5))
+        self.assertEqual(self.backend.calls['MagSetFullscreenTransform'], 200)
+        self.assertLessEqual(self.worker.batches, 200)
+        self.assertEqual(self.worker.call(mag.get_fullscreen_transform)[0], 2.0)
+        self.assertEqual(self.worker.call(self.worker.call, lambda: 1), 1)
+
+    def test_errors(self):
+        future = self.worker.submit(mag.set_fullscreen_transform, 0.5, (0, 0))
+        self.assertRaises(OSError, future.result, 5)
+        self.assertRaises(RuntimeError, self.worker.start)
+
+    def test_graceful_shutdown(self):
+        gate = threading.Event()
+        blocker = self.worker.submit(gate.wait)
+        pending = [self.worker.submit(mag.set_fullscreen_transform, 2.0, (i, 0)) for i in range(5)]
+        gate.set()
+        self.worker.shutdown()
+        self.assertFalse(self.worker.is_running)
+        self.assertTrue(blocker.result())
+        self.assertTrue(all(future.done() and future.exception() is None for future in pending))
+        self.assertEqual(self.backend.fullscreen_transform, (2.0, (4, 0)))
+        self.assertRaises(RuntimeError, self.worker.submit, mag.get_fullscreen_transform)
+        # Magnification API finalized, so it can be initialized again
+        mag.initialize()
+        mag.finalize()
+
+    def test_cancel_pending(self):
+        started, gate = threading.Event(), threading.Event()
+        self.worker.submit(lambda: started.set() or gate.wait())
+        started.wait()
+        pending = self.worker.submit(mag.get_fullscreen_transform)
+        self.worker.shutdown(wait=False, cancel_pending=True)
+        gate.set()
+        self.worker.shutdown()
+        self.assertTrue(pending.cancelled())
+
+
+class AsyncMagnifierTest(SimulatedBackendTestCase):
+    def run_async(self, function):
+        async def main():
+            async with mag.aio.AsyncMagnifier() as magnifier:
+                return await function(magnifier)
+        return asyncio.run(main())
+
+    def test_calls(self):
+        async def test(magnifier):
+            await asyncio.gather(*(
+                magnifier.set_fullscreen_transform(2.0, (i, i)) for i in range(50)
+            ))
+            self.assertEqual(await magnifier.get_fullscreen_transform(), (2.0, (49, 49)))
+            with self.assertRaises(OSError):
+                await magnifier.set_fullscreen_transform(0.5, (0, 0))
+
+            def change(api):
+                api.fullscreen.transform.scale = 3.0
+                api.fullscreen.transform.offset.same = 0
+                return api.fullscreen.transform.scale
+            self.assertEqual(await magnifier.transaction(change), 3.0)
+            self.assertEqual(self.backend.fullscreen_transform, (3.0, (0, 0)))
+        self.run_async(test)
+        self.assertEqual(self.backend.calls['MagInitialize'], 1)
+        self.assertEqual(self.backend.calls['MagUninitialize'], 1)
+        self.assertRaises(RuntimeError, getattr, mag.aio.AsyncMagnifier(), 'api')
+
+    def test_play(self):
+        async def test(magnifier):
+            color_effect = magnifier.api.fullscreen.color_effect
+            await magnifier.run(color_effect.make_transition, mag.const.COLOR_INVERSION_EFFECT)
+            stats = await magnifier.play(color_effect.player(0.05, fps=100))
+            self.assertGreater(stats.frames, 1)
+            self.assertEqual(await magnifier.run(lambda: color_effect.transition_power), 1.0)
+
+            await magnifier.run(color_effect.make_transition, mag.const.COLOR_GRAYSCALE_EFFECT)
+            player = color_effect.player(10.0)
+            task = asyncio.ensure_future(magnifier.play(player))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertTrue(player.cancelled)
+            self.assertLess(await magnifier.run(lambda: color_effect.transition_power), 1.0)
+        self.run_async(test)
+
+
+class MetricsTest(SimulatedBackendTestCase):
+    backend_options = dict(latency={'MagGetFullscreenTransform': 0.001})
+
+    def setUp(self):
+        super().setUp()
+        mag.metrics.reset()
+
+    def tearDown(self):
+        mag.metrics.disable()
+        mag.metrics.reset()
+
+    def test_collect(self):
+        self.assertFalse(mag.metrics.is_enabled())
+        mag.initialize()
+        try:
+            mag.set_fullscreen_transform(2.0, (0, 0))
+            self.assertEqual(mag.stats(), {})
+            measured = mag.metrics.enable()
+            self.assertIs(mag.metrics.enable(), measured)
+            self.assertTrue(mag.metrics.is_enabled())
+            # Other attributes are forwarded
+            self.assertIs(mag.get_backend().calls, self.backend.calls)
+            for _ in range(10):
+                mag.set_fullscreen_transform(2.0, (0, 0))
+            mag.get_fullscreen_transform()
+            self.assertRaises(OSError, mag.set_fullscreen_transform, 0.5, (0, 0))
+            self.assertRaises(RuntimeError, mag.get_filters, 12345)
+        finally:
+            mag.finalize()
+        mag.metrics.disable()
+        self.assertIs(mag.get_backend(), self.backend)
+        stats = mag.stats()
+        self.assertEqual(set(stats), {
+            'MagSetFullscreenTransform', 'MagGetFullscreenTransform', 'MagGetWindowFilterList', 'MagUninitialize'
+        })
+        self.assertEqual((stats['MagSetFullscreenTransform'].calls, stats['MagSetFullscreenTransform'].errors), (11, 1))
+        self.assertEqual(stats['MagGetWindowFilterList'].errors, 1)
+        latency = stats['MagGetFullscreenTransform'].latency
+        self.assertGreaterEqual(latency.p50, 0.001)
+        self.assertEqual(latency.p50, latency.p99)
+        self.assertLess(stats['MagSetFullscreenTransform'].latency.p50, latency.p50)
+        self.assertIn('calls=11', repr(stats['MagSetFullscreenTransform']))
+        mag.metrics.reset()
+        self.assertEqual(mag.stats(), {})
+        self.assertEqual(stats['MagSetFullscreenTransform'].calls, 11)
+
+    def test_histogram(self):
+        histogram = mag.metrics.LatencyHistogram()
+        self.assertEqual(histogram.p99, 0.0)
+        generator = random.Random(0)
+        values = sorted(generator.randint(1, 10 ** 9) for _ in range(1000))
+        for value in values:
+            histogram.add(value)
+        for percent in (1, 50, 90, 99, 100):
+            expected = values[int(percent / 100 * len(values)) - 1]
+            self.assertLessEqual(expected / 1e9, histogram.percentile(percent))
+            self.assertLessEqual(histogram.percentile(percent), expected * 1.125 / 1e9)
+        self.assertEqual(histogram.percentile(100), histogram.max)
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values) / 1e9)
+
+
+class RecordingTest(SimulatedBackendTestCase):
+    backend_options = dict(ui_access=True)
+
+    def record(self):
+        log = io.BytesIO()
+        with mag.recording.record(log) as recorder:
+            mag.initialize()
+            hwnd = self.backend.create_window()
+            try:
+                mag.set_fullscreen_color_effect(mag.const.COLOR_INVERSION_EFFECT)
+                mag.set_fullscreen_transform(2.0, (-10, 20))
+                mag.set_color_effect(hwnd, mag.effects.grayscale(0.5))
+                mag.set_color_effect(hwnd, None)
+                mag.set_transform_advanced(hwnd, mag.tools.get_transform_matrix(2.0, 3.0, 4.0, 5.0))
+                mag.set_source(hwnd, (1, 2, 30, 40))
+                mag.set_filters(hwnd, 1, 2, 3)
+                mag.set_input_transform(True, (0, 0, 10, 10), (0, 0, 20, 20))
+                mag.set_cursor_visibility(False)
+                mag.get_fullscreen_transform()
+                time.sleep(0.01)
+                mag.set_fullscreen_transform(3.0, (0, 0))
+            finally:
+                mag.finalize()
+        self.assertEqual(recorder.records, 12)
+        return hwnd, log.getvalue()
+
+    def test_read(self):
+        hwnd, log = self.record()
+        calls = list(mag.recording.read(log))
+        self.assertEqual([call.name for call in calls], [
+            'MagInitialize', 'MagSetFullscreenColorEffect', 'MagSetFullscreenTransform',
+            'MagSetColorEffect', 'MagSetColorEffect', 'MagSetWindowTransform', 'MagSetWindowSource',
+            'MagSetWindowFilterList', 'MagSetInputTransform', 'MagShowSystemCursor',
+            'MagSetFullscreenTransform', 'MagUninitialize',
+        ])
+        self.assertEqual(calls[1].args, (mag.const.COLOR_INVERSION_EFFECT,))
+        self.assertEqual(calls[2].args, (2.0, -10, 20))
+        self.assertEqual(calls[4].args, (hwnd, None))
+        self.assertEqual(calls[5].args, (hwnd, mag.tools.get_transform_matrix(2.0, 3.0, 4.0, 5.0)))
+        self.assertEqual(calls[6].args, (hwnd, (1, 2, 30, 40)))
+        self.assertEqual(calls[7].args, (hwnd, mag.const.MW_FILTERMODE_EXCLUDE, (1, 2, 3)))
+        self.assertEqual(calls[8].args, (True, (0, 0, 10, 10), (0, 0, 20, 20)))
+        self.assertEqual(calls[9].args, (False,))
+        self.assertGreaterEqual(calls[-1].timestamp - calls[-3].timestamp, 0.01)
+        self.assertEqual(sorted(calls, key=lambda call: call.timestamp), calls)
+        # Compact: matrices stored as float32
+        self.assertLess(len(log), 3 * 25 * 4 + 9 * 4 + 100)
+        self.assertRaises(ValueError, list, mag.recording.read(b'garbage'))
+
+    def test_replay(self):
+        hwnd, log = self.record()
+        original = self.backend
+        target = mag.backends.SimulatedBackend(ui_access=True)
+        target.MagInitialize()
+        target_hwnd = target.create_window()
+        replayer = mag.recording.Replayer(target, realtime=False, hwnds={hwnd: target_hwnd})
+        stats = replayer.replay(log)
+        self.assertEqual((stats.calls, stats.errors), (12, 0))
+        self.assertGreater(stats.throughput, 0)
+        self.assertEqual(target.fullscreen_transform, original.fullscreen_transform)
+        self.assertEqual(target.fullscreen_color_effect, original.fullscreen_color_effect)
+        self.assertEqual(target.input_transform, original.input_transform)
+        self.assertEqual(vars(target.windows[target_hwnd]), vars(original.windows[hwnd]))
+
+        clock = FakeClock()
+        target = mag.backends.SimulatedBackend(ui_access=True)
+        target.MagInitialize()
+        replayer = mag.recording.Replayer(target, hwnds={hwnd: target.create_window()},
+                                          clock=clock, sleep=clock.sleep)
+        stats = replayer.replay(mag.recording.read(log))
+        self.assertEqual(stats.calls, 12)
+        self.assertAlmostEqual(stats.elapsed, list(mag.recording.read(log))[-1].timestamp)
+
+
+class ShadowStateTest(SimulatedBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = mag.WinMagnificationAPI()
+        self.api.window.hwnd = self.backend.create_window()
+        self.api.use_shadow_state()
+
+    def tearDown(self):
+        self.api.dispose()
+
+    def test_write_through(self):
+        fullscreen, window = self.api.fullscreen, self.api.window
+        fullscreen.color_effect.raw = mag.const.COLOR_INVERSION_EFFECT
+        fullscreen.transform.scale = 2.0
+        window.source.raw = (0, 0, 10, 20)
+        self.backend.reset_calls()
+        for _ in range(10):
+            self.assertEqual(fullscreen.color_effect.raw, mag.const.COLOR_INVERSION_EFFECT)
+            self.assertEqual(fullscreen.transform.raw, (2.0, (0, 0)))
+            self.assertEqual(fullscreen.transform.scale, 2.0)
+            self.assertEqual(window.source.end, (10, 20))
+        self.assertEqual(self.backend.fullscreen_color_effect, mag.const.COLOR_INVERSION_EFFECT)
+        self.assertEqual(self.backend.windows[window.hwnd].source, (0, 0, 10, 20))
+        self.assertEqual(sum(value for name, value in self.backend.calls.items() if 'Get' in name), 0)
+
+    def test_invalidate(self):
+        transform = self.api.fullscreen.transform
+        self.assertEqual(transform.scale, 1.0)
+        self.assertEqual(self.backend.calls['MagGetFullscreenTransform'], 1)
+        mag.set_fullscreen_transform(3.0, (0, 0))
+        self.assertEqual(transform.scale, 1.0)
+        self.api.invalidate()
+        self.assertEqual(transform.scale, 3.0)
+        self.assertEqual(self.backend.calls['MagGetFullscreenTransform'], 2)
+
+        window = self.api.window
+        window.source.raw = (0, 0, 10, 10)
+        window.hwnd = self.backend.create_window()
+        self.assertEqual(window.source.raw, mag.const.DEFAULT_SOURCE)
+
+    def test_verify_interval(self):
+        self.api.use_shadow_state(verify_interval=0.0)
+        self.api.fullscreen.transform.raw = (2.0, (0, 0))
+        mag.set_fullscreen_transform(3.0, (0, 0))
+        self.assertEqual(self.api.fullscreen.transform.scale, 3.0)
+        self.api.use_shadow_state(enabled=False)
+        self.api.fullscreen.transform.scale
+        self.api.fullscreen.transform.scale
+        self.assertEqual(self.backend.calls['MagGetFullscreenTransform'], 3)
+
+
+class SnapshotTest(SimulatedBackendTestCase):
+    backend_options = dict(ui_access=True)
+
+    def setUp(self):
+        super().setUp()
+        self.api = mag.WinMagnificationAPI()
+
+    def tearDown(self):
+        self.api.dispose()
+
+    def count_calls(self, prefix: str) -> int:
+        return sum(value for name, value in self.backend.calls.items() if name.startswith(prefix))
+
+    def test_apply(self):
+        fullscreen, window = self.api.fullscreen, self.api.window
+        self.assertEqual(self.api.snapshot().window_source, None)
+        window.hwnd = self.backend.create_window()
+        initial = self.api.snapshot()
+        self.assertEqual(initial.fullscreen_transform, mag.const.DEFAULT_FULLSCREEN_TRANSFORM)
+        self.assertEqual(initial.window_filters, mag.const.DEFAULT_FILTERS_LIST)
+        fullscreen.color_effect.raw = mag.effects.grayscale(0.3)
+        window.source.raw = (0, 0, 100, 100)
+        preset = self.api.snapshot()
+
+        self.backend.reset_calls()
+        self.assertEqual(self.api.apply(initial), ('fullscreen_color_effect', 'window_source'))
+        self.assertEqual(self.count_calls('MagSet'), 2)
+        self.assertEqual(self.count_calls('MagGet'), 7)
+        self.assertEqual(self.api.snapshot(), initial)
+        self.assertEqual(self.api.apply(initial), ())
+
+        self.api.use_shadow_state()
+        self.backend.reset_calls()
+        self.assertEqual(self.api.apply(preset), ('fullscreen_color_effect', 'window_source'))
+        self.assertEqual(self.api.apply(preset), ())
+        self.assertEqual(self.api.apply(initial), ('fullscreen_color_effect', 'window_source'))
+        self.assertEqual(self.count_calls('MagSet'), 4)
+        self.assertEqual(self.count_calls('MagGet'), 7)
+
+    def test_window_skipped(self):
+        window = self.api.window
+        window.hwnd = self.backend.create_window()
+        window.source.raw = (0, 0, 10, 10)
+        preset = self.api.snapshot()
+        window.hwnd = 0
+        self.api.fullscreen.transform.scale = 2.0
+        self.assertEqual(self.api.apply(preset), ('fullscreen_transform',))
+        self.assertEqual(self.api.apply(preset._replace(fullscreen_transform=(2.0, (0, 0)))), ('fullscreen_transform',))
+
+
+class FiltersListTest(SimulatedBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = mag.WinMagnificationAPI()
+        self.api.window.hwnd = self.hwnd = self.backend.create_window()
+        self.filters = self.api.window.filters
+
+    def tearDown(self):
+        self.api.dispose()
+
+    def test_set_operations(self):
+        self.filters.add(1, 2, 3)
+        self.filters.add(2, 4)
+        self.filters.discard(1, 5)
+        self.assertEqual(self.backend.windows[self.hwnd].filters, (2, 3, 4))
+        self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 3)
+        self.filters.add(3)
+        self.filters.discard(10)
+        self.filters.update(added=(2,), removed=(7,))
+        self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 3)
+        self.assertEqual(list(self.filters), [2, 3, 4])
+        self.assertIn(3, self.filters)
+        self.filters.reset()
+        self.assertEqual(self.filters.raw, ())
+        # Empty list is still a wrapper
+        self.assertTrue(self.filters)
+
+    def test_many_windows(self):
+        hwnds = range(0x100, 0x100 + 5000)
+        with self.filters.deferred():
+            for hwnd in hwnds:
+                self.filters.add(hwnd)
+            self.filters.discard(*hwnds[:1000])
+            self.assertTrue(self.filters.pending)
+            self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 0)
+        self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 1)
+        self.backend.reset_calls()
+        self.assertEqual(mag.get_filters(self.hwnd), (True, tuple(hwnds[1000:])))
+        self.assertEqual(mag.get_filters(self.hwnd), (True, tuple(hwnds[1000:])))
+        # Count probed first, then list retrieved into buffer grown by set_filters
+        self.assertEqual(self.backend.calls['MagGetWindowFilterList'], 4)
+        mag.set_filters(self.hwnd, 1, 2)
+        self.assertEqual(mag.get_filters(self.hwnd), (True, (1, 2)))
+
+    def test_deferred(self):
+        with self.filters.deferred():
+            for hwnd in range(1, 100):
+                self.filters.add(hwnd)
+            self.filters.discard(50)
+            self.assertNotIn(50, self.filters)
+            self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 0)
+            self.assertTrue(self.filters.flush())
+            self.assertFalse(self.filters.flush())
+            self.filters.add(1)
+            self.filters.discard(1)
+            self.filters.add(1)
+        self.assertFalse(self.filters.pending)
+        self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 1)
+        with self.filters.deferred():
+            self.filters.add(200)
+            self.filters.raw = (5,)
+            self.assertFalse(self.filters.pending)
+        self.assertEqual(self.backend.windows[self.hwnd].filters, (5,))
+
+    def test_debounce(self):
+        now = [100.0]
+        patcher = unittest.mock.patch.object(mag._objects.time, 'monotonic', lambda: now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.filters.debounce = 0.5
+        for hwnd in range(1, 10):
+            self.filters.add(hwnd)
+        self.assertFalse(self.filters.flush_due())
+        self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 0)
+        now[0] += 0.5
+        # Last burst is written by timer tick, without another change
+        self.assertTrue(self.filters.flush_due())
+        self.assertFalse(self.filters.flush_due())
+        self.assertEqual(self.backend.windows[self.hwnd].filters, tuple(range(1, 10)))
+        self.filters.discard(1)
+        now[0] += 0.5
+        self.filters.discard(2)
+        self.assertEqual(self.backend.windows[self.hwnd].filters, tuple(range(3, 10)))
+        self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 2)
+
+    def test_written_remembered(self):
+        self.filters.add(1)
+        self.backend.reset_calls()
+        self.filters.add(2)
+        self.filters.discard(1)
+        self.assertEqual(self.backend.calls['MagSetWindowFilterList'], 2)
+        self.assertEqual(self.backend.calls['MagGetWindowFilterList'], 0)
+        # Outer changes are seen after invalidate
+        mag.set_filters(self.hwnd, 7)
+        self.api.invalidate()
+        self.filters.add(2)
+        self.assertEqual(self.backend.windows[self.hwnd].filters, (7, 2))
+
+
+class WindowsControllerTest(SimulatedBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = mag.WinMagnificationAPI()
+        self.hwnds = [self.backend.create_window() for _ in range(4)]
+        for hwnd in self.hwnds:
+            self.api.windows.add(hwnd)
+
+    def tearDown(self):
+        self.api.dispose()
+
+    def test_broadcast(self):
+        windows = self.api.windows
+        self.api.use_shadow_state()
+        self.assertEqual(list(windows), self.hwnds)
+        self.assertIs(windows.add(self.hwnds[0]), windows[self.hwnds[0]])
+        with unittest.mock.patch.object(
+            mag.tools, 'get_transform_matrix', wraps=mag.tools.get_transform_matrix,
+        ) as get_transform_matrix:
+            windows.set_scale(2.0, (10.0, 20.0))
+        get_transform_matrix.assert_called_once()
+        windows.set_color_effect(mag.const.COLOR_INVERSION_EFFECT)
+        windows.set_color_effect(None, self.hwnds[2:])
+        self.assertEqual(self.backend.calls['MagSetWindowTransform'], 4)
+        self.assertEqual(self.backend.calls['MagSetColorEffect'], 6)
+        self.backend.reset_calls()
+        # Broadcast values are kept in shadow state of each window
+        for hwnd, effect in zip(self.hwnds, [mag.const.COLOR_INVERSION_EFFECT] * 2 + [None] * 2):
+            window = windows[hwnd]
+            self.assertEqual(window.transform.pair, ((2.0, 2.0), (10.0, 20.0)))
+            self.assertEqual(window.color_effect.raw, effect)
+            self.assertEqual(self.backend.windows[hwnd].transform, window.transform.raw)
+        self.assertEqual(sum(value for name, value in self.backend.calls.items() if 'Get' in name), 0)
+        # Shadow state applied to windows added later
+        hwnd = self.backend.create_window()
+        windows.add(hwnd).source.raw = (0, 0, 10, 10)
+        mag.set_source(hwnd, (0, 0, 20, 20))
+        self.assertEqual(windows[hwnd].source.raw, (0, 0, 10, 10))
+        self.api.invalidate()
+        self.assertEqual(windows[hwnd].source.raw, (0, 0, 20, 20))
+        self.assertRaises(KeyError, windows.set_scale, 2.0, hwnds=[-1])
+        windows.remove(hwnd)
+        self.assertNotIn(hwnd, windows)
+        self.assertEqual(len(windows), 4)
+
+    def test_transaction(self):
+        windows = self.api.windows
+        with windows.transaction():
+            for index, window in enumerate(windows.values()):
+                window.transform.scale.same = 2.0
+                window.transform.offset.same = index
+                window.source.start = (index, index)
+            self.assertEqual(self.backend.calls['MagSetWindowTransform'], 0)
+        self.assertEqual(self.backend.calls['MagSetWindowTransform'], 4)
+        self.assertEqual(self.backend.calls['MagSetWindowSource'], 4)
+        self.assertEqual(self.backend.calls['MagGetWindowTransform'], 4)
+        for index, hwnd in enumerate(self.hwnds):
+            self.assertEqual(windows[hwnd].transform.pair, ((2.0, 2.0), (index, index)))
+            self.assertEqual(self.backend.windows[hwnd].source[:2], (index, index))
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_import_is_lazy(self):
+        code = "import sys, win_magnification; " \
+               "print(sorted(name for name in sys.modules if name.startswith('win_magnification')))"
+        output = subprocess.run((sys.executable, '-c', code), capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "['win_magnification']")
+
+    def test_attributes(self):
+        self.assertIs(mag.WinMagnificationAPI, mag._objects.WinMagnificationAPI)
+        self.assertIs(mag.initialize, mag._functional_wrapper.initialize)
+        self.assertIs(mag.set_source, mag._wrapper.set_source)
+        self.assertIn('effects', dir(mag))
+        self.assertIn('get_backend', dir(mag))
+        self.assertRaises(AttributeError, getattr, mag, 'missing')
+
+    def test_star_import(self):
+        # Public names of eager package version
+        baseline = {
+            'WinMagnificationAPI', 'const', 'effects', 'tools', 'types',
+            'initialize', 'finalize', 'to_simple_transform',
+            'get_transform', 'set_transform', 'get_transform_advanced', 'set_transform_advanced',
+            'reset_color_effect', 'reset_fullscreen_color_effect', 'reset_fullscreen_transform', 'reset_transform',
+            'get_color_effect', 'set_color_effect', 'get_filters', 'set_filters', 'get_source', 'set_source',
+            'get_fullscreen_color_effect', 'set_fullscreen_color_effect',
+            'get_fullscreen_transform', 'set_fullscreen_transform',
+            'get_input_transform', 'set_input_transform', 'set_cursor_visibility',
+        }
+        namespace = {}
+        exec('from win_magnification import *', namespace)
+        names = set(namespace) - {'__builtins__'}
+        self.assertLessEqual(baseline, names)
+        self.assertEqual(names, set(mag.__all__))
+        self.assertFalse({name for name in names if name.startswith('_') or name == 'TYPE_CHECKING'})
+
+    def test_literal_constants(self):
+        self.assertEqual(mag.const.COLOR_INVERTED_GRAYSCALE_EFFECT, mag.tools.combine_matrices(
+            mag.const.COLOR_GRAYSCALE_EFFECT,
+            mag.const.COLOR_INVERSION_EFFECT,
+        ))
+        pattern = tuple(mag.tools.get_extraction_pattern(
+            mag.const.TRANSFORMATION_MATRIX_SIZE, (0, 0), (1, 1), (0, 2), (1, 2)
+        ))
+        self.assertEqual(mag.const.DEFAULT_TRANSFORM_EXTRACTION_PATTERN, pattern)
+        pair = mag.tools.extract_from_matrix(mag.const.DEFAULT_TRANSFORM, *pattern)
+        self.assertEqual(mag.const.DEFAULT_TRANSFORM_PAIR, (pair[:2], pair[2:]))
+
+
 class MagnificationControlWindowTest(unittest.TestCase):
     def setUp(self):
         self.window = windows_utils.MagnifierWindow()
@@ -4,17 +4,87 @@ Author: MaxBQb |
 `Microsoft Docs <https://docs.microsoft.com/en-us/windows/win32/api/_magapi/>`_ |
 `Header <https://pastebin.com/Lh82NjjM>`_
 """
-from win_magnification._objects import WinMagnificationAPI
-from win_magnification._functional_wrapper import *
-from win_magnification._wrapper import (
-    get_fullscreen_color_effect, set_fullscreen_color_effect,
-    set_fullscreen_transform, get_fullscreen_transform,
-    get_color_effect, set_color_effect,
-    set_source, get_source,
-    set_filters, get_filters,
-    get_input_transform, set_input_transform,
-    set_cursor_visibility
-)
-from win_magnification import const
-from win_magnification import effects
-from win_magnification import tools
+from importlib import import_module as _import_module
+
+# Same as typing.TYPE_CHECKING, but doesn't import typing
+_TYPE_CHECKING = False
+if _TYPE_CHECKING:
+    from win_magnification._objects import WinMagnificationAPI
+    from win_magnification._functional_wrapper import *
+    from win_magnification._wrapper import (
+        get_fullscreen_color_effect, set_fullscreen_color_effect,
+        set_fullscreen_transform, get_fullscreen_transform,
+        get_color_effect, set_color_effect,
+        set_source, get_source,
+        set_filters, get_filters,
+        get_input_transform, set_input_transform,
+        set_cursor_visibility,
+        deduplicator,
+    )
+    from win_magnification.backends import get_backend, set_backend, use_backend
+    from win_magnification.worker import MagnificationWorker
+    from win_magnification.metrics import stats
+    from win_magnification import backends
+    from win_magnification import aio
+    from win_magnification import animation
+    from win_magnification import const
+    from win_magnification import effects
+    from win_magnification import mapping
+    from win_magnification import metrics
+    from win_magnification import recording
+    from win_magnification import tools
+    from win_magnification import tracking
+    from win_magnification import worker
+
+# Submodules are imported on first access (PEP 562),
+# so short-lived processes pay only for what they use
+_LAZY_ATTRIBUTES = {
+    'WinMagnificationAPI': '_objects',
+    **dict.fromkeys((
+        'initialize', 'finalize',
+        'set_transform_advanced', 'get_transform_advanced',
+        'set_transform', 'get_transform', 'to_simple_transform',
+        'reset_fullscreen_color_effect', 'reset_fullscreen_transform',
+        'reset_transform', 'reset_color_effect',
+    ), '_functional_wrapper'),
+    **dict.fromkeys((
+        'get_fullscreen_color_effect', 'set_fullscreen_color_effect',
+        'set_fullscreen_transform', 'get_fullscreen_transform',
+        'get_color_effect', 'set_color_effect',
+        'set_source', 'get_source',
+        'set_filters', 'get_filters',
+        'get_input_transform', 'set_input_transform',
+        'set_cursor_visibility',
+        'deduplicator',
+    ), '_wrapper'),
+    **dict.fromkeys(('get_backend', 'set_backend', 'use_backend'), 'backends'),
+    'MagnificationWorker': 'worker',
+    'stats': 'metrics',
+}
+
+_SUBMODULES = frozenset((
+    'aio', 'animation', 'backends', 'const', 'effects', 'mapping', 'metrics',
+    'old', 'recording', 'tools', 'tracking', 'types', 'worker',
+    '_functional_wrapper', '_object_utils', '_objects', '_utils', '_wrapper',
+))
+
+__all__ = [
+    *_LAZY_ATTRIBUTES,
+    *sorted(name for name in _SUBMODULES if not name.startswith('_')),
+]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        value = getattr(_import_module(f'{__name__}.{module_name}'), name)
+    elif name in _SUBMODULES:
+        value = _import_module(f'{__name__}.{name}')
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRIBUTES, *_SUBMODULES})
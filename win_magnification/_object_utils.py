@@ -5,17 +5,50 @@
 from __future__ import annotations
 
 import contextlib
-import inspect
 import threading
+import time
 import typing
 
 _PropertiesObserverType = typing.TypeVar('_PropertiesObserverType', bound='PropertiesObserver')
 
 
+class ObservedField:
+    """
+    | Data descriptor of field observed by :class:`PropertiesObserver`
+    | Value is stored in instance ``__dict__`` under the same name
+    """
+
+    def __init__(self):
+        self.name = ''
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, instance: typing.Optional[PropertiesObserver], owner: typing.Optional[type] = None):
+        if instance is None:
+            return self
+        if instance._lazy_read:
+            instance._before_field_read()
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, instance: PropertiesObserver, value):
+        instance._set_field(self.name, value)
+
+    def __delete__(self, instance: PropertiesObserver):
+        instance._delete_field(self.name)
+
+
 class PropertiesObserver:
     """
+    | Fields declared as :class:`ObservedField` are observed
     | Usage example:
     >>> class MyPropertiesObserver(PropertiesObserver):
+    ...     property1 = ObservedField()
+    ...     property2 = ObservedField()
+    ...
     ...     def __init__(self):
     ...         self.property1 = 10
     ...         self.property2 = 10
@@ -31,11 +64,26 @@ class PropertiesObserver:
     update
     update
     """
+    _observed_fields: typing.Tuple[str, ...] = ()
+    # Defaults for fields assigned before __init__ of this class
+    _observers: typing.Optional[typing.Set[typing.Callable]] = None
+    _lazy_read = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Computed once per class instead of scanning each instance
+        fields: typing.Dict[str, None] = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, ObservedField):
+                    fields[name] = None
+                else:
+                    fields.pop(name, None)
+        cls._observed_fields = tuple(fields)
 
     def __init__(self):
         self._ignored_changes = set()
         self._all_changes_ignored = False
-        self._inner_observables = set()
         self._is_property = False
         self._observers = set()
         self._locks: typing.Dict[str, threading.RLock] = dict()
@@ -49,20 +97,37 @@ class PropertiesObserver:
 
     @property
     def _properties_observed(self):
+        values = self.__dict__
         return {
-            key: value for key, value in vars(self).items() if self.__is_property_observed(key)
+            name: values[name] for name in self._observed_fields
+            if name in values and self.__is_property_observed(name)
         }
 
     def __is_property_observed(self, name: str):
-        if self._all_changes_ignored or name in self._ignored_changes:
-            return False
+        return not self._all_changes_ignored and name not in self._ignored_changes
 
-        if not (name in self._inner_observables or
-                not name.startswith('_')):
-            return False
+    def _before_field_read(self):
+        """Called before each read of observed field"""
 
-        prop = getattr(type(self), name, None)
-        return not prop or not inspect.isdatadescriptor(prop)
+    def _set_field(self, name: str, value):
+        notify = self._observers is not None and \
+            self.__is_property_observed(name)
+        if notify:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.RLock()
+            lock.acquire()
+        self.__dict__[name] = value
+        if notify:
+            with self._ignore_changes(name):
+                self._on_property_changed(name, value)
+            lock.release()
+
+    def _delete_field(self, name: str):
+        try:
+            del self.__dict__[name]
+        except KeyError:
+            raise AttributeError(name) from None
 
     @contextlib.contextmanager
     def _ignore_changes(self, *names: str):
@@ -85,18 +150,6 @@ class PropertiesObserver:
         finally:
             self._all_changes_ignored = False
 
-    def __setattr__(self, name: str, value):
-        notify = hasattr(self, "_observers") and \
-                 self.__is_property_observed(name)
-        if notify:
-            self._locks.setdefault(name, threading.RLock())
-            self._locks[name].acquire()
-        super().__setattr__(name, value)
-        if notify:
-            with self._ignore_changes(name):
-                self._on_property_changed(name, value)
-            self._locks[name].release()
-
     def __subscribe_property(self, prop_name, value):
         if not isinstance(value, PropertiesObserver):
             return
@@ -163,8 +216,23 @@ class DataSource(typing.Generic[T]):
         | Save last value or get fresh one each time?
         | |Accessors: Get Set|
         """
+        self.shadow: bool = False
+        """
+        | Keep copy of the last value written (or retrieved) and use it instead of getting fresh one,
+          until :meth:`invalidate` called or :attr:`verify_interval` passed
+        | Values are kept as is, so don't change them after write
+        | |Accessors: Get Set|
+        """
+        self.verify_interval: typing.Optional[float] = None
+        """
+        | Time (in seconds) :attr:`shadow` copy is used for, None to use it until :meth:`invalidate` call
+        | |Accessors: Get Set|
+        """
         self._has_cache = False
         self._cache: T = None
+        self._has_shadow = False
+        self._shadow: T = None
+        self._shadow_time = 0.0
 
     def source(self) -> T:
         """Overridable method of getting fresh data"""
@@ -180,24 +248,56 @@ class DataSource(typing.Generic[T]):
         """
         return self._has_cache and self.use_cache
 
+    @property
+    def has_shadow(self) -> bool:
+        """
+        | True if :attr:`shadow` copy is kept, and it should be used instead of getting fresh one
+        | |Accessors: Get|
+        """
+        if not (self.shadow and self._has_shadow):
+            return False
+        interval = self.verify_interval
+        return interval is None or time.monotonic() - self._shadow_time < interval
+
+    def invalidate(self):
+        """Forgets values saved, so the next read gets fresh one"""
+        self._has_cache = False
+        self._has_shadow = False
+
+    def _remember(self, value: T):
+        self._shadow = value
+        self._shadow_time = time.monotonic()
+        self._has_shadow = True
+
     @property
     def data(self) -> T:
         """
         | Value from datasource
         | When :attr:`.use_cache` enabled stores and reuses the last value retrieved
+        | When :attr:`.shadow` enabled reuses the last value written or retrieved
         | |Accessors: Get Set|
         """
+        if self.shadow:
+            if self.has_shadow:
+                return self._shadow
         if self.use_cache:
             if not self._has_cache:
                 self._cache = self.source()
                 self._has_cache = True
-            return self._cache
-        return self.source()
+            value = self._cache
+        else:
+            value = self.source()
+        if self.shadow:
+            self._remember(value)
+        return value
 
     @data.setter
     def data(self, value: T):
         self._has_cache = False
+        self._has_shadow = False
         self.setter(value)
+        if self.shadow:
+            self._remember(value)
 
     @classmethod
     def dynamic(cls: typing.Type[WrappedFieldType], source: TSource, setter: TSetter) -> WrappedFieldType:
@@ -229,6 +329,7 @@ class DataSource(typing.Generic[T]):
 
 
 WrappedFieldType = typing.TypeVar('WrappedFieldType', bound='WrappedField')  #: Any child of :class:`WrappedField`
+_NOT_SET = object()
 
 
 class WrappedField(PropertiesObserver, typing.Generic[T]):
@@ -244,6 +345,7 @@ class WrappedField(PropertiesObserver, typing.Generic[T]):
             datasource: typing.Optional[DataSource[T]] = None
     ):
         self._source_dependent = set()
+        self._deferred_raw = _NOT_SET
 
         def set_value(x: T):
             with self.batch():
@@ -260,43 +362,42 @@ class WrappedField(PropertiesObserver, typing.Generic[T]):
         super().__init__()
 
         def set_raw():
+            deferred, self._deferred_raw = self._deferred_raw, _NOT_SET
             with self._ignore_all_changes():
-                self.raw = self._raw
+                value = self._raw
+                if deferred is not _NOT_SET and value == deferred[1]:
+                    # Fields unchanged since raw value set, so it's written as is (nothing lost by fields)
+                    value = deferred[0]
+                self.raw = value
 
         self.subscribe(set_raw)
 
     def _subscribe_initial(self):
         super()._subscribe_initial()
         self._source_dependent = set(self._properties_observed)
+        # Fields are read from datasource from now on
+        self._lazy_read = True
 
-    def __getattribute__(self, item):
-        if item != '_source_dependent' and \
-                item != '_all_changes_ignored' and \
-                hasattr(self, '_source_dependent') and \
-                not getattr(self, '_all_changes_ignored', True) and \
-                item in getattr(self, '_source_dependent'):
+    def _before_field_read(self):
+        if not self._all_changes_ignored:
             self._read_all()
-        return super().__getattribute__(item)
 
-    def __setattr__(self, key, value):
-        if hasattr(self, '_source_dependent') and \
-                key in getattr(self, '_source_dependent'):
+    def _set_field(self, name: str, value):
+        if self._lazy_read and name in self._source_dependent:
             if not self._all_changes_ignored:
                 self._read_all()
             if isinstance(value, WrappedField):
-                try:
-                    field: WrappedField = getattr(self, key)
+                field = self.__dict__.get(name)
+                if field is not None:
                     field.raw = value.raw
                     return
-                except AttributeError:
-                    pass
-        super().__setattr__(key, value)
+        super()._set_field(name, value)
 
-    def __delattr__(self, item):
-        if item in self._source_dependent:
-            setattr(self, item, getattr(self.default, item))
+    def _delete_field(self, name: str):
+        if name in self._source_dependent:
+            setattr(self, name, getattr(self.default, name))
         else:
-            return super().__delattr__(item)
+            super()._delete_field(name)
 
     @property
     def _raw(self) -> T:
@@ -311,10 +412,20 @@ class WrappedField(PropertiesObserver, typing.Generic[T]):
             with self._ignore_all_changes():
                 self._raw = self.raw
 
+    def _defer_raw(self, value: T):
+        datasource = self._datasource
+        # Reads inside batch see value not written yet
+        datasource._cache, datasource._has_cache = value, True
+        with self._ignore_all_changes():
+            self._raw = value
+            self._deferred_raw = value, self._raw
+        self._has_changes = True
+
     @contextlib.contextmanager
     def batch(self: WrappedFieldType):
         """
         | Use this *contextmanager* to read/write fields at one shot
+        | :attr:`raw` values set inside are written on exit too
         | See example in :class:`parent <PropertiesObserver>`
         """
         if self._batching_changes:
@@ -349,12 +460,16 @@ class WrappedField(PropertiesObserver, typing.Generic[T]):
         """
         | Raw value with no wrappers used
         | |Accessors: Get Set Delete|
+        | **Setter**: inside :meth:`batch` value is written on exit
         | **Deleter**: resets value with :attr:`.default`
         """
         return self._datasource.data
 
     @raw.setter
     def raw(self, value: T):
+        if self._batching_changes:
+            self._defer_raw(value)
+            return
         self._datasource.data = value
 
     @raw.deleter
@@ -365,6 +480,10 @@ class WrappedField(PropertiesObserver, typing.Generic[T]):
         """Resets value of wrapped field to :attr:`.default`"""
         del self.raw
 
+    def invalidate(self):
+        """Forgets values saved by datasource, so the next read gets fresh one"""
+        self._datasource.invalidate()
+
 
 def ensure_same(*values: T) -> typing.Optional[T]:
     pattern = values[0]
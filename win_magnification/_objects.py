@@ -4,11 +4,16 @@
 """
 from __future__ import annotations
 
+import array
+import contextlib
+import ctypes
+import time
 import typing
 
 from win_magnification import _functional_wrapper as _wrapper2
 from win_magnification import _object_utils as _utils
 from win_magnification import _wrapper
+from win_magnification import animation
 from win_magnification import const
 from win_magnification import tools
 from win_magnification import types
@@ -21,16 +26,17 @@ class MatrixWrapper(tools.Matrix, _utils.WrappedField[LM], typing.Generic[LM]):
     Observable matrix wrapper
     """
     _SIZE = 4
+    # Overrides slot of Matrix, so value is kept in __dict__ and observed
+    _value = _utils.ObservedField()
+    _pack = tuple
 
     def __init__(
         self,
         datasource: typing.Optional[_utils.DataSource[LM]] = None,
     ):
-        tools.Matrix.__init__(self)
+        tools.Matrix.__init__(self, self._ACCURACY)
         self._resize(self._SIZE)
         _utils.WrappedField.__init__(self, datasource)
-        self._inner_observables.add('_value')
-        self._subscribe_initial()
 
     @property
     def _raw(self) -> LM:
@@ -45,6 +51,9 @@ class Vector2(_utils.WrappedField[typing.Tuple[float, float]]):
     """
     Pair of horizontal and vertical components
     """
+    x = _utils.ObservedField()
+    y = _utils.ObservedField()
+
     def __init__(
         self,
         datasource: typing.Optional[_utils.DataSource[typing.Tuple[float, float]]] = None,
@@ -115,6 +124,8 @@ class FullscreenOffsetWrapper(_utils.WrappedField[typing.Tuple[int, int]]):
     .. include:: ../shared/wrapper/component.rst
     """
     _DEFAULT_RAW = const.DEFAULT_FULLSCREEN_TRANSFORM[1]
+    x = _utils.ObservedField()
+    y = _utils.ObservedField()
 
     def __init__(
         self,
@@ -168,6 +179,10 @@ class RectangleWrapper(_utils.WrappedField['types.Rectangle']):
     .. include:: ../shared/wrapper/component.rst
     """
     _DEFAULT_RAW = const.ZERO_RECT
+    left = _utils.ObservedField()
+    top = _utils.ObservedField()
+    right = _utils.ObservedField()
+    bottom = _utils.ObservedField()
 
     def __init__(
         self,
@@ -309,6 +324,19 @@ class ColorMatrixWrapper(MatrixWrapper['types.ColorMatrix']):
         super().__init__(datasource)
         self._transition: typing.Optional[tools.Transition] = None
         self._transition_power = 0.0
+        self._stack: typing.Optional[EffectStack] = None
+
+    @property
+    def stack(self) -> EffectStack:
+        """
+        | Ordered layers of color effects, combined into this one
+        | Direct changes of this color effect will be overwritten
+          on next change of stack
+        | |Accessors: Get|
+        """
+        if self._stack is None:
+            self._stack = EffectStack(self)
+        return self._stack
 
     @property
     def transition_power(self) -> float:
@@ -330,8 +358,13 @@ class ColorMatrixWrapper(MatrixWrapper['types.ColorMatrix']):
     def transition_power(self, value: typing.Union[float, int]):
         value = float(value)
         self._transition_power = value
-        if self._transition:
-            self.linear = self._transition(value)
+        transition = self._transition
+        if transition:
+            if isinstance(transition, tools.TransitionTable):
+                # Frame is taken from table as is, size checked in from_transition
+                self._raw = transition(value)
+            else:
+                self.linear = transition(value)
 
     @property
     def transition(self) -> typing.Optional[tools.Transition]:
@@ -346,6 +379,7 @@ class ColorMatrixWrapper(MatrixWrapper['types.ColorMatrix']):
         end: tools.Matrix.Any,
         start: typing.Optional[tools.Matrix.Any] = None,
         initial_power: typing.Optional[typing.Union[float, int]] = None,
+        steps: typing.Optional[int] = None,
     ):
         """
         | Setup and apply transition from **start** to **end**
@@ -361,6 +395,8 @@ class ColorMatrixWrapper(MatrixWrapper['types.ColorMatrix']):
         :param initial_power: Float scale of transition
             normally stays between :abbr:`0 (start)` and :abbr:`1 (end)` to get transition effect
             (default: last value used or 0)
+        :param steps: Bake transition into :class:`.TransitionTable` with that many steps
+            (default: compute each state)
         :raises TypeError: If params conversion fails
         """
         if start is None:
@@ -376,6 +412,7 @@ class ColorMatrixWrapper(MatrixWrapper['types.ColorMatrix']):
         self.from_transition(tools.get_transition(
             start.linear,
             end.linear,
+            steps,
         ), initial_power)
 
     def from_transition(
@@ -386,25 +423,436 @@ class ColorMatrixWrapper(MatrixWrapper['types.ColorMatrix']):
         """
         Setup and apply transition from existing one
 
-        :param transition: one of :mod:`.effects` or copy of :attr:`last used one <transition>`
+        :param transition: one of :mod:`.effects`, :class:`.TransitionTable`
+            or copy of :attr:`last used one <transition>`
         :param initial_power: Float start scale of transition
             normally stays between :abbr:`0 (start)` and :abbr:`1 (end)` to get transition effect
             (default: last value used or 0)
+        :raises ValueError: On :class:`.TransitionTable` frame size mismatch
         """
+        if isinstance(transition, tools.TransitionTable) and transition.size != self._size:
+            raise ValueError(f"Transition table frame size mismatch\n"
+                             f"Expected {self._size}, got {transition.size}")
         if initial_power is None:
             initial_power = self.transition_power
         self._transition = transition
         self.transition_power = initial_power
 
+    def player(
+        self,
+        duration: float,
+        fps: float = 60.0,
+        easing: animation.Easing = animation.linear,
+        start_power: float = 0.0,
+        end_power: float = 1.0,
+    ) -> animation.TransitionPlayer:
+        """
+        | Creates player of current :attr:`transition`, which changes
+          :attr:`transition_power` from **start_power** to **end_power**
+          over **duration** at **fps** frame rate
+        | Use :meth:`~.TransitionPlayer.run` to play it,
+          :meth:`~.TransitionPlayer.cancel` or :meth:`~.TransitionPlayer.retarget`
+          to change it mid-flight
+
+        :param duration: Time of transition (in seconds)
+        :param fps: Target frame rate
+        :param easing: Progress transformation (see :mod:`.animation`)
+        :param start_power: Initial transition power
+        :param end_power: Final transition power
+        :return: New player
+        """
+        return animation.TransitionPlayer(self, duration, fps, easing, start_power, end_power)
+
+    def play(self, *args, **kwargs) -> animation.FrameStats:
+        """
+        | Plays current :attr:`transition`, blocking current thread
+        | Accepts the same arguments as :meth:`player`
+
+        :return: Actual frame rate, jitter and dropped frames
+        """
+        return self.player(*args, **kwargs).run()
+
+
+class EffectLayer:
+    """
+    | Single layer of :class:`EffectStack`
+    | Use :meth:`EffectStack.add` to create one
+    | Layer removed from its stack may still be changed, but it affects nothing
+    """
+
+    def __init__(
+        self,
+        stack: EffectStack,
+        transition: tools.Transition,
+        power: typing.Union[float, int] = 1.0,
+    ):
+        self._stack: typing.Optional[EffectStack] = stack
+        self._transition = transition
+        self._power = float(power)
+        self.matrix: types.ColorMatrix = tuple(transition(self._power))
+        """
+        | Color effect of this layer with current :attr:`power`
+        | |Accessors: Get|
+        """
+
+    @property
+    def transition(self) -> tools.Transition:
+        """
+        | One of :mod:`.effects`, :class:`.TransitionTable` or result of :func:`.get_transition`
+        | |Accessors: Get Set|
+        """
+        return self._transition
+
+    @transition.setter
+    def transition(self, value: tools.Transition):
+        self._transition = value
+        self.power = self._power
+
+    @property
+    def power(self) -> float:
+        """
+        | Scale of layer :attr:`transition`
+        | |Accessors: Get Set|
+        """
+        return self._power
+
+    @power.setter
+    def power(self, value: typing.Union[float, int]):
+        self._power = float(value)
+        self.matrix = tuple(self._transition(self._power))
+        if self._stack is not None:
+            self._stack._on_layer_change(self)
+
+
+class EffectStack:
+    """
+    | Ordered layers of color effects, applied one after another
+    | Result is written to :class:`ColorMatrixWrapper` on each change,
+      or once per :meth:`batch`
+    | Products of layers before and after the last changed one are cached,
+      so changing the same layer again costs two matrix multiplications
+    | Example:
+
+    >>> from win_magnification import effects
+    >>> stack = EffectStack(ColorMatrixWrapper())
+    >>> grayscale = stack.add(effects.grayscale)
+    >>> inversion = stack.add(effects.inversion, 0.0)
+    >>> stack.target.linear == const.COLOR_GRAYSCALE_EFFECT
+    True
+    >>> with stack.batch():
+    ...     grayscale.power = 0.0
+    ...     inversion.power = 1.0
+    >>> stack.target.linear == const.COLOR_INVERSION_EFFECT
+    True
+    """
+
+    def __init__(self, target: ColorMatrixWrapper):
+        """
+        :param target: Color effect to write result to
+        """
+        self.target = target
+        """
+        | Color effect result written to
+        | |Accessors: Get|
+        """
+        self._layers: typing.List[EffectLayer] = []
+        self._pivot: typing.Optional[int] = None
+        self._prefix: types.ColorMatrix = const.COLOR_NO_EFFECT
+        self._suffix: types.ColorMatrix = const.COLOR_NO_EFFECT
+        self._result: types.ColorMatrix = const.COLOR_NO_EFFECT
+        self._batching = False
+        self._changed: typing.Set[EffectLayer] = set()
+        self._restructured = False
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __iter__(self) -> typing.Iterator[EffectLayer]:
+        return iter(self._layers)
+
+    def __getitem__(self, index: int) -> EffectLayer:
+        return self._layers[index]
+
+    @property
+    def result(self) -> types.ColorMatrix:
+        """
+        | Combination of all layers
+        | |Accessors: Get|
+        """
+        return self._result
+
+    def add(
+        self,
+        transition: tools.Transition,
+        power: typing.Union[float, int] = 1.0,
+        index: typing.Optional[int] = None,
+    ) -> EffectLayer:
+        """
+        Inserts new layer
+
+        :param transition: One of :mod:`.effects`, :class:`.TransitionTable` or result of :func:`.get_transition`
+        :param power: Initial scale of **transition**
+        :param index: Position of new layer (default: last, applied after others)
+        :return: New layer
+        """
+        layer = EffectLayer(self, transition, power)
+        if index is None:
+            self._layers.append(layer)
+        else:
+            self._layers.insert(index, layer)
+        self._on_restructure()
+        return layer
+
+    def remove(self, layer: EffectLayer):
+        """
+        Removes **layer** from stack
+
+        :param layer: Layer created by :meth:`add`
+        :raises ValueError: If **layer** isn't in stack
+        """
+        self._layers.remove(layer)
+        layer._stack = None
+        self._on_restructure()
+
+    def clear(self):
+        """Removes all layers"""
+        for layer in self._layers:
+            layer._stack = None
+        self._layers.clear()
+        self._on_restructure()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        | Use this *contextmanager* to change several layers at once
+        | Result is combined and written only on exit
+        """
+        if self._batching:
+            yield self
+            return
+        self._batching = True
+        try:
+            yield self
+        finally:
+            self._batching = False
+            changed, self._changed = self._changed, set()
+            restructured, self._restructured = self._restructured, False
+            if restructured or len(changed) > 1:
+                self._pivot = None
+            indexes = [index for index, layer in enumerate(self._layers) if layer in changed]
+            if indexes:
+                self._update(indexes[-1])
+            elif restructured:
+                self._update(len(self._layers) - 1)
+
+    def _on_layer_change(self, layer: EffectLayer):
+        if self._batching:
+            self._changed.add(layer)
+        else:
+            self._update(self._layers.index(layer))
+
+    def _on_restructure(self):
+        if self._batching:
+            self._restructured = True
+            return
+        self._pivot = None
+        self._update(len(self._layers) - 1)
+
+    def _update(self, index: int):
+        layers = self._layers
+        if not layers:
+            self._pivot = None
+            result = const.COLOR_NO_EFFECT
+        else:
+            if self._pivot != index:
+                # Caches are valid only while the same layer changes
+                self._prefix = self._product(layers[:index])
+                self._suffix = self._product(layers[index + 1:])
+                self._pivot = index
+            result = tools.combine_matrices(
+                tools.combine_matrices(self._prefix, layers[index].matrix),
+                self._suffix,
+            )
+        self._result = result
+        self.target.linear = result
+
+    @staticmethod
+    def _product(layers: typing.Sequence[EffectLayer]) -> types.ColorMatrix:
+        if not layers:
+            return const.COLOR_NO_EFFECT
+        return tools.combine_chain(layer.matrix for layer in layers)
+
 
 class FiltersListWrapper(_utils.WrappedField[tuple]):
     """
-    Window filtration list
+    | Window filtration list
+    | Also may be changed as ordered set with :meth:`add`, :meth:`discard` and :meth:`update`,
+      these changes are written only if set of windows changed
+    | Set of windows written last is remembered, so changes don't read list back,
+      call :meth:`invalidate` after list changed elsewhere
+    | Use :meth:`deferred` or :attr:`debounce` to write many changes at once
 
     .. include:: ../shared/wrapper/common.rst
     """
     _DEFAULT_RAW = const.DEFAULT_FILTERS_LIST
 
+    def __init__(self, datasource: typing.Optional[_utils.DataSource[tuple]] = None):
+        self.debounce: float = 0.0
+        """
+        | Time (in seconds) changes are kept unwritten since the first of them,
+          so bursts of changes are written at once
+        | Changes are written by the first change made after that time or by :meth:`flush_due`,
+          call it periodically (like on timer), so the last burst isn't kept unwritten
+        | |Accessors: Get Set|
+        """
+        self._pending: typing.Optional[typing.Dict[int, None]] = None
+        self._pending_since = 0.0
+        self._last_written: typing.Optional[typing.Dict[int, None]] = None
+        self._deferred = 0
+        super().__init__(datasource)
+
+    @property
+    def pending(self) -> bool:
+        """
+        | Are there changes not written yet
+        | |Accessors: Get|
+        """
+        return self._pending is not None
+
+    def _changes(self) -> typing.Dict[int, None]:
+        if self._pending is None:
+            if self._last_written is None:
+                self._last_written = dict.fromkeys(self.raw)
+            self._pending = dict(self._last_written)
+            self._pending_since = time.monotonic()
+        return self._pending
+
+    def _is_due(self) -> bool:
+        return self.debounce <= 0 or time.monotonic() - self._pending_since >= self.debounce
+
+    def _changed(self):
+        if not self._deferred and self._is_due():
+            self.flush()
+
+    def add(self, *hwnds: int):
+        """
+        Adds windows to the end of list, if they aren't there yet
+
+        :param hwnds: Window handles
+        """
+        self._changes().update(dict.fromkeys(hwnds))
+        self._changed()
+
+    def discard(self, *hwnds: int):
+        """
+        Removes windows from list, if they are there
+
+        :param hwnds: Window handles
+        """
+        changes = self._changes()
+        for hwnd in hwnds:
+            changes.pop(hwnd, None)
+        self._changed()
+
+    def update(self, added: typing.Iterable[int] = (), removed: typing.Iterable[int] = ()):
+        """
+        Adds and removes many windows at once
+
+        :param added: Window handles to add
+        :param removed: Window handles to remove
+        """
+        changes = self._changes()
+        for hwnd in removed:
+            changes.pop(hwnd, None)
+        changes.update(dict.fromkeys(added))
+        self._changed()
+
+    def flush(self) -> bool:
+        """
+        | Writes changes made
+        | Called by :meth:`deferred` on exit, so only needed to write changes before it
+          or without waiting for :attr:`debounce` time
+
+        :return: False if nothing written (set of windows unchanged)
+        """
+        changes, self._pending = self._pending, None
+        written = self._last_written
+        if changes is None or written is not None and changes.keys() == written.keys():
+            return False
+        self.raw = tuple(changes)
+        return True
+
+    def flush_due(self) -> bool:
+        """
+        | Writes changes, if :attr:`debounce` time passed since the first of them
+        | Changes made inside :meth:`deferred` are left for it
+
+        :return: False if nothing written (no changes, not due yet or set of windows unchanged)
+        """
+        if self._pending is None or self._deferred or not self._is_due():
+            return False
+        return self.flush()
+
+    def invalidate(self):
+        """Forgets set of windows written last, so the next change reads list back"""
+        super().invalidate()
+        self._last_written = None
+
+    @contextlib.contextmanager
+    def deferred(self):
+        """
+        | Use this *contextmanager* to write all changes made inside at once
+        | Iteration and ``in`` checks inside see changes not written yet
+        | Changes are written even if block raises
+        """
+        self._deferred += 1
+        try:
+            yield self
+        finally:
+            self._deferred -= 1
+            if not self._deferred:
+                self.flush()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        | Use this *contextmanager* to write all changes made inside at once,
+          like :meth:`deferred` does
+        | See :meth:`.WrappedField.batch`
+        """
+        with super().batch(), self.deferred():
+            yield self
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self._pending if self._pending is not None else self.raw)
+
+    def __contains__(self, hwnd: int) -> bool:
+        return hwnd in (self._pending if self._pending is not None else self.raw)
+
+    @property
+    def raw(self) -> tuple:
+        """
+        | Raw value with no wrappers used (changes not written aren't included)
+        | |Accessors: Get Set Delete|
+        | **Setter**: drops changes not written, inside :meth:`batch` value is written on exit
+        | **Deleter**: resets value with :attr:`.default`
+        """
+        return self._datasource.data
+
+    @raw.setter
+    def raw(self, value: tuple):
+        self._pending = None
+        self._last_written = None
+        if self._batching_changes:
+            self._defer_raw(value)
+            return
+        self._datasource.data = value
+        self._last_written = dict.fromkeys(value)
+
+    @raw.deleter
+    def raw(self):
+        self.raw = self._DEFAULT_RAW
+
 
 class FullscreenTransformWrapper(_utils.WrappedField['types.FullscreenTransform']):
     """
@@ -413,6 +861,8 @@ class FullscreenTransformWrapper(_utils.WrappedField['types.FullscreenTransform'
     .. include:: ../shared/wrapper/head.rst
     """
     _DEFAULT_RAW = const.DEFAULT_FULLSCREEN_TRANSFORM
+    scale = _utils.ObservedField()
+    offset = _utils.ObservedField()
 
     def __init__(
         self,
@@ -439,6 +889,24 @@ class FullscreenTransformWrapper(_utils.WrappedField['types.FullscreenTransform'
     def _raw(self, value):
         self.scale, self.offset.raw = value
 
+    def animator(
+        self,
+        duration: float = 0.25,
+        fps: float = 60.0,
+        easing: animation.Easing = animation.ease_in_out,
+    ) -> animation.ZoomAnimator:
+        """
+        | Creates animator, which smoothly moves this transformation
+          to states requested by :meth:`~.ZoomAnimator.zoom_to`
+        | Use :meth:`~.ZoomAnimator.run` to play it
+
+        :param duration: Default time of motion (in seconds)
+        :param fps: Target frame rate
+        :param easing: Progress transformation (see :mod:`.animation`)
+        :return: New animator
+        """
+        return animation.ZoomAnimator(self, duration, fps, easing)
+
 
 class InputTransformWrapper(_utils.WrappedField['types.InputTransform']):
     """
@@ -447,6 +915,9 @@ class InputTransformWrapper(_utils.WrappedField['types.InputTransform']):
     .. include:: ../shared/wrapper/head.rst
     """
     _DEFAULT_RAW = const.DEFAULT_INPUT_TRANSFORM
+    enabled = _utils.ObservedField()
+    source = _utils.ObservedField()
+    destination = _utils.ObservedField()
 
     def __init__(
         self,
@@ -488,6 +959,8 @@ class TransformationMatrixWrapper(_utils.WrappedField['types.TransformationMatri
     .. include:: ../shared/wrapper/head.rst
     """
     _DEFAULT_RAW = const.DEFAULT_TRANSFORM
+    scale = _utils.ObservedField()
+    offset = _utils.ObservedField()
 
     def __init__(
         self,
@@ -508,7 +981,7 @@ class TransformationMatrixWrapper(_utils.WrappedField['types.TransformationMatri
 
     @property
     def _raw(self):
-        return const.tools.get_transform_matrix(*self.scale.raw, *self.offset.raw)
+        return tools.get_transform_matrix(*self.scale.raw, *self.offset.raw)
 
     @_raw.setter
     def _raw(self, value):
@@ -529,7 +1002,43 @@ class TransformationMatrixWrapper(_utils.WrappedField['types.TransformationMatri
             self.scale.raw, self.offset.raw = value
 
 
-class FullscreenController:
+def _same(first, second) -> bool:
+    # Floats compared as the C side stores them
+    if isinstance(first, tuple) and isinstance(second, tuple):
+        return len(first) == len(second) and all(map(_same, first, second))
+    if isinstance(first, float) or isinstance(second, float):
+        return ctypes.c_float(first).value == ctypes.c_float(second).value
+    return first == second
+
+
+class _Controller:
+    def _wrappers(self) -> typing.Tuple[_utils.WrappedField, ...]:
+        return ()
+
+    def use_shadow_state(self, enabled: bool = True, verify_interval: typing.Optional[float] = None):
+        """
+        | Reads are served from copy of the last value written (or read),
+          instead of Magnification API calls
+        | Use it when values changed only through this object,
+          otherwise call :meth:`invalidate` after outer changes
+        | See :attr:`.DataSource.shadow`
+
+        :param enabled: Use shadow state
+        :param verify_interval: Time (in seconds) copy is used for (default: until :meth:`invalidate` call)
+        """
+        for wrapper in self._wrappers():
+            datasource = wrapper._datasource
+            datasource.shadow = enabled
+            datasource.verify_interval = verify_interval
+            wrapper.invalidate()
+
+    def invalidate(self):
+        """Forgets shadow state, so the next reads get fresh values"""
+        for wrapper in self._wrappers():
+            wrapper.invalidate()
+
+
+class FullscreenController(_Controller):
     """
     Gives access to fullscreen functions of Magnification API
     """
@@ -578,6 +1087,10 @@ class FullscreenController:
         """
         return self._input_transform_transform
 
+    def _wrappers(self) -> typing.Tuple[_utils.WrappedField, ...]:
+        # Order of writes on transaction end
+        return self._transform, self._color_effect, self._input_transform_transform
+
     @property
     def cursor_visible(self) -> bool:
         """
@@ -596,17 +1109,16 @@ class FullscreenController:
         _wrapper.set_cursor_visibility(value)
 
 
-class CustomWindowController:
+class CustomWindowController(_Controller):
     """
     Gives access to window (custom magnifier controller)
     functions of Magnification API
     """
-    def __init__(self):
-        self.hwnd: int = 0
+    def __init__(self, hwnd: int = 0):
         """
-        | Magnification window handle
-        | |Accessors: Get Set|
+        :param hwnd: Magnification window handle (may be bound later, see :attr:`hwnd`)
         """
+        self._hwnd = hwnd
         self._transform = TransformationMatrixWrapper(
             _utils.DataSource.dynamic(
                 lambda: _wrapper2.get_transform_advanced(self.hwnd),
@@ -635,6 +1147,20 @@ class CustomWindowController:
             )
         )
 
+    @property
+    def hwnd(self) -> int:
+        """
+        | Magnification window handle
+        | |Accessors: Get Set|
+        """
+        return self._hwnd
+
+    @hwnd.setter
+    def hwnd(self, value: int):
+        if value != self._hwnd:
+            self.invalidate()
+        self._hwnd = value
+
     @property
     def transform(self) -> TransformationMatrixWrapper:
         """
@@ -667,6 +1193,184 @@ class CustomWindowController:
         """
         return self._filters
 
+    def _wrappers(self) -> typing.Tuple[_utils.WrappedField, ...]:
+        # Order of writes on transaction end
+        return self._source, self._transform, self._color_effect, self._filters
+
+
+def _written(datasource: _utils.DataSource, value):
+    # Value written bypassing datasource, so copies it keeps are updated
+    datasource.invalidate()
+    if datasource.shadow:
+        datasource._remember(value)
+
+
+class WindowsController(_Controller):
+    """
+    | Gives access to many windows (custom magnifier controllers) at once,
+      like one per monitor or region
+    | Each window has own :class:`CustomWindowController` (so own shadow state),
+      all of them share single Magnification API initialization
+    | Example:
+
+    >>> import win_magnification as mag
+    >>> backend = mag.backends.SimulatedBackend()
+    >>> with mag.use_backend(backend):
+    ...     api = WinMagnificationAPI()
+    ...     for _ in range(3):
+    ...         _ = api.windows.add(backend.create_window())
+    ...     api.windows.set_scale(2.0)
+    ...     calls = backend.calls['MagSetWindowTransform']
+    ...     scales = [window.transform.scale.same for window in api.windows.values()]
+    ...     api.dispose()
+    >>> scales, calls
+    ([2.0, 2.0, 2.0], 3)
+    """
+
+    def __init__(self):
+        self._controllers: typing.Dict[int, CustomWindowController] = {}
+        self._shadow = False
+        self._verify_interval: typing.Optional[float] = None
+
+    def add(self, hwnd: int) -> CustomWindowController:
+        """
+        | Creates controller of window, shadow state settings are applied to it
+        | Controller already added is returned as is
+
+        :param hwnd: Magnification window handle
+        :return: Controller of window
+        """
+        controller = self._controllers.get(hwnd)
+        if controller is None:
+            controller = self._controllers[hwnd] = CustomWindowController(hwnd)
+            if self._shadow:
+                controller.use_shadow_state(True, self._verify_interval)
+        return controller
+
+    def remove(self, hwnd: int):
+        """
+        Forgets controller of window (window itself is left as is)
+
+        :param hwnd: Magnification window handle
+        :raises KeyError: If window wasn't added
+        """
+        del self._controllers[hwnd]
+
+    def values(self) -> typing.List[CustomWindowController]:
+        """
+        :return: Controllers of windows in order of addition
+        """
+        return list(self._controllers.values())
+
+    def __getitem__(self, hwnd: int) -> CustomWindowController:
+        return self._controllers[hwnd]
+
+    def __contains__(self, hwnd: int) -> bool:
+        return hwnd in self._controllers
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(list(self._controllers))
+
+    def __len__(self) -> int:
+        return len(self._controllers)
+
+    def _wrappers(self) -> typing.Tuple[_utils.WrappedField, ...]:
+        # Window by window, in order of addition
+        return tuple(
+            wrapper
+            for controller in self._controllers.values()
+            for wrapper in controller._wrappers()
+        )
+
+    def _select(self, hwnds: typing.Optional[typing.Iterable[int]]) -> typing.List[CustomWindowController]:
+        if hwnds is None:
+            return list(self._controllers.values())
+        return [self._controllers[hwnd] for hwnd in hwnds]
+
+    def use_shadow_state(self, enabled: bool = True, verify_interval: typing.Optional[float] = None):
+        """
+        | Same as :meth:`.CustomWindowController.use_shadow_state` for each window,
+          including ones added later
+
+        :param enabled: Use shadow state
+        :param verify_interval: Time (in seconds) copy is used for (default: until :meth:`invalidate` call)
+        """
+        self._shadow = enabled
+        self._verify_interval = verify_interval
+        super().use_shadow_state(enabled, verify_interval)
+
+    def set_color_effect(
+        self,
+        effect: typing.Optional[types.ColorMatrix],
+        hwnds: typing.Optional[typing.Iterable[int]] = None,
+    ):
+        """
+        | Sets the same color effect to many windows
+        | Effect converted to float32 once, each window gets it without copying
+
+        :param effect: The color transformation matrix, or None to remove the current color effect
+        :param hwnds: Windows to change (default: all added)
+        :raises KeyError: If window wasn't added
+        :raises OSError: On fail (windows before failed one stay changed)
+        """
+        controllers = self._select(hwnds)
+        c_effect = None if effect is None else array.array('f', effect)
+        value = None if c_effect is None else tuple(c_effect)
+        for controller in controllers:
+            _wrapper.set_color_effect(controller.hwnd, c_effect)
+            _written(controller.color_effect._datasource, value)
+
+    def set_transform(
+        self,
+        matrix: types.TransformationMatrix,
+        hwnds: typing.Optional[typing.Iterable[int]] = None,
+    ):
+        """
+        | Sets the same transformation matrix to many windows
+        | Matrix converted to float32 once, each window gets it without copying
+
+        :param matrix: A 3x3 matrix of the magnification transformation
+        :param hwnds: Windows to change (default: all added)
+        :raises KeyError: If window wasn't added
+        :raises OSError: On fail (windows before failed one stay changed)
+        """
+        controllers = self._select(hwnds)
+        c_matrix = array.array('f', matrix)
+        value = tuple(c_matrix)
+        for controller in controllers:
+            _wrapper.set_transform(controller.hwnd, c_matrix)
+            _written(controller.transform._datasource, value)
+
+    def set_scale(
+        self,
+        scale: float,
+        offset: typing.Tuple[float, float] = (0.0, 0.0),
+        hwnds: typing.Optional[typing.Iterable[int]] = None,
+    ):
+        """
+        Sets the same magnification factor to many windows
+
+        :param scale: Magnification factor
+        :param offset: Magnifier offset from |up-left| left upper corner
+        :param hwnds: Windows to change (default: all added)
+        :raises KeyError: If window wasn't added
+        :raises OSError: On fail (windows before failed one stay changed)
+        """
+        self.set_transform(tools.get_transform_matrix(scale, scale, *offset), hwnds)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        | Use this *contextmanager* to change many windows at once
+        | Like :meth:`.WinMagnificationAPI.transaction`,
+          each value is read at most once inside and written on exit (each value at most once),
+          window by window in order of addition
+        """
+        with contextlib.ExitStack() as stack:
+            for wrapper in reversed(self._wrappers()):
+                stack.enter_context(wrapper.batch())
+            yield self
+
 
 class WinMagnificationAPI:
     """
@@ -676,11 +1380,17 @@ class WinMagnificationAPI:
     .. automethod:: __del__
     """
 
-    def __init__(self):
-        self.__disposed = False
+    def __init__(self, initialize: bool = True):
+        """
+        :param initialize: Call :func:`.initialize` now and :func:`.finalize` on :meth:`dispose`,
+            pass False if it's done by someone else (like :class:`.MagnificationWorker`)
+        """
+        self.__disposed = not initialize
         self.__fullscreen = FullscreenController()
         self.__window = CustomWindowController()
-        _wrapper2.initialize()
+        self.__windows = WindowsController()
+        if initialize:
+            _wrapper2.initialize()
 
     @property
     def fullscreen(self) -> FullscreenController:
@@ -699,6 +1409,87 @@ class WinMagnificationAPI:
         """
         return self.__window
 
+    @property
+    def windows(self) -> WindowsController:
+        """
+        | Gives access to many windows (custom magnifier controllers) at once,
+          independent of :attr:`window`
+        | |Accessors: Get|
+        """
+        return self.__windows
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        | Use this *contextmanager* to change fullscreen and window magnifiers at once
+        | Each value is read at most once inside, all changes
+          (including ``raw`` values set and filters list changes) are written
+          on exit (each value at most once) in fixed order:
+        | fullscreen: transform, color effect, input transform
+        | window: source, transform, color effect, filters
+        | Like :meth:`.WrappedField.batch` changes are written even if block raises
+        | :attr:`.FullscreenController.cursor_visible` isn't deferred
+        """
+        with contextlib.ExitStack() as stack:
+            wrappers = self.__fullscreen._wrappers() + self.__window._wrappers()
+            # Batches are left in reverse order
+            for wrapper in reversed(wrappers):
+                stack.enter_context(wrapper.batch())
+            yield self
+
+    def snapshot(self) -> types.Snapshot:
+        """
+        | Captures whole state: fullscreen values and values of bound :attr:`.CustomWindowController.hwnd`
+        | Values are read with one call each (or taken from shadow state, see :meth:`use_shadow_state`)
+
+        :return: State to :meth:`apply` later
+        """
+        wrappers = self.__fullscreen._wrappers()
+        if self.__window.hwnd:
+            wrappers += self.__window._wrappers()
+        return types.Snapshot(*(wrapper.raw for wrapper in wrappers))
+
+    def apply(self, snapshot: types.Snapshot) -> typing.Tuple[str, ...]:
+        """
+        | Restores state captured by :meth:`snapshot`
+        | Only values differ from current ones (compared with float32 precision) are written,
+          in the same order as :meth:`transaction` does
+        | Window values are skipped, if snapshot has none or no window bound
+
+        :param snapshot: State to restore
+        :return: Names of values written
+        """
+        wrappers = self.__fullscreen._wrappers()
+        if self.__window.hwnd:
+            wrappers += self.__window._wrappers()
+        written = []
+        for name, value, wrapper in zip(snapshot._fields, snapshot, wrappers):
+            if value is None or _same(wrapper.raw, value):
+                continue
+            wrapper.raw = value
+            written.append(name)
+        return tuple(written)
+
+    def use_shadow_state(self, enabled: bool = True, verify_interval: typing.Optional[float] = None):
+        """
+        | Reads of fullscreen and window (:attr:`window` and :attr:`windows`) values
+          are served from copy of the last value written (or read),
+          instead of Magnification API calls
+        | See :meth:`.FullscreenController.use_shadow_state`
+
+        :param enabled: Use shadow state
+        :param verify_interval: Time (in seconds) copy is used for (default: until :meth:`invalidate` call)
+        """
+        self.__fullscreen.use_shadow_state(enabled, verify_interval)
+        self.__window.use_shadow_state(enabled, verify_interval)
+        self.__windows.use_shadow_state(enabled, verify_interval)
+
+    def invalidate(self):
+        """Forgets shadow state, so the next reads get fresh values"""
+        self.__fullscreen.invalidate()
+        self.__window.invalidate()
+        self.__windows.invalidate()
+
     def dispose(self):
         """
         You may use this method for cleanup,
@@ -11,6 +11,7 @@ import functools
 import threading
 import typing
 
+from win_magnification import backends
 from win_magnification.types import Rectangle
 
 P = [typing.Any]
@@ -22,7 +23,7 @@ _current_thread = None
 
 def handle_win_last_error(function_result: bool):
     if not function_result:
-        raise ctypes.WinError()
+        raise backends.get_backend().win_error()
 
 
 def raise_win_errors(win_function: typing.Callable[P, bool]) -> typing.Callable[P, None]:  # type: ignore
@@ -32,10 +33,17 @@ def raise_win_errors(win_function: typing.Callable[P, bool]) -> typing.Callable[
     return wrapper
 
 
-@contextlib.contextmanager
+class _SingleThreadGuard(contextlib.ContextDecorator):
+    # Unlike @contextmanager, doesn't create generator on each call
+    def __enter__(self):
+        thread_holder.require_thread_match()
+
+    def __exit__(self, *exc_info):
+        return False
+
+
 def require_single_thread():
-    thread_holder.require_thread_match()
-    yield
+    return _SingleThreadGuard()
 
 
 def to_py_array(c_matrix: ctypes.Array, content_type=float):
@@ -56,6 +64,90 @@ def to_py_rectangle(rectangle: ctypes.wintypes.RECT) -> Rectangle:
     )
 
 
+class WriteDeduplicator:
+    """
+    | Remembers last value written to each target and skips identical writes
+    | Disabled by default, use :attr:`enabled` to turn it on
+    | Matrices compared with float32 precision (as the C side stores them)
+    | Example:
+
+    >>> deduplicator = WriteDeduplicator()
+    >>> deduplicator.enabled = True
+    >>> calls = []
+    >>> def set_scale(value):
+    ...     calls.append(value)
+    ...     return True
+    >>> deduplicator.write(('scale', 0), 2.0, set_scale, 2.0)
+    True
+    >>> deduplicator.write(('scale', 0), 2.0, set_scale, 2.0)
+    True
+    >>> calls, deduplicator.hits, deduplicator.misses
+    ([2.0], 1, 1)
+    """
+
+    FULLSCREEN = object()
+    """Target of fullscreen functions (sentinel, so it never matches window handle, even NULL one)"""
+
+    def __init__(self):
+        self.enabled = False
+        """
+        | Skip writes of values already written
+        | |Accessors: Get Set|
+        """
+        self.hits = 0
+        """
+        | Count of writes skipped
+        | |Accessors: Get|
+        """
+        self.misses = 0
+        """
+        | Count of writes forwarded to Magnification API
+        | |Accessors: Get|
+        """
+        self._last: typing.Dict[typing.Tuple[str, typing.Hashable], typing.Any] = {}
+
+    def write(self, key: typing.Tuple[str, typing.Hashable], value, function: typing.Callable[..., bool], *args):
+        """
+        Calls **function** with **args** unless **value** is already written to **key**
+
+        :param key: Tuple of (field name, window handle or :attr:`FULLSCREEN`)
+        :param value: Comparable value written
+        :param function: Function to call
+        :param args: Arguments of **function**
+        :return: Result of **function**, or True if call skipped
+        """
+        last = self._last
+        if key in last and last[key] == value:
+            self.hits += 1
+            return True
+        self.misses += 1
+        result = function(*args)
+        if result:
+            last[key] = value
+        else:
+            # Actual value is unknown after fail
+            last.pop(key, None)
+        return result
+
+    def invalidate(self, hwnd: typing.Optional[typing.Hashable] = None):
+        """
+        Forget values written, so next writes will be forwarded
+
+        :param hwnd: Window handle (or :attr:`FULLSCREEN`) to forget values of
+            (default: forget all)
+        """
+        if hwnd is None:
+            self._last.clear()
+            return
+        for key in [key for key in self._last if key[1] == hwnd]:
+            del self._last[key]
+
+    def reset_counters(self):
+        """Resets :attr:`hits` and :attr:`misses`"""
+        self.hits = 0
+        self.misses = 0
+
+
 class ThreadHolder:
     def __init__(self):
         self.__thread_identifier = None
@@ -1,36 +1,108 @@
 """
-| Wraps ctypes.windll.magnification
+| Wraps Magnification API, calls are forwarded to :func:`current backend <.get_backend>`
 Author: MaxBQb |
 `Microsoft Docs <https://docs.microsoft.com/en-us/windows/win32/api/_magapi/>`_ |
 `Header <https://pastebin.com/Lh82NjjM>`_
 """
 from __future__ import annotations
 
+import array
 import ctypes
 import sys
+import threading
 import typing
 from ctypes import wintypes
 
 from win_magnification import _utils
+from win_magnification import backends
 from win_magnification import const
 from win_magnification import types
 
-if sys.platform == 'win32':
-    _DLL = ctypes.WinDLL('magnification.dll')
-else:
-    _DLL = None
-    print("Magnification API exists only for Windows!")
-
 # C Types
 # noinspection SpellCheckingInspection
-_MAGCOLOREFFECT = (ctypes.c_float * const.COLOR_MATRIX_SIZE)
+_MAGCOLOREFFECT = backends.MAGCOLOREFFECT
 # noinspection SpellCheckingInspection
-_PMAGCOLOREFFECT = ctypes.POINTER(_MAGCOLOREFFECT)
+_MAGTRANSFORM = backends.MAGTRANSFORM
 
-# noinspection SpellCheckingInspection
-_MAGTRANSFORM = (ctypes.c_float * const.TRANSFORMATION_MATRIX_SIZE)
-# noinspection SpellCheckingInspection
-_PMAGTRANSFORM = ctypes.POINTER(_MAGTRANSFORM)
+
+class _Buffers(threading.local):
+    """
+    Per-thread ctypes objects reused by each call,
+    so no new ones allocated on hot path
+    """
+
+    def __init__(self):
+        self.color_effect = _MAGCOLOREFFECT()
+        self.transform = _MAGTRANSFORM()
+        self.rectangle = wintypes.RECT()
+        self.rectangle_pointer = ctypes.pointer(self.rectangle)
+        self.destination = wintypes.RECT()
+        self.destination_pointer = ctypes.pointer(self.destination)
+        self.scale = ctypes.c_float()
+        self.scale_pointer = ctypes.pointer(self.scale)
+        self.offset_x = ctypes.c_int()
+        self.offset_x_pointer = ctypes.pointer(self.offset_x)
+        self.offset_y = ctypes.c_int()
+        self.offset_y_pointer = ctypes.pointer(self.offset_y)
+        self.flag = wintypes.BOOL()
+        self.flag_pointer = ctypes.pointer(self.flag)
+        self.filter_mode = wintypes.DWORD()
+        self.filter_mode_pointer = ctypes.pointer(self.filter_mode)
+        self.hwnds = (wintypes.HWND * 16)()
+
+    def get_hwnds(self, count: int) -> ctypes.Array:
+        """Window handles array of at least **count** items, grown geometrically"""
+        hwnds = self.hwnds
+        if len(hwnds) < count:
+            hwnds = self.hwnds = (wintypes.HWND * max(count, 2 * len(hwnds)))()
+        return hwnds
+
+
+_buffers = _Buffers()
+
+deduplicator = _utils.WriteDeduplicator()
+"""
+| Skips writes of values already applied, disabled by default
+| Values considered known since last write through this module,
+  so changes made elsewhere require :meth:`~.WriteDeduplicator.invalidate` call
+"""
+_FULLSCREEN = _utils.WriteDeduplicator.FULLSCREEN
+
+
+_FLOAT_FORMATS = frozenset(('f', '=f', '<f' if sys.byteorder == 'little' else '>f'))
+
+
+def _to_c_matrix(matrix: typing.Any, buffer: ctypes.Array) -> ctypes.Array:
+    """
+    | Get ctypes array sharing memory with **matrix**,
+      when it's writable contiguous float32 buffer of the same size
+    | Otherwise copies **matrix** into **buffer**
+    """
+    matrix_type = type(matrix)
+    if matrix_type is array.array:
+        # Fast check for the most common buffer
+        if matrix.typecode == 'f' and len(matrix) == len(buffer):
+            return type(buffer).from_buffer(matrix)
+    elif matrix_type is not tuple:
+        try:
+            view = memoryview(matrix)
+        except TypeError:
+            pass
+        else:
+            with view:
+                is_shareable = view.format in _FLOAT_FORMATS and \
+                               view.c_contiguous and \
+                               not view.readonly and \
+                               view.nbytes == ctypes.sizeof(buffer)
+            if is_shareable:
+                return type(buffer).from_buffer(matrix)
+    buffer[:] = matrix
+    return buffer
+
+
+def _fill_rectangle(target: wintypes.RECT, rectangle: types.Rectangle) -> wintypes.RECT:
+    target.left, target.top, target.right, target.bottom = rectangle
+    return target
 
 
 # Functions
@@ -41,7 +113,8 @@ def initialize() -> None:
 
     :raises OSError: On fail
     """
-    return _DLL.MagInitialize()
+    deduplicator.invalidate()
+    return backends.get_backend().MagInitialize()
 
 
 @_utils.raise_win_errors
@@ -51,7 +124,8 @@ def finalize() -> None:
 
     :raises OSError: On fail
     """
-    return _DLL.MagUninitialize()
+    deduplicator.invalidate()
+    return backends.get_backend().MagUninitialize()
 
 
 @_utils.require_single_thread()
@@ -61,11 +135,16 @@ def set_fullscreen_color_effect(effect: types.ColorMatrix) -> None:
     Changes the color transformation matrix associated with the full-screen magnifier.
 
     :param effect: The new color transformation matrix.
+        Contiguous float32 buffer (like ``array('f')``) passed without copying.
     :type effect: :data:`.ColorMatrix`
     :raises OSError: On fail
     :raises RuntimeError: |single thread|
     """
-    return _DLL.MagSetFullscreenColorEffect(_utils.to_c_array(effect))
+    c_effect = _to_c_matrix(effect, _buffers.color_effect)
+    function = backends.get_backend().MagSetFullscreenColorEffect
+    if deduplicator.enabled:
+        return deduplicator.write(('color_effect', _FULLSCREEN), bytes(c_effect), function, c_effect)
+    return function(c_effect)
 
 
 @_utils.require_single_thread()
@@ -79,9 +158,9 @@ def get_fullscreen_color_effect() -> types.ColorMatrix:
     :raises OSError: On fail
     :raises RuntimeError: |single thread|
     """
-    result = _utils.to_c_array((0,) * const.COLOR_MATRIX_SIZE)
-    _utils.handle_win_last_error(_DLL.MagGetFullscreenColorEffect(result))
-    return _utils.to_py_array(result)
+    result = _buffers.color_effect
+    _utils.handle_win_last_error(backends.get_backend().MagGetFullscreenColorEffect(result))
+    return tuple(result)  # type: ignore
 
 
 @_utils.require_single_thread()
@@ -98,7 +177,14 @@ def set_fullscreen_transform(scale: float, offset: typing.Tuple[int, int]) -> No
     :raises OSError: On fail
     :raises RuntimeError: |single thread|
     """
-    return _DLL.MagSetFullscreenTransform(scale, *offset)
+    function = backends.get_backend().MagSetFullscreenTransform
+    if deduplicator.enabled:
+        return deduplicator.write(
+            ('transform', _FULLSCREEN),
+            (ctypes.c_float(scale).value, tuple(offset)),
+            function, scale, *offset
+        )
+    return function(scale, *offset)
 
 
 @_utils.require_single_thread()
@@ -111,15 +197,16 @@ def get_fullscreen_transform() -> types.FullscreenTransform:
     :raises OSError: On fail
     :raises RuntimeError: |single thread|
     """
-    scale = ctypes.pointer(ctypes.c_float())
-    offset_x = ctypes.pointer(ctypes.c_int())
-    offset_y = ctypes.pointer(ctypes.c_int())
-
-    _utils.handle_win_last_error(_DLL.MagGetFullscreenTransform(scale, offset_x, offset_y))
+    buffers = _buffers
+    _utils.handle_win_last_error(backends.get_backend().MagGetFullscreenTransform(
+        buffers.scale_pointer,
+        buffers.offset_x_pointer,
+        buffers.offset_y_pointer,
+    ))
     return (
-        scale.contents.value, (
-            offset_x.contents.value,
-            offset_y.contents.value,
+        buffers.scale.value, (
+            buffers.offset_x.value,
+            buffers.offset_y.value,
         )
     )
 
@@ -131,15 +218,19 @@ def set_color_effect(hwnd: int, effect: typing.Optional[types.ColorMatrix]) -> N
 
     :param hwnd: The handle of the magnification window.
     :param effect: The color transformation matrix, or None to remove the current color effect, if any.
+        Contiguous float32 buffer (like ``array('f')``) passed without copying.
     :type effect: :data:`.ColorMatrix`
     :raises OSError: On fail
     """
-    return _DLL.MagSetColorEffect(
-        hwnd,
-        _utils.to_c_array(effect)
-        if effect is not None
-        else None
-    )
+    c_effect = _to_c_matrix(effect, _buffers.color_effect) if effect is not None else None
+    function = backends.get_backend().MagSetColorEffect
+    if deduplicator.enabled:
+        return deduplicator.write(
+            ('color_effect', hwnd),
+            bytes(c_effect) if c_effect is not None else None,
+            function, hwnd, c_effect
+        )
+    return function(hwnd, c_effect)
 
 
 def get_color_effect(hwnd: int) -> types.ColorMatrix:
@@ -151,11 +242,9 @@ def get_color_effect(hwnd: int) -> types.ColorMatrix:
     :rtype: :data:`.ColorMatrix`
     :raises OSError: On fail
     """
-    result = _utils.to_c_array((0,) * const.COLOR_MATRIX_SIZE)
-    _utils.handle_win_last_error(_DLL.MagGetColorEffect(hwnd, result))
-    if result is None:
-        return const.DEFAULT_COLOR_EFFECT
-    return _utils.to_py_array(result)
+    result = _buffers.color_effect
+    _utils.handle_win_last_error(backends.get_backend().MagGetColorEffect(hwnd, result))
+    return tuple(result)  # type: ignore
 
 
 @_utils.raise_win_errors
@@ -164,11 +253,16 @@ def set_transform(hwnd: int, matrix: types.TransformationMatrix) -> None:
     Sets the transformation matrix for a magnifier control.
 
     :param hwnd: The handle of the magnification window.
-    :param matrix: A 3x3 matrix of the magnification transformation
+    :param matrix: A 3x3 matrix of the magnification transformation.
+        Contiguous float32 buffer (like ``array('f')``) passed without copying.
     :type matrix: :data:`.TransformationMatrix`
     :raises OSError: On fail
     """
-    return _DLL.MagSetWindowTransform(hwnd, _utils.to_c_array(matrix))
+    c_matrix = _to_c_matrix(matrix, _buffers.transform)
+    function = backends.get_backend().MagSetWindowTransform
+    if deduplicator.enabled:
+        return deduplicator.write(('transform', hwnd), bytes(c_matrix), function, hwnd, c_matrix)
+    return function(hwnd, c_matrix)
 
 
 def get_transform(hwnd: int) -> types.TransformationMatrix:
@@ -180,11 +274,9 @@ def get_transform(hwnd: int) -> types.TransformationMatrix:
     :rtype: :data:`.TransformationMatrix`
     :raises OSError: On fail
     """
-    result = _utils.to_c_array((0,) * const.TRANSFORMATION_MATRIX_SIZE)
-    _utils.handle_win_last_error(_DLL.MagGetWindowTransform(hwnd, result))
-    if result is None:
-        return const.DEFAULT_TRANSFORM
-    return _utils.to_py_array(result)
+    result = _buffers.transform
+    _utils.handle_win_last_error(backends.get_backend().MagGetWindowTransform(hwnd, result))
+    return tuple(result)  # type: ignore
 
 
 @_utils.raise_win_errors
@@ -197,7 +289,11 @@ def set_source(hwnd: int, rectangle: types.Rectangle) -> None:
     :type rectangle: :data:`.RectangleRaw`
     :raises OSError: On fail
     """
-    return _DLL.MagSetWindowSource(hwnd, wintypes.RECT(*rectangle))
+    c_rectangle = _fill_rectangle(_buffers.rectangle, rectangle)
+    function = backends.get_backend().MagSetWindowSource
+    if deduplicator.enabled:
+        return deduplicator.write(('source', hwnd), bytes(c_rectangle), function, hwnd, c_rectangle)
+    return function(hwnd, c_rectangle)
 
 
 def get_source(hwnd: int) -> types.Rectangle:
@@ -209,9 +305,9 @@ def get_source(hwnd: int) -> types.Rectangle:
     :rtype: :data:`.RectangleRaw`
     :raises OSError: On fail
     """
-    result = ctypes.pointer(wintypes.RECT(0, 0, 0, 0))
-    _utils.handle_win_last_error(_DLL.MagGetWindowSource(hwnd, result))
-    return _utils.to_py_rectangle(result.contents)
+    buffers = _buffers
+    _utils.handle_win_last_error(backends.get_backend().MagGetWindowSource(hwnd, buffers.rectangle_pointer))
+    return _utils.to_py_rectangle(buffers.rectangle)
 
 
 @_utils.raise_win_errors
@@ -227,12 +323,15 @@ def set_filters(root_hwnd: int, *hwnds: int, exclude=True) -> None:
     :param hwnds: List of window handles.
     :raises OSError: On fail
     """
-    return _DLL.MagSetWindowFilterList(
-        root_hwnd,
-        const.MW_FILTERMODE_EXCLUDE if exclude else const.MW_FILTERMODE_INCLUDE,
-        len(hwnds),
-        _utils.to_c_array(hwnds, wintypes.HWND)
-    )
+    mode = const.MW_FILTERMODE_EXCLUDE if exclude else const.MW_FILTERMODE_INCLUDE
+    function = backends.get_backend().MagSetWindowFilterList
+    count = len(hwnds)
+    c_hwnds = _buffers.get_hwnds(count)
+    c_hwnds[:count] = hwnds
+    args = root_hwnd, mode, count, c_hwnds
+    if deduplicator.enabled:
+        return deduplicator.write(('filters', root_hwnd), (mode, hwnds), function, *args)
+    return function(*args)
 
 
 def get_filters(hwnd: int) -> typing.Tuple[bool, typing.Tuple[int]]:
@@ -244,20 +343,20 @@ def get_filters(hwnd: int) -> typing.Tuple[bool, typing.Tuple[int]]:
     :raises OSError: On fail
     :raises RuntimeError: On invalid hwnd used
     """
-    exclude = ctypes.pointer(wintypes.DWORD())
-    count = _DLL.MagGetWindowFilterList(hwnd, exclude, 0, None)
+    buffers = _buffers
+    exclude = buffers.filter_mode_pointer
+    function = backends.get_backend().MagGetWindowFilterList
+    # Only call with NULL buffer is documented to return count of windows
+    count = function(hwnd, exclude, 0, None)
     if count == -1:
         raise RuntimeError(f"Invalid hwnd: {hwnd}")
-    elif count == 0:
-        return (  # type: ignore
-            exclude.contents.value == const.MW_FILTERMODE_EXCLUDE,
-            tuple()
-        )
-    result = (wintypes.HWND * count)(*((0,) * count))
-    _DLL.MagGetWindowFilterList(hwnd, exclude, count, result)
-    return (
-        exclude.contents.value == const.MW_FILTERMODE_EXCLUDE,
-        _utils.to_py_array(result, int)
+    if count == 0:
+        return buffers.filter_mode.value == const.MW_FILTERMODE_EXCLUDE, ()  # type: ignore
+    result = buffers.get_hwnds(count)
+    count = function(hwnd, exclude, count, result)
+    return (  # type: ignore
+        buffers.filter_mode.value == const.MW_FILTERMODE_EXCLUDE,
+        tuple(value or 0 for value in result[:count])
     )
 
 
@@ -280,11 +379,18 @@ def set_input_transform(is_enabled: bool, source: types.Rectangle, destination:
     :type destination: :data:`.RectangleRaw`
     :raises OSError: On fail
     """
-    return _DLL.MagSetInputTransform(
-        is_enabled,
-        ctypes.pointer(wintypes.RECT(*source)),
-        ctypes.pointer(wintypes.RECT(*destination))
-    )
+    buffers = _buffers
+    _fill_rectangle(buffers.rectangle, source)
+    _fill_rectangle(buffers.destination, destination)
+    function = backends.get_backend().MagSetInputTransform
+    args = is_enabled, buffers.rectangle_pointer, buffers.destination_pointer
+    if deduplicator.enabled:
+        return deduplicator.write(
+            ('input_transform', _FULLSCREEN),
+            (bool(is_enabled), tuple(source), tuple(destination)),
+            function, *args
+        )
+    return function(*args)
 
 
 def get_input_transform() -> types.InputTransform:
@@ -296,15 +402,16 @@ def get_input_transform() -> types.InputTransform:
     :rtype: :data:`.InputTransformRaw`
     :raises OSError: On fail
     """
-    is_enabled = ctypes.pointer(wintypes.BOOL())
-    source = ctypes.pointer(wintypes.RECT())
-    destination = ctypes.pointer(wintypes.RECT())
-
-    _utils.handle_win_last_error(_DLL.MagGetInputTransform(is_enabled, source, destination))
+    buffers = _buffers
+    _utils.handle_win_last_error(backends.get_backend().MagGetInputTransform(
+        buffers.flag_pointer,
+        buffers.rectangle_pointer,
+        buffers.destination_pointer,
+    ))
     return (
-        bool(is_enabled.contents.value),
-        _utils.to_py_rectangle(source.contents),
-        _utils.to_py_rectangle(destination.contents),
+        bool(buffers.flag.value),
+        _utils.to_py_rectangle(buffers.rectangle),
+        _utils.to_py_rectangle(buffers.destination),
     )
 
 
@@ -320,64 +427,4 @@ def set_cursor_visibility(show_cursor: bool):
         or False to hide it.
     :raises OSError: On fail
     """
-    return _DLL.MagShowSystemCursor(show_cursor)
-
-
-# C-Function original names and signatures
-if sys.platform == 'win32':
-    _DLL.MagInitialize.restype = wintypes.BOOL
-    _DLL.MagUninitialize.restype = wintypes.BOOL
-
-    _DLL.MagGetFullscreenColorEffect.restype = wintypes.BOOL
-    _DLL.MagGetFullscreenColorEffect.argtypes = (_PMAGCOLOREFFECT,)
-
-    _DLL.MagSetFullscreenColorEffect.restype = wintypes.BOOL
-    _DLL.MagSetFullscreenColorEffect.argtypes = (_PMAGCOLOREFFECT,)
-
-    _DLL.MagSetFullscreenTransform.restype = wintypes.BOOL
-    _DLL.MagSetFullscreenTransform.argtypes = (ctypes.c_float, ctypes.c_int,
-                                               ctypes.c_int)
-
-    _DLL.MagGetFullscreenTransform.restype = wintypes.BOOL
-    _DLL.MagGetFullscreenTransform.argtypes = (ctypes.POINTER(ctypes.c_float),
-                                               ctypes.POINTER(ctypes.c_int),
-                                               ctypes.POINTER(ctypes.c_int))
-
-    _DLL.MagSetColorEffect.restype = wintypes.BOOL
-    _DLL.MagSetColorEffect.argtypes = (wintypes.HWND, _PMAGCOLOREFFECT,)
-
-    _DLL.MagGetColorEffect.restype = wintypes.BOOL
-    _DLL.MagGetColorEffect.argtypes = (wintypes.HWND, _PMAGCOLOREFFECT,)
-
-    _DLL.MagSetWindowTransform.restype = wintypes.BOOL
-    _DLL.MagSetWindowTransform.argtypes = (wintypes.HWND, _PMAGTRANSFORM,)
-
-    _DLL.MagGetWindowTransform.restype = wintypes.BOOL
-    _DLL.MagGetWindowTransform.argtypes = (wintypes.HWND, _PMAGTRANSFORM,)
-
-    _DLL.MagSetWindowSource.restype = wintypes.BOOL
-    _DLL.MagSetWindowSource.argtypes = (wintypes.HWND, wintypes.RECT)
-
-    _DLL.MagGetWindowSource.restype = wintypes.BOOL
-    _DLL.MagGetWindowSource.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.RECT))
-
-    _DLL.MagSetWindowFilterList.restype = wintypes.BOOL
-    _DLL.MagSetWindowFilterList.argtypes = (wintypes.HWND, wintypes.DWORD,
-                                            ctypes.c_int, ctypes.POINTER(wintypes.HWND))
-
-    _DLL.MagGetWindowFilterList.restype = wintypes.BOOL
-    _DLL.MagGetWindowFilterList.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD),
-                                            ctypes.c_int, ctypes.POINTER(wintypes.HWND))
-
-    _DLL.MagGetInputTransform.restype = wintypes.BOOL
-    _DLL.MagGetInputTransform.argtypes = (ctypes.POINTER(wintypes.BOOL),
-                                          ctypes.POINTER(wintypes.RECT),
-                                          ctypes.POINTER(wintypes.RECT))
-
-    _DLL.MagSetInputTransform.restype = wintypes.BOOL
-    _DLL.MagSetInputTransform.argtypes = (wintypes.BOOL,
-                                          ctypes.POINTER(wintypes.RECT),
-                                          ctypes.POINTER(wintypes.RECT))
-
-    _DLL.MagShowSystemCursor.restype = wintypes.BOOL
-    _DLL.MagShowSystemCursor.argtypes = (wintypes.BOOL,)
+    return backends.get_backend().MagShowSystemCursor(show_cursor)
@@ -0,0 +1,166 @@
+"""
+| :mod:`asyncio` front-end for Magnification API
+| All calls are executed on the single thread of :class:`.MagnificationWorker`,
+  awaiting them doesn't block event loop
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import typing
+
+from win_magnification import _functional_wrapper
+from win_magnification import _objects
+from win_magnification import _wrapper
+from win_magnification import animation
+from win_magnification import worker
+
+T = typing.TypeVar('T')
+
+
+def _awaitable(function: typing.Callable[..., T]) -> typing.Callable[..., typing.Awaitable[T]]:
+    @functools.wraps(function)
+    async def method(self: AsyncMagnifier, *args, **kwargs) -> T:
+        return await self.run(function, *args, **kwargs)
+    return method
+
+
+class AsyncMagnifier:
+    """
+    | Awaitable versions of Magnification API functions and controllers
+    | Manages :func:`.initialize` and :func:`.finalize` calls, use it with *async with*
+    | Example:
+
+    >>> import win_magnification as mag
+    >>> async def main():
+    ...     async with AsyncMagnifier() as magnifier:
+    ...         await magnifier.set_fullscreen_transform(2.0, (10, 20))
+    ...         return await magnifier.transaction(lambda api: api.fullscreen.transform.raw)
+    >>> with mag.use_backend(mag.backends.SimulatedBackend()):
+    ...     asyncio.run(main())
+    (2.0, (10, 20))
+    """
+
+    def __init__(self):
+        self.worker = worker.MagnificationWorker('AsyncMagnifier')
+        """
+        | Thread all calls executed on
+        | |Accessors: Get|
+        """
+        self._api: typing.Optional[_objects.WinMagnificationAPI] = None
+
+    @property
+    def api(self) -> _objects.WinMagnificationAPI:
+        """
+        | Object-Oriented wrapper, must be accessed only from
+          :meth:`run` or :meth:`transaction` callbacks
+        | |Accessors: Get|
+
+        :raises RuntimeError: If magnifier isn't started
+        """
+        if self._api is None:
+            raise RuntimeError("Magnifier is not started")
+        return self._api
+
+    async def start(self) -> AsyncMagnifier:
+        """
+        Starts worker thread and initializes Magnification API
+
+        :return: This magnifier
+        :raises OSError: If initialization failed
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.worker.start)
+        self._api = await self.run(_objects.WinMagnificationAPI, initialize=False)
+        return self
+
+    async def close(self, cancel_pending: bool = False):
+        """
+        Executes (or cancels) queued calls, then finalizes Magnification API
+
+        :param cancel_pending: Cancel calls not yet started instead of executing them
+        """
+        self.worker.shutdown(wait=False, cancel_pending=cancel_pending)
+        await asyncio.get_running_loop().run_in_executor(None, self.worker.shutdown)
+        self._api = None
+
+    async def __aenter__(self) -> AsyncMagnifier:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def run(self, function: typing.Callable[..., T], *args, **kwargs) -> T:
+        """
+        Calls **function** on worker thread
+
+        :param function: Function to call
+        :param args: Positional arguments of **function**
+        :param kwargs: Keyword arguments of **function**
+        :return: Result of **function**
+        """
+        return await asyncio.wrap_future(self.worker.submit(function, *args, **kwargs))
+
+    async def transaction(self, function: typing.Callable[[_objects.WinMagnificationAPI], T]) -> T:
+        """
+        Calls **function** with :attr:`api` inside :meth:`.WinMagnificationAPI.transaction`
+        on worker thread
+
+        :param function: Function to call
+        :return: Result of **function**
+        """
+        def inner():
+            with self.api.transaction() as api:
+                return function(api)
+        return await self.run(inner)
+
+    async def play(
+        self,
+        player: typing.Union[animation.TransitionPlayer, animation.ZoomAnimator],
+    ) -> animation.FrameStats:
+        """
+        | Plays transition, waiting between frames without blocking event loop
+        | Create **player** with :meth:`.ColorMatrixWrapper.player`
+          after :meth:`.ColorMatrixWrapper.make_transition` done by :meth:`run`,
+          or with :meth:`.FullscreenTransformWrapper.animator`
+          (:meth:`~.ZoomAnimator.zoom_to` may be called from any thread)
+        | Cancelling awaiting task stops transition at the current frame
+
+        :param player: Transition to play
+        :return: Actual frame rate, jitter and dropped frames
+        """
+        pacer = player.pacer
+        await self.run(player.start)
+        try:
+            while True:
+                remaining = pacer.remaining(pacer.clock())
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                if not await self.run(player.update, pacer.tick(pacer.clock())):
+                    break
+        except asyncio.CancelledError:
+            player.cancel()
+            raise
+        return player.stats
+
+    set_transform_advanced = _awaitable(_functional_wrapper.set_transform_advanced)
+    get_transform_advanced = _awaitable(_functional_wrapper.get_transform_advanced)
+    set_transform = _awaitable(_functional_wrapper.set_transform)
+    get_transform = _awaitable(_functional_wrapper.get_transform)
+    reset_transform = _awaitable(_functional_wrapper.reset_transform)
+    reset_color_effect = _awaitable(_functional_wrapper.reset_color_effect)
+    reset_fullscreen_transform = _awaitable(_functional_wrapper.reset_fullscreen_transform)
+    reset_fullscreen_color_effect = _awaitable(_functional_wrapper.reset_fullscreen_color_effect)
+    set_fullscreen_color_effect = _awaitable(_wrapper.set_fullscreen_color_effect)
+    get_fullscreen_color_effect = _awaitable(_wrapper.get_fullscreen_color_effect)
+    set_fullscreen_transform = _awaitable(_wrapper.set_fullscreen_transform)
+    get_fullscreen_transform = _awaitable(_wrapper.get_fullscreen_transform)
+    set_color_effect = _awaitable(_wrapper.set_color_effect)
+    get_color_effect = _awaitable(_wrapper.get_color_effect)
+    set_source = _awaitable(_wrapper.set_source)
+    get_source = _awaitable(_wrapper.get_source)
+    set_filters = _awaitable(_wrapper.set_filters)
+    get_filters = _awaitable(_wrapper.get_filters)
+    set_input_transform = _awaitable(_wrapper.set_input_transform)
+    get_input_transform = _awaitable(_wrapper.get_input_transform)
+    set_cursor_visibility = _awaitable(_wrapper.set_cursor_visibility)
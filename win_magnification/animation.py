@@ -0,0 +1,514 @@
+"""
+| Frame-paced animations of magnifier state
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+import typing
+
+from win_magnification import tools
+
+Easing: 'typing.TypeAlias' = typing.Callable[[float], float]
+"""
+Function which maps linear progress (0 <= x <= 1) to eased one
+"""
+
+Clock: 'typing.TypeAlias' = typing.Callable[[], float]
+"""
+Monotonic clock, returns seconds
+"""
+
+
+def linear(progress: float) -> float:
+    """
+    | No easing
+    | Example:
+
+    >>> linear(0.25)
+    0.25
+    """
+    return progress
+
+
+def ease_in_out(progress: float) -> float:
+    """
+    | Smooth start and smooth end (cubic)
+    | Example:
+
+    >>> ease_in_out(0.0), ease_in_out(0.5), ease_in_out(1.0)
+    (0.0, 0.5, 1.0)
+    """
+    if progress < 0.5:
+        return 4 * progress ** 3
+    return 1 - (-2 * progress + 2) ** 3 / 2
+
+
+class FrameStats:
+    """
+    | Frame timings statistics
+    | Example:
+
+    >>> stats = FrameStats()
+    >>> for timestamp in (0.0, 0.5, 1.0, 1.5):
+    ...     stats.add_frame(timestamp)
+    >>> stats.frames, stats.fps, stats.jitter
+    (4, 2.0, 0.0)
+    """
+
+    def __init__(self):
+        self.frames = 0
+        """
+        | Count of frames rendered
+        | |Accessors: Get|
+        """
+        self.dropped = 0
+        """
+        | Count of frames skipped because of running late
+        | |Accessors: Get|
+        """
+        self._first = 0.0
+        self._last = 0.0
+        self._intervals_sum = 0.0
+        self._intervals_squares_sum = 0.0
+
+    def add_frame(self, timestamp: float):
+        """
+        Registers frame rendered at **timestamp**
+
+        :param timestamp: Frame time in seconds
+        """
+        if self.frames:
+            interval = timestamp - self._last
+            self._intervals_sum += interval
+            self._intervals_squares_sum += interval ** 2
+        else:
+            self._first = timestamp
+        self._last = timestamp
+        self.frames += 1
+
+    @property
+    def fps(self) -> float:
+        """
+        | Actual frames per second
+        | |Accessors: Get|
+        """
+        if self.frames < 2 or self._last == self._first:
+            return 0.0
+        return (self.frames - 1) / (self._last - self._first)
+
+    @property
+    def jitter(self) -> float:
+        """
+        | Standard deviation of interval between frames (in seconds)
+        | |Accessors: Get|
+        """
+        count = self.frames - 1
+        if count < 1:
+            return 0.0
+        mean = self._intervals_sum / count
+        return math.sqrt(max(self._intervals_squares_sum / count - mean ** 2, 0.0))
+
+
+class FramePacer:
+    """
+    | Deadline scheduler for fixed frame rate
+    | Frames missed while running late are dropped, not queued
+    """
+
+    def __init__(
+        self,
+        fps: float = 60.0,
+        clock: Clock = time.monotonic,
+        sleep: typing.Callable[[float], typing.Any] = time.sleep,
+    ):
+        """
+        :param fps: Target frame rate
+        :param clock: Monotonic time source
+        :param sleep: Function to wait with
+        """
+        if fps <= 0:
+            raise ValueError("Frame rate must be positive")
+        self.interval = 1.0 / fps
+        """
+        | Target time between frames (in seconds)
+        | |Accessors: Get|
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = FrameStats()
+        """
+        | Timings of frames passed
+        | |Accessors: Get|
+        """
+        self._started_at = 0.0
+        self._frame = 0
+
+    def start(self) -> float:
+        """
+        Resets statistics and schedules first frame right now
+
+        :return: Current time
+        """
+        now = self.clock()
+        self.stats = FrameStats()
+        self.stats.add_frame(now)
+        self._started_at = now
+        self._frame = 1
+        return now
+
+    def remaining(self, now: float) -> float:
+        """
+        :param now: Current time
+        :return: Time left until next frame deadline (negative if late)
+        """
+        # Computed from start, so rounding errors don't accumulate
+        return self._started_at + self._frame * self.interval - now
+
+    def tick(self, now: float) -> float:
+        """
+        | Registers frame rendered at **now**, without waiting
+        | Use it with external waiting (like :func:`asyncio.sleep` of :meth:`remaining`)
+
+        :param now: Current time
+        :return: Current time
+        """
+        late = -self.remaining(now)
+        if late > 0:
+            missed = int(late / self.interval)
+            self.stats.dropped += missed
+            self._frame += missed
+        self._frame += 1
+        self.stats.add_frame(now)
+        return now
+
+    def wait(self) -> float:
+        """
+        Waits for next frame deadline
+
+        :return: Current time
+        """
+        now = self.clock()
+        remaining = self.remaining(now)
+        if remaining > 0:
+            self.sleep(remaining)
+            now = self.clock()
+        return self.tick(now)
+
+
+class Transitional(typing.Protocol):
+    """Anything which may be driven by :class:`TransitionPlayer` (like :class:`.ColorMatrixWrapper`)"""
+    transition_power: float
+
+    def make_transition(
+        self,
+        end: tools.Matrix.Any,
+        start: typing.Optional[tools.Matrix.Any] = None,
+        initial_power: typing.Optional[typing.Union[float, int]] = None,
+    ):
+        ...  # pragma: no cover
+
+
+class TransitionPlayer:
+    """
+    | Plays transition of :attr:`.ColorMatrixWrapper.transition_power`
+      from **start_power** to **end_power** over **duration**
+    | Setup transition with :meth:`.ColorMatrixWrapper.make_transition`
+      or :meth:`.ColorMatrixWrapper.from_transition` first
+    | :meth:`cancel` and :meth:`retarget` may be called from any thread
+    """
+
+    def __init__(
+        self,
+        target: Transitional,
+        duration: float,
+        fps: float = 60.0,
+        easing: Easing = linear,
+        start_power: float = 0.0,
+        end_power: float = 1.0,
+        clock: Clock = time.monotonic,
+        sleep: typing.Callable[[float], typing.Any] = time.sleep,
+    ):
+        """
+        :param target: Color effect to animate
+        :param duration: Time of transition (in seconds)
+        :param fps: Target frame rate
+        :param easing: Progress transformation
+        :param start_power: Initial transition power
+        :param end_power: Final transition power
+        :param clock: Monotonic time source
+        :param sleep: Function to wait with
+        """
+        self.target = target
+        self.duration = duration
+        self.easing = easing
+        self.start_power = start_power
+        self.end_power = end_power
+        self.pacer = FramePacer(fps, clock, sleep)
+        """
+        | Frames scheduler
+        | |Accessors: Get|
+        """
+        self._started_at: typing.Optional[float] = None
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._finished = False
+        self._pending_target: typing.Optional[typing.Tuple[tools.Matrix.Any, typing.Optional[float]]] = None
+
+    @property
+    def stats(self) -> FrameStats:
+        """
+        | Actual frame rate, jitter and dropped frames
+        | |Accessors: Get|
+        """
+        return self.pacer.stats
+
+    @property
+    def is_running(self) -> bool:
+        """
+        | Transition started, but not yet finished or cancelled
+        | |Accessors: Get|
+        """
+        return self._started_at is not None and not self._finished and not self._cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        | Was transition cancelled
+        | |Accessors: Get|
+        """
+        return self._cancelled
+
+    def cancel(self):
+        """Stops transition at the current frame"""
+        self._cancelled = True
+
+    def retarget(self, end: tools.Matrix.Any, duration: typing.Optional[float] = None):
+        """
+        Continues transition from current color effect to new **end** one,
+        applied on the next frame
+
+        :param end: New final state
+        :param duration: Time of new transition (default: same as before)
+        """
+        with self._lock:
+            self._pending_target = end, duration
+
+    def start(self):
+        """Applies **start_power** and starts counting time"""
+        self._cancelled = False
+        self._finished = False
+        self._started_at = self.pacer.start()
+        self.target.transition_power = self.start_power
+
+    def update(self, now: typing.Optional[float] = None) -> bool:
+        """
+        Applies transition state for time **now**
+
+        :param now: Current time (default: now from clock)
+        :return: True if transition is still running
+        """
+        if not self.is_running:
+            return False
+        if now is None:
+            now = self.pacer.clock()
+        with self._lock:
+            pending, self._pending_target = self._pending_target, None
+        if pending is not None:
+            end, duration = pending
+            self.target.make_transition(end, initial_power=0.0)
+            self.start_power, self.end_power = 0.0, 1.0
+            if duration is not None:
+                self.duration = duration
+            self._started_at = now
+            return True
+        elapsed = now - self._started_at
+        progress = min(elapsed / self.duration, 1.0) if self.duration > 0 else 1.0
+        self.target.transition_power = self.start_power + \
+            (self.end_power - self.start_power) * self.easing(progress)
+        if progress >= 1.0:
+            self._finished = True
+        return self.is_running
+
+    def run(self) -> FrameStats:
+        """
+        Plays whole transition, blocking current thread
+
+        :return: Frame statistics
+        """
+        self.start()
+        while self.is_running:
+            self.update(self.pacer.wait())
+        return self.stats
+
+
+class Zoomable(typing.Protocol):
+    """Anything which may be driven by :class:`ZoomAnimator` (like :class:`.FullscreenTransformWrapper`)"""
+    raw: typing.Tuple[float, typing.Tuple[int, int]]
+
+
+class ZoomAnimator:
+    """
+    | Smoothly changes fullscreen transformation of **target**
+    | Scale interpolated logarithmically (so each frame zooms by the same ratio),
+      offset interpolated linearly
+    | :meth:`zoom_to` may be called from any thread, requests made between frames
+      are merged into one motion, which starts from the current (on-screen) state
+    | At most one write of **target** per frame (none if state unchanged)
+    | Example:
+
+    >>> class Target:
+    ...     written = []
+    ...     raw = property(lambda self: (1.0, (0, 0)), lambda self, value: self.written.append(value))
+    >>> clock = iter(i / 4 for i in range(100)).__next__
+    >>> animator = ZoomAnimator(Target(), duration=1.0, easing=linear, clock=clock)
+    >>> animator.zoom_to(4.0, (100, 0))
+    >>> animator.zoom_to(16.0, (400, 0))  # Replaces previous request
+    >>> animator.start()
+    >>> while animator.update():
+    ...     pass
+    >>> animator.target.written
+    [(2.0, (100, 0)), (4.0, (200, 0)), (8.0, (300, 0)), (16.0, (400, 0))]
+    """
+
+    def __init__(
+        self,
+        target: Zoomable,
+        duration: float = 0.25,
+        fps: float = 60.0,
+        easing: Easing = ease_in_out,
+        clock: Clock = time.monotonic,
+        sleep: typing.Callable[[float], typing.Any] = time.sleep,
+    ):
+        """
+        :param target: Fullscreen transformation to animate
+        :param duration: Default time of motion (in seconds)
+        :param fps: Target frame rate
+        :param easing: Progress transformation
+        :param clock: Monotonic time source
+        :param sleep: Function to wait with
+        """
+        self.target = target
+        self.duration = duration
+        self.easing = easing
+        self.pacer = FramePacer(fps, clock, sleep)
+        """
+        | Frames scheduler
+        | |Accessors: Get|
+        """
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._pending: typing.Optional[typing.Tuple[float, typing.Optional[typing.Tuple[float, float]], float]] = None
+        self._motion: typing.Optional[typing.Tuple[float, float, typing.Tuple[float, float],
+                                                   typing.Tuple[float, float], float, float]] = None
+        self._scale: typing.Optional[float] = None
+        self._offset = 0.0, 0.0
+        self._written: typing.Optional[typing.Tuple[float, typing.Tuple[int, int]]] = None
+
+    @property
+    def stats(self) -> FrameStats:
+        """
+        | Actual frame rate, jitter and dropped frames
+        | |Accessors: Get|
+        """
+        return self.pacer.stats
+
+    @property
+    def is_running(self) -> bool:
+        """
+        | Motion is in progress or requested
+        | |Accessors: Get|
+        """
+        return not self._cancelled and (self._motion is not None or self._pending is not None)
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        | Was motion cancelled
+        | |Accessors: Get|
+        """
+        return self._cancelled
+
+    def cancel(self):
+        """Stops motion at the current frame, drops requests made"""
+        self._cancelled = True
+
+    def zoom_to(
+        self,
+        scale: float,
+        offset: typing.Optional[typing.Tuple[float, float]] = None,
+        duration: typing.Optional[float] = None,
+    ):
+        """
+        Requests motion to new state, applied on the next frame
+
+        :param scale: Final magnification factor
+        :param offset: Final offset (default: keep current one)
+        :param duration: Time of motion (default: :attr:`duration`)
+        """
+        if scale <= 0:
+            raise ValueError("Scale must be positive")
+        with self._lock:
+            self._cancelled = False
+            self._pending = scale, offset, self.duration if duration is None else duration
+
+    def start(self):
+        """Starts counting frames"""
+        self.pacer.start()
+
+    def update(self, now: typing.Optional[float] = None) -> bool:
+        """
+        Applies motion state for time **now**
+
+        :param now: Current time (default: now from clock)
+        :return: True if motion is still running
+        """
+        if self._cancelled:
+            self._motion = None
+            return False
+        if now is None:
+            now = self.pacer.clock()
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            if self._motion is None:
+                # Target may be changed by others while idle, so motion starts from its actual state
+                scale, offset = self._written = self.target.raw
+                self._scale, self._offset = scale, (float(offset[0]), float(offset[1]))
+            end_scale, end_offset, duration = pending
+            if end_offset is None:
+                end_offset = self._offset if self._motion is None else self._motion[3]
+            self._motion = self._scale, end_scale, self._offset, \
+                (float(end_offset[0]), float(end_offset[1])), now, duration
+        if self._motion is None:
+            return False
+        start_scale, end_scale, start_offset, end_offset, started_at, duration = self._motion
+        progress = min((now - started_at) / duration, 1.0) if duration > 0 else 1.0
+        if progress >= 1.0:
+            self._motion = None
+            self._scale, self._offset = end_scale, end_offset
+        else:
+            eased = self.easing(progress)
+            self._scale = start_scale * (end_scale / start_scale) ** eased
+            self._offset = (
+                start_offset[0] + (end_offset[0] - start_offset[0]) * eased,
+                start_offset[1] + (end_offset[1] - start_offset[1]) * eased,
+            )
+        value = self._scale, (round(self._offset[0]), round(self._offset[1]))
+        if value != self._written:
+            self.target.raw = value
+            self._written = value
+        return self.is_running
+
+    def run(self) -> FrameStats:
+        """
+        Plays motion until it finishes (including retargets), blocking current thread
+
+        :return: Frame statistics
+        """
+        self.start()
+        while self.update(self.pacer.wait()):
+            pass
+        return self.stats
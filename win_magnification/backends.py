@@ -0,0 +1,674 @@
+"""
+| Implementations of Magnification API used by :mod:`win_magnification`
+| By default ``magnification.dll`` is used (Windows only),
+  :class:`SimulatedBackend` allows to run the whole stack without Windows
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import collections
+import contextlib
+import ctypes
+import functools
+import sys
+import threading
+import time
+import typing
+from ctypes import wintypes
+
+from win_magnification import const
+from win_magnification import types
+
+# C Types
+# noinspection SpellCheckingInspection
+MAGCOLOREFFECT = (ctypes.c_float * const.COLOR_MATRIX_SIZE)
+# noinspection SpellCheckingInspection
+PMAGCOLOREFFECT = ctypes.POINTER(MAGCOLOREFFECT)
+
+# noinspection SpellCheckingInspection
+MAGTRANSFORM = (ctypes.c_float * const.TRANSFORMATION_MATRIX_SIZE)
+# noinspection SpellCheckingInspection
+PMAGTRANSFORM = ctypes.POINTER(MAGTRANSFORM)
+
+# Win32 error codes reported by backends
+ERROR_ACCESS_DENIED = 5
+ERROR_INVALID_PARAMETER = 87
+ERROR_INVALID_WINDOW_HANDLE = 1400
+
+_ERROR_DESCRIPTIONS = {
+    ERROR_ACCESS_DENIED: "Access is denied.",
+    ERROR_INVALID_PARAMETER: "The parameter is incorrect.",
+    ERROR_INVALID_WINDOW_HANDLE: "Invalid window handle.",
+}
+
+FUNCTION_NAMES = (
+    'MagInitialize',
+    'MagUninitialize',
+    'MagGetFullscreenColorEffect',
+    'MagSetFullscreenColorEffect',
+    'MagSetFullscreenTransform',
+    'MagGetFullscreenTransform',
+    'MagSetColorEffect',
+    'MagGetColorEffect',
+    'MagSetWindowTransform',
+    'MagGetWindowTransform',
+    'MagSetWindowSource',
+    'MagGetWindowSource',
+    'MagSetWindowFilterList',
+    'MagGetWindowFilterList',
+    'MagGetInputTransform',
+    'MagSetInputTransform',
+    'MagShowSystemCursor',
+)
+"""
+Names of all functions each :class:`Backend` must provide
+"""
+
+
+def make_win_error(code: int, description: typing.Optional[str] = None) -> OSError:
+    """
+    | Creates the same error as :func:`ctypes.WinError` does,
+      but works on any platform
+    | Example:
+
+    >>> make_win_error(ERROR_INVALID_PARAMETER).winerror
+    87
+
+    :param code: Win32 error code
+    :param description: Error message (default: known description for **code**)
+    :return: Error to raise
+    """
+    if description is None:
+        description = _ERROR_DESCRIPTIONS.get(code, f"Windows Error {code:#x}")
+    error = OSError(None, description, None, code)
+    if not hasattr(error, 'winerror'):
+        # OSError drops winerror outside of Windows
+        error.winerror = code  # type: ignore
+    return error
+
+
+class Backend:
+    """
+    | Magnification API implementation
+    | Each function named after its C prototype,
+      receives the same ctypes arguments and returns the same result
+      (BOOL for most of them), see `Header <https://pastebin.com/Lh82NjjM>`_
+    | Failed call must be followed by :meth:`win_error` call
+      to get the error describing the failure
+    """
+
+    def win_error(self) -> OSError:
+        """
+        :return: Error describing last failed call
+        """
+        raise NotImplementedError
+
+    def __getattr__(self, name: str):
+        if name in FUNCTION_NAMES:
+            raise NotImplementedError(f"{type(self).__name__} doesn't implement {name}")
+        raise AttributeError(name)
+
+
+class DLLBackend(Backend):
+    """
+    Calls functions of ``magnification.dll``
+    """
+
+    def __init__(self, dll: typing.Optional[ctypes.CDLL] = None):
+        """
+        :param dll: Loaded library (default: loads ``magnification.dll``)
+        """
+        if dll is None:
+            dll = ctypes.WinDLL('magnification.dll')  # type: ignore
+        _set_signatures(dll)
+        self.dll = dll
+        """
+        | Library all calls are forwarded to
+        | |Accessors: Get|
+        """
+        # Bind C functions directly, so calls cost nothing extra
+        for name in FUNCTION_NAMES:
+            setattr(self, name, getattr(dll, name))
+
+    def win_error(self) -> OSError:
+        return ctypes.WinError()  # type: ignore
+
+
+class BackendProxy(Backend):
+    """
+    | Forwards calls to **inner** backend
+    | Override :meth:`_wrap` to intercept calls,
+      other attributes are taken from **inner** backend
+    """
+
+    def __init__(self, inner: Backend):
+        """
+        :param inner: Backend calls forwarded to
+        """
+        self.inner = inner
+        """
+        | Backend calls forwarded to
+        | |Accessors: Get|
+        """
+        for name in FUNCTION_NAMES:
+            try:
+                function = getattr(inner, name)
+            except NotImplementedError:
+                continue
+            setattr(self, name, self._wrap(name, function))
+
+    def _wrap(self, name: str, function: typing.Callable) -> typing.Callable:
+        """
+        :param name: Function name (one of :data:`FUNCTION_NAMES`)
+        :param function: Function of **inner** backend
+        :return: Function to call instead
+        """
+        return function
+
+    def win_error(self) -> OSError:
+        return self.inner.win_error()
+
+    def __getattr__(self, name: str):
+        if name == 'inner':
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+
+class SimulatedWindow:
+    """
+    State of magnifier control simulated by :class:`SimulatedBackend`
+    """
+
+    def __init__(self):
+        self.transform: types.TransformationMatrix = const.DEFAULT_TRANSFORM
+        """
+        | Current transformation matrix
+        | |Accessors: Get Set|
+        """
+        self.color_effect: typing.Optional[types.ColorMatrix] = None
+        """
+        | Current color effect, or None if no effect set
+        | |Accessors: Get Set|
+        """
+        self.source: types.Rectangle = const.DEFAULT_SOURCE
+        """
+        | Current source rectangle
+        | |Accessors: Get Set|
+        """
+        self.filter_mode: int = const.MW_FILTERMODE_EXCLUDE
+        """
+        | Current filtration mode
+        | |Accessors: Get Set|
+        """
+        self.filters: typing.Tuple[int, ...] = const.DEFAULT_FILTERS_LIST
+        """
+        | Current filtration list
+        | |Accessors: Get Set|
+        """
+
+
+Latency = typing.Union[float, typing.Mapping[str, float]]
+
+
+def _simulated(function):
+    name = function.__name__
+
+    @functools.wraps(function)
+    def wrapper(self: SimulatedBackend, *args):
+        self.calls[name] += 1
+        latency = self.latency
+        if not isinstance(latency, (int, float)):
+            latency = latency.get(name, 0.0)
+        if latency:
+            _wait(latency)
+        with self._lock:
+            return function(self, *args)
+    return wrapper
+
+
+def _wait(seconds: float):
+    if seconds >= 0.002:
+        time.sleep(seconds)
+        return
+    # Sleep is too coarse for microseconds
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _deref(value):
+    """Get ctypes object behind pointer or byref()"""
+    if isinstance(value, ctypes._Pointer):  # type: ignore
+        return value.contents
+    return getattr(value, '_obj', value)
+
+
+def _to_rectangle(value) -> types.Rectangle:
+    value = _deref(value)
+    return value.left, value.top, value.right, value.bottom
+
+
+def _from_rectangle(target, value: types.Rectangle):
+    target = _deref(target)
+    target.left, target.top, target.right, target.bottom = value
+
+
+def _is_empty(rectangle: types.Rectangle):
+    left, top, right, bottom = rectangle
+    return right <= left or bottom <= top
+
+
+def _as_int(value) -> int:
+    # HWND arrays store NULL as None
+    return int(value or 0)
+
+
+class SimulatedBackend(Backend):
+    """
+    | In-process stand-in for ``magnification.dll``
+    | Keeps fullscreen, window, filtration and input state,
+      stores values with the same C types precision and rejects
+      values real API rejects
+    | Magnifier windows must be created with :meth:`create_window`
+    | Example:
+
+    >>> backend = SimulatedBackend()
+    >>> with use_backend(backend):
+    ...     import win_magnification as mag
+    ...     mag.set_fullscreen_color_effect(const.COLOR_INVERSION_EFFECT)
+    ...     mag.get_fullscreen_color_effect() == const.COLOR_INVERSION_EFFECT
+    True
+    >>> backend.calls['MagSetFullscreenColorEffect']
+    1
+    """
+
+    MIN_SCALE = 1.0
+    MAX_SCALE = 4096.0
+    MAX_OFFSET = const.FULLSCREEN_OFFSET_LIMIT
+
+    def __init__(
+        self,
+        latency: Latency = 0.0,
+        ui_access: bool = False,
+    ):
+        """
+        :param latency: Delay (in seconds) injected into each call,
+            or mapping of function names to their delays
+        :param ui_access: Simulate process with UIAccess privileges,
+            required by :func:`.set_input_transform`
+        """
+        self.latency: Latency = latency
+        """
+        | Delay (in seconds) injected into each call,
+          or mapping of function names to their delays
+        | |Accessors: Get Set|
+        """
+        self.ui_access = ui_access
+        """
+        | Is calling process has UIAccess privileges
+        | |Accessors: Get Set|
+        """
+        self.calls: typing.Counter[str] = collections.Counter()
+        """
+        | Count of calls made, per function name
+        | |Accessors: Get|
+        """
+        self.initialized = False
+        """
+        | Is :func:`.initialize` called
+        | |Accessors: Get|
+        """
+        self.fullscreen_color_effect: types.ColorMatrix = const.DEFAULT_COLOR_EFFECT
+        """
+        | Current fullscreen color effect
+        | |Accessors: Get Set|
+        """
+        self.fullscreen_transform: types.FullscreenTransform = const.DEFAULT_FULLSCREEN_TRANSFORM
+        """
+        | Current fullscreen transformation
+        | |Accessors: Get Set|
+        """
+        self.input_transform: types.InputTransform = const.DEFAULT_INPUT_TRANSFORM
+        """
+        | Current input transformation
+        | |Accessors: Get Set|
+        """
+        self.cursor_visible = True
+        """
+        | Is system cursor shown
+        | |Accessors: Get Set|
+        """
+        self.windows: typing.Dict[int, SimulatedWindow] = {}
+        """
+        | Magnifier windows by their handles
+        | |Accessors: Get|
+        """
+        self._next_hwnd = 0x10000
+        self._lock = threading.RLock()
+        self._errors = threading.local()
+
+    def create_window(self, hwnd: typing.Optional[int] = None) -> int:
+        """
+        Simulates creation of magnifier control
+
+        :param hwnd: Handle to use (default: new unique one)
+        :return: Handle of the magnification window
+        :raises RuntimeError: If :func:`.initialize` never called
+        """
+        if not self.initialized:
+            raise RuntimeError("Magnifier window class registered only after initialize call")
+        with self._lock:
+            if hwnd is None:
+                self._next_hwnd += 2
+                hwnd = self._next_hwnd
+            self.windows[hwnd] = SimulatedWindow()
+        return hwnd
+
+    def destroy_window(self, hwnd: int):
+        """
+        Simulates destruction of magnifier control
+
+        :param hwnd: The handle of the magnification window.
+        """
+        with self._lock:
+            self.windows.pop(hwnd, None)
+
+    def reset_calls(self):
+        """Clears :attr:`calls` counters"""
+        self.calls.clear()
+
+    def win_error(self) -> OSError:
+        return make_win_error(getattr(self._errors, 'code', 0))
+
+    def _fail(self, code: int) -> bool:
+        self._errors.code = code
+        return False
+
+    def _window(self, hwnd) -> typing.Optional[SimulatedWindow]:
+        window = self.windows.get(_as_int(hwnd))
+        if window is None:
+            self._fail(ERROR_INVALID_WINDOW_HANDLE)
+        return window
+
+    # Simulated functions
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagInitialize(self) -> bool:
+        self.initialized = True
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagUninitialize(self) -> bool:
+        if not self.initialized:
+            return self._fail(ERROR_INVALID_PARAMETER)
+        self.initialized = False
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagSetFullscreenColorEffect(self, effect) -> bool:
+        self.fullscreen_color_effect = tuple(_deref(effect))
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagGetFullscreenColorEffect(self, effect) -> bool:
+        _deref(effect)[:] = self.fullscreen_color_effect
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagSetFullscreenTransform(self, scale, offset_x, offset_y) -> bool:
+        scale = ctypes.c_float(scale).value
+        offset = ctypes.c_int(offset_x).value, ctypes.c_int(offset_y).value
+        if not self.MIN_SCALE <= scale <= self.MAX_SCALE or \
+                any(abs(value) > self.MAX_OFFSET for value in offset):
+            return self._fail(ERROR_INVALID_PARAMETER)
+        self.fullscreen_transform = scale, offset
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagGetFullscreenTransform(self, scale, offset_x, offset_y) -> bool:
+        scale_value, (offset_x_value, offset_y_value) = self.fullscreen_transform
+        _deref(scale).value = scale_value
+        _deref(offset_x).value = offset_x_value
+        _deref(offset_y).value = offset_y_value
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagSetColorEffect(self, hwnd, effect) -> bool:
+        window = self._window(hwnd)
+        if window is None:
+            return False
+        window.color_effect = tuple(_deref(effect)) if effect is not None else None
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagGetColorEffect(self, hwnd, effect) -> bool:
+        window = self._window(hwnd)
+        if window is None:
+            return False
+        _deref(effect)[:] = window.color_effect or const.DEFAULT_COLOR_EFFECT
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagSetWindowTransform(self, hwnd, matrix) -> bool:
+        window = self._window(hwnd)
+        if window is None:
+            return False
+        window.transform = tuple(_deref(matrix))
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagGetWindowTransform(self, hwnd, matrix) -> bool:
+        window = self._window(hwnd)
+        if window is None:
+            return False
+        _deref(matrix)[:] = window.transform
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagSetWindowSource(self, hwnd, rectangle) -> bool:
+        window = self._window(hwnd)
+        if window is None:
+            return False
+        window.source = _to_rectangle(rectangle)
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagGetWindowSource(self, hwnd, rectangle) -> bool:
+        window = self._window(hwnd)
+        if window is None:
+            return False
+        _from_rectangle(rectangle, window.source)
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagSetWindowFilterList(self, hwnd, mode, count, hwnds) -> bool:
+        window = self._window(hwnd)
+        if window is None:
+            return False
+        if mode != const.MW_FILTERMODE_EXCLUDE or count < 0:
+            # Include mode is not supported on Windows 7 or newer
+            return self._fail(ERROR_INVALID_PARAMETER)
+        hwnds = _deref(hwnds) if count else ()
+        window.filter_mode = mode
+        window.filters = tuple(_as_int(hwnds[i]) for i in range(count))
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagGetWindowFilterList(self, hwnd, mode, count, hwnds) -> int:
+        window = self._window(hwnd)
+        if window is None:
+            return -1
+        _deref(mode).value = window.filter_mode
+        if hwnds is None:
+            return len(window.filters)
+        # Count returned for too small buffer isn't documented, so only windows copied are counted
+        hwnds = _deref(hwnds)
+        copied = window.filters[:count]
+        for i, value in enumerate(copied):
+            hwnds[i] = value
+        return len(copied)
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagSetInputTransform(self, is_enabled, source, destination) -> bool:
+        if not self.ui_access:
+            return self._fail(ERROR_ACCESS_DENIED)
+        if not is_enabled:
+            self.input_transform = const.DEFAULT_INPUT_TRANSFORM
+            return True
+        source = _to_rectangle(source)
+        destination = _to_rectangle(destination)
+        if _is_empty(source) or _is_empty(destination):
+            return self._fail(ERROR_INVALID_PARAMETER)
+        self.input_transform = True, source, destination
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagGetInputTransform(self, is_enabled, source, destination) -> bool:
+        enabled, source_value, destination_value = self.input_transform
+        _deref(is_enabled).value = enabled
+        _from_rectangle(source, source_value)
+        _from_rectangle(destination, destination_value)
+        return True
+
+    # noinspection PyPep8Naming
+    @_simulated
+    def MagShowSystemCursor(self, show_cursor) -> bool:
+        self.cursor_visible = bool(show_cursor)
+        return True
+
+
+def _set_signatures(dll):
+    # C-Function original names and signatures
+    dll.MagInitialize.restype = wintypes.BOOL
+    dll.MagUninitialize.restype = wintypes.BOOL
+
+    dll.MagGetFullscreenColorEffect.restype = wintypes.BOOL
+    dll.MagGetFullscreenColorEffect.argtypes = (PMAGCOLOREFFECT,)
+
+    dll.MagSetFullscreenColorEffect.restype = wintypes.BOOL
+    dll.MagSetFullscreenColorEffect.argtypes = (PMAGCOLOREFFECT,)
+
+    dll.MagSetFullscreenTransform.restype = wintypes.BOOL
+    dll.MagSetFullscreenTransform.argtypes = (ctypes.c_float, ctypes.c_int,
+                                              ctypes.c_int)
+
+    dll.MagGetFullscreenTransform.restype = wintypes.BOOL
+    dll.MagGetFullscreenTransform.argtypes = (ctypes.POINTER(ctypes.c_float),
+                                              ctypes.POINTER(ctypes.c_int),
+                                              ctypes.POINTER(ctypes.c_int))
+
+    dll.MagSetColorEffect.restype = wintypes.BOOL
+    dll.MagSetColorEffect.argtypes = (wintypes.HWND, PMAGCOLOREFFECT,)
+
+    dll.MagGetColorEffect.restype = wintypes.BOOL
+    dll.MagGetColorEffect.argtypes = (wintypes.HWND, PMAGCOLOREFFECT,)
+
+    dll.MagSetWindowTransform.restype = wintypes.BOOL
+    dll.MagSetWindowTransform.argtypes = (wintypes.HWND, PMAGTRANSFORM,)
+
+    dll.MagGetWindowTransform.restype = wintypes.BOOL
+    dll.MagGetWindowTransform.argtypes = (wintypes.HWND, PMAGTRANSFORM,)
+
+    dll.MagSetWindowSource.restype = wintypes.BOOL
+    dll.MagSetWindowSource.argtypes = (wintypes.HWND, wintypes.RECT)
+
+    dll.MagGetWindowSource.restype = wintypes.BOOL
+    dll.MagGetWindowSource.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.RECT))
+
+    dll.MagSetWindowFilterList.restype = wintypes.BOOL
+    dll.MagSetWindowFilterList.argtypes = (wintypes.HWND, wintypes.DWORD,
+                                           ctypes.c_int, ctypes.POINTER(wintypes.HWND))
+
+    dll.MagGetWindowFilterList.restype = wintypes.BOOL
+    dll.MagGetWindowFilterList.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD),
+                                           ctypes.c_int, ctypes.POINTER(wintypes.HWND))
+
+    dll.MagGetInputTransform.restype = wintypes.BOOL
+    dll.MagGetInputTransform.argtypes = (ctypes.POINTER(wintypes.BOOL),
+                                         ctypes.POINTER(wintypes.RECT),
+                                         ctypes.POINTER(wintypes.RECT))
+
+    dll.MagSetInputTransform.restype = wintypes.BOOL
+    dll.MagSetInputTransform.argtypes = (wintypes.BOOL,
+                                         ctypes.POINTER(wintypes.RECT),
+                                         ctypes.POINTER(wintypes.RECT))
+
+    dll.MagShowSystemCursor.restype = wintypes.BOOL
+    dll.MagShowSystemCursor.argtypes = (wintypes.BOOL,)
+
+
+_backend: typing.Optional[Backend] = None
+_default_backend_lock = threading.Lock()
+
+
+def _load_default_backend() -> Backend:
+    global _backend
+    with _default_backend_lock:
+        if _backend is None:
+            if sys.platform != 'win32':
+                raise RuntimeError("Magnification API exists only for Windows! "
+                                   "Use set_backend to provide an alternative")
+            _backend = DLLBackend()
+        return _backend
+
+
+def get_backend() -> Backend:
+    """
+    | ``magnification.dll`` is loaded on the first call,
+      unless another backend was set before
+
+    :return: Backend all Magnification API calls are forwarded to
+    :raises RuntimeError: If no backend available on this platform
+    """
+    backend = _backend
+    if backend is None:
+        return _load_default_backend()
+    return backend
+
+
+def set_backend(backend: typing.Optional[Backend]) -> typing.Optional[Backend]:
+    """
+    | Replaces backend all Magnification API calls are forwarded to
+    | Values remembered by :data:`.deduplicator` are forgotten,
+      since new backend hasn't seen them
+
+    :param backend: New backend or None to use the default one
+    :return: Previous backend (None if the default one wasn't loaded yet)
+    """
+    global _backend
+    previous, _backend = _backend, backend
+    # Wrapper imports this module, so it's only looked up (nothing to forget if it isn't loaded yet)
+    wrapper = sys.modules.get('win_magnification._wrapper')
+    if wrapper is not None:
+        wrapper.deduplicator.invalidate()
+    return previous
+
+
+@contextlib.contextmanager
+def use_backend(backend: Backend):
+    """
+    | Use this *contextmanager* to temporary replace backend
+    | See example in :class:`SimulatedBackend`
+
+    :param backend: Backend to use inside
+    """
+    previous = set_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_backend(previous)
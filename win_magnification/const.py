@@ -4,7 +4,6 @@ Author: MaxBQb |
 `Microsoft Docs <https://docs.microsoft.com/en-us/windows/win32/api/_magapi/>`_ |
 `Header <https://pastebin.com/Lh82NjjM>`_
 """
-from win_magnification import tools
 from win_magnification import types
 
 # C Constants (feel free to use)
@@ -55,6 +54,10 @@ Magnify the windows.
 
 COLOR_MATRIX_SIZE: int = 5 ** 2
 TRANSFORMATION_MATRIX_SIZE: int = 3 ** 2
+FULLSCREEN_OFFSET_LIMIT: int = 262144
+"""
+Fullscreen magnifier offset must fit in -limit <= (x, y) <= limit
+"""
 
 # Color matrix
 COLOR_NO_EFFECT = (
@@ -123,12 +126,16 @@ Color transformation matrix which convert colors into shades of gray
 :type: :data:`.ColorMatrix`
 """
 
-COLOR_INVERTED_GRAYSCALE_EFFECT = tools.combine_matrices(
-    COLOR_GRAYSCALE_EFFECT,
-    COLOR_INVERSION_EFFECT,
+COLOR_INVERTED_GRAYSCALE_EFFECT = (
+    -0.3, -0.3, -0.3, 0.0, 0.0,
+    -0.6, -0.6, -0.6, 0.0, 0.0,
+    -0.1, -0.1, -0.1, 0.0, 0.0,
+    0.0, 0.0, 0.0, 1.0, 0.0,
+    1.0, 1.0, 1.0, 0.0, 1.0
 )
 """
-Color transformation matrix which convert inverted colors into shades of gray
+| Color transformation matrix which convert inverted colors into shades of gray
+| Same as :data:`COLOR_GRAYSCALE_EFFECT` combined with :data:`COLOR_INVERSION_EFFECT`
 
 ==== ==== ====  ===  ===
 -0.3 -0.3 -0.3  0.0  0.0
@@ -265,31 +272,21 @@ Default transformation matrix which does nothing with magnification factor
 :type: :data:`.TransformationMatrix`
 """
 
-DEFAULT_TRANSFORM_EXTRACTION_PATTERN = tuple(tools.get_extraction_pattern(
-    TRANSFORMATION_MATRIX_SIZE,
-    (0, 0),
-    (1, 1),
-    (0, 2),
-    (1, 2)
-))
+DEFAULT_TRANSFORM_EXTRACTION_PATTERN = (0, 4, 2, 5)
 """
-Default transformation matrix extraction pattern
-Allows to extract (scale_x, scale_y, offset_x, offset_y)
+| Default transformation matrix extraction pattern
+| Allows to extract (scale_x, scale_y, offset_x, offset_y)
+| Linear positions of (0, 0), (1, 1), (0, 2), (1, 2) coords
+  (see :func:`.get_extraction_pattern`)
 """
 
-_DEFAULT_TRANSFORM_PAIR = tools.extract_from_matrix(
-    DEFAULT_TRANSFORM,
-    *DEFAULT_TRANSFORM_EXTRACTION_PATTERN,
-)
-DEFAULT_TRANSFORM_PAIR: types.SimpleTransform \
-    = _DEFAULT_TRANSFORM_PAIR[:2], _DEFAULT_TRANSFORM_PAIR[2:]
+DEFAULT_TRANSFORM_PAIR: types.SimpleTransform = (1.0, 1.0), (0.0, 0.0)
 """
 Default transformation which does nothing with magnification factor
 tuple of (scale, offset)
 
 :type: :data:`.SimpleTransformation`
 """
-del _DEFAULT_TRANSFORM_PAIR
 
 DEFAULT_FULLSCREEN_TRANSFORM = (1.0, (0, 0))
 """
@@ -5,6 +5,7 @@
 - `negative screen color matrices <https://zerowidthjoiner.net/negativescreen>`_
 - `css filters <https://webplatform.github.io/docs/css/functions/sepia/>`_
 | `More about color transformations <https://docs.microsoft.com/en-us/windows/win32/gdiplus/-gdiplus-using-a-color-matrix-to-transform-a-single-color-use>`_
+| Any effect can be baked with :class:`.TransitionTable` for animations
 | Author: MaxBQb
 """
 from __future__ import annotations
@@ -0,0 +1,176 @@
+"""
+| Mapping of points and rectangles between unmagnified and magnified coordinates
+| Whole arrays are mapped in one call: flat float32 arrays (``array('f')``),
+  or NumPy arrays if NumPy is installed
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import array
+import itertools
+import numbers
+import typing
+
+from win_magnification import _functional_wrapper
+from win_magnification import tools
+from win_magnification import types
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None
+
+Points: 'typing.TypeAlias' = typing.Union[
+    typing.Sequence[float],
+    typing.Sequence[typing.Sequence[float]],
+    array.array,
+    'numpy.ndarray',
+]
+"""
+| Points (x, y) or rectangles (left, top, right, bottom), either:
+- flat sequence of coordinates: x0, y0, x1, y1, ...
+- sequence of points/rectangles
+- NumPy array with last dimension of 2 (points) or 4 (rectangles)
+"""
+
+
+def _flatten(values: Points) -> array.array:
+    if isinstance(values, array.array):
+        return array.array('f', values)
+    if values and not isinstance(values[0], numbers.Number):
+        return array.array('f', itertools.chain.from_iterable(values))
+    return array.array('f', values)
+
+
+class Mapping:
+    """
+    | Axis-aligned mapping from unmagnified to magnified coordinates:
+    | magnified = unmagnified * **scale** + **shift**
+    | Use :attr:`inverse` to map back (it's computed once)
+    | Example:
+
+    >>> mapping = Mapping.from_fullscreen((2.0, (100, 50)))
+    >>> mapping.point((150, 100))
+    (100.0, 100.0)
+    >>> mapping.inverse.point((100, 100))
+    (150.0, 100.0)
+    >>> list(mapping.inverse.rectangles([(0, 0, 1920, 1080)]))
+    [100.0, 50.0, 1060.0, 590.0]
+    """
+
+    def __init__(self, scale: typing.Tuple[float, float], shift: typing.Tuple[float, float] = (0.0, 0.0)):
+        """
+        :param scale: Magnification factor (x, y)
+        :param shift: Translation (x, y) applied after scaling
+        :raises ValueError: If scale has zero component
+        """
+        if not (scale[0] and scale[1]):
+            raise ValueError("Scale must be non-zero")
+        self.scale = float(scale[0]), float(scale[1])
+        self.shift = float(shift[0]), float(shift[1])
+        self._inverse: typing.Optional[Mapping] = None
+        self._coefficients: typing.Any = None
+
+    @classmethod
+    def from_matrix(cls, matrix: types.TransformationMatrix) -> Mapping:
+        """
+        :param matrix: Transformation matrix of magnifier window (scale and offset only)
+        :return: Mapping of window transformation
+        """
+        (scale_x, scale_y), (offset_x, offset_y) = _functional_wrapper.to_simple_transform(matrix)
+        return cls((scale_x, scale_y), (-offset_x, -offset_y))
+
+    @classmethod
+    def from_fullscreen(cls, transform: types.FullscreenTransform) -> Mapping:
+        """
+        :param transform: Fullscreen magnifier (scale, offset)
+        :return: Mapping from desktop coordinates to the screen ones
+        """
+        scale, (offset_x, offset_y) = transform
+        return cls((scale, scale), (-offset_x * scale, -offset_y * scale))
+
+    @classmethod
+    def from_input_transform(cls, input_transform: types.InputTransform) -> Mapping:
+        """
+        :param input_transform: Input transformation (is_enabled is ignored)
+        :return: Mapping from source rectangle to destination one
+        :raises ValueError: If source rectangle is empty
+        """
+        _, (left, top, right, bottom), (left_to, top_to, right_to, bottom_to) = input_transform
+        if right == left or bottom == top:
+            raise ValueError("Source rectangle must be non-empty")
+        scale = (right_to - left_to) / (right - left), (bottom_to - top_to) / (bottom - top)
+        return cls(scale, (left_to - left * scale[0], top_to - top * scale[1]))
+
+    @property
+    def matrix(self) -> types.TransformationMatrix:
+        """
+        | Transformation matrix of this mapping
+        | |Accessors: Get|
+        """
+        return tools.get_transform_matrix(*self.scale, -self.shift[0], -self.shift[1])
+
+    @property
+    def inverse(self) -> Mapping:
+        """
+        | Mapping from magnified coordinates to unmagnified ones
+        | |Accessors: Get|
+        """
+        if self._inverse is None:
+            (scale_x, scale_y), (shift_x, shift_y) = self.scale, self.shift
+            self._inverse = Mapping((1 / scale_x, 1 / scale_y), (-shift_x / scale_x, -shift_y / scale_y))
+            self._inverse._inverse = self
+        return self._inverse
+
+    def point(self, point: typing.Tuple[float, float]) -> typing.Tuple[float, float]:
+        """
+        :param point: Point (x, y)
+        :return: Point mapped
+        """
+        return point[0] * self.scale[0] + self.shift[0], point[1] * self.scale[1] + self.shift[1]
+
+    def points(self, points: Points) -> typing.Union[array.array, 'numpy.ndarray']:
+        """
+        | Maps many points in one call
+        | NumPy array of any shape with last dimension of 2 gives float32 NumPy array of the same shape,
+          other values give flat float32 array (x0, y0, x1, y1, ...)
+
+        :param points: Points to map
+        :return: Points mapped (new array)
+        :raises ValueError: If flat coordinates count is odd or NumPy array's last dimension isn't 2
+        """
+        return self._map(points, 2)
+
+    def rectangles(self, rectangles: Points) -> typing.Union[array.array, 'numpy.ndarray']:
+        """
+        | Maps many rectangles (left, top, right, bottom) in one call
+        | Rectangle is a pair of points, so see :meth:`points` for formats
+
+        :param rectangles: Rectangles to map
+        :return: Rectangles mapped (new array)
+        :raises ValueError: If flat coordinates count isn't multiple of 4 or NumPy array's last dimension isn't 4
+        """
+        return self._map(rectangles, 4)
+
+    def _map(self, values: Points, size: int) -> typing.Union[array.array, 'numpy.ndarray']:
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            if values.ndim == 0 or values.shape[-1] != size:
+                raise ValueError(f"Last dimension must be {size}, got shape {values.shape}")
+            result = numpy.array(values, dtype=numpy.float32)
+            pairs = result.reshape(-1, 2)
+            if self._coefficients is None:
+                self._coefficients = numpy.array(self.scale, numpy.float32), numpy.array(self.shift, numpy.float32)
+            scale, shift = self._coefficients
+            pairs *= scale
+            pairs += shift
+            return result
+        result = _flatten(values)
+        if len(result) % size:
+            raise ValueError(f"Coordinates count must be multiple of {size}")
+        (scale_x, scale_y), (shift_x, shift_y) = self.scale, self.shift
+        result[0::2] = array.array('f', [x * scale_x + shift_x for x in result[0::2]])
+        result[1::2] = array.array('f', [y * scale_y + shift_y for y in result[1::2]])
+        return result
+
+    def __repr__(self):
+        return f"{type(self).__name__}(scale={self.scale}, shift={self.shift})"
@@ -0,0 +1,291 @@
+"""
+| Per-function call counts, errors and latency histograms of Magnification API
+| Disabled by default: call :func:`enable` to start collecting,
+  while disabled calls aren't intercepted at all
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import threading
+import time
+import typing
+
+from win_magnification import backends
+
+_SUB_BUCKETS_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BUCKETS_BITS
+
+
+def _bucket(nanoseconds: int) -> int:
+    # Log-linear buckets: 8 per power of two, so error is below 12.5%
+    if nanoseconds < _SUB_BUCKETS:
+        return max(nanoseconds, 0)
+    octave = nanoseconds.bit_length() - _SUB_BUCKETS_BITS - 1
+    return (octave + 1) * _SUB_BUCKETS + ((nanoseconds >> octave) & (_SUB_BUCKETS - 1))
+
+
+def _bucket_bound(bucket: int) -> int:
+    if bucket < _SUB_BUCKETS:
+        return bucket
+    octave = bucket // _SUB_BUCKETS - 1
+    return ((_SUB_BUCKETS + bucket % _SUB_BUCKETS) << octave) + (1 << octave) - 1
+
+
+class LatencyHistogram:
+    """
+    | Distribution of call durations
+    | Percentiles are approximate (upper bound of bucket, error below 12.5%)
+    | Example:
+
+    >>> histogram = LatencyHistogram()
+    >>> for microseconds in range(1, 101):
+    ...     histogram.add(microseconds * 1000)
+    >>> histogram.count, histogram.max
+    (100, 0.0001)
+    >>> 50e-6 <= histogram.p50 <= 50e-6 * 1.125
+    True
+    >>> 99e-6 <= histogram.p99 <= 99e-6 * 1.125
+    True
+    """
+
+    def __init__(self):
+        self.buckets: typing.Dict[int, int] = {}
+        """
+        | Count of durations per bucket index
+        | |Accessors: Get|
+        """
+        self.count = 0
+        """
+        | Count of durations added
+        | |Accessors: Get|
+        """
+        self.total_ns = 0
+        """
+        | Sum of durations (in nanoseconds)
+        | |Accessors: Get|
+        """
+        self.max_ns = 0
+        """
+        | Longest duration (in nanoseconds)
+        | |Accessors: Get|
+        """
+
+    def add(self, nanoseconds: int):
+        """
+        Registers call duration
+
+        :param nanoseconds: Duration of call
+        """
+        bucket = _bucket(nanoseconds)
+        buckets = self.buckets
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ns += nanoseconds
+        if nanoseconds > self.max_ns:
+            self.max_ns = nanoseconds
+
+    def clear(self):
+        """Forgets durations added"""
+        self.buckets = {}
+        self.count = self.total_ns = self.max_ns = 0
+
+    def percentile(self, percent: float) -> float:
+        """
+        :param percent: Percentile (0 < percent <= 100)
+        :return: Duration (in seconds), which **percent** of calls don't exceed
+        """
+        if not self.count:
+            return 0.0
+        rank = max(percent / 100 * self.count, 1)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(_bucket_bound(bucket), self.max_ns) / 1e9
+        return self.max_ns / 1e9  # pragma: no cover
+
+    @property
+    def p50(self) -> float:
+        """
+        | Median duration (in seconds)
+        | |Accessors: Get|
+        """
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        """
+        | 99th percentile of duration (in seconds)
+        | |Accessors: Get|
+        """
+        return self.percentile(99)
+
+    @property
+    def mean(self) -> float:
+        """
+        | Average duration (in seconds)
+        | |Accessors: Get|
+        """
+        return self.total_ns / self.count / 1e9 if self.count else 0.0
+
+    @property
+    def max(self) -> float:
+        """
+        | Longest duration (in seconds)
+        | |Accessors: Get|
+        """
+        return self.max_ns / 1e9
+
+    def copy(self) -> LatencyHistogram:
+        """
+        :return: Independent copy of this histogram
+        """
+        result = LatencyHistogram()
+        result.buckets = dict(self.buckets)
+        result.count, result.total_ns, result.max_ns = self.count, self.total_ns, self.max_ns
+        return result
+
+
+class FunctionStats:
+    """
+    Metrics of single Magnification API function
+    """
+
+    def __init__(self, name: str):
+        """
+        :param name: Function name (one of :data:`.FUNCTION_NAMES`)
+        """
+        self.name = name
+        self.calls = 0
+        """
+        | Count of calls made
+        | |Accessors: Get|
+        """
+        self.errors = 0
+        """
+        | Count of failed calls (reported as :class:`OSError` by wrapper)
+        | |Accessors: Get|
+        """
+        self.latency = LatencyHistogram()
+        """
+        | Distribution of call durations
+        | |Accessors: Get|
+        """
+
+    def copy(self) -> FunctionStats:
+        """
+        :return: Independent copy of these metrics
+        """
+        result = FunctionStats(self.name)
+        result.calls, result.errors, result.latency = self.calls, self.errors, self.latency.copy()
+        return result
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}: calls={self.calls} errors={self.errors} " \
+               f"p50={self.latency.p50 * 1e6:.1f}us p99={self.latency.p99 * 1e6:.1f}us>"
+
+
+class MetricsBackend(backends.BackendProxy):
+    """
+    Measures each call of **inner** backend
+    """
+
+    def __init__(self, inner: backends.Backend, functions: typing.Optional[typing.Dict[str, FunctionStats]] = None):
+        """
+        :param inner: Backend calls forwarded to
+        :param functions: Metrics to update, per function name (default: new ones)
+        """
+        if functions is None:
+            functions = {}
+        for name in backends.FUNCTION_NAMES:
+            functions.setdefault(name, FunctionStats(name))
+        self.functions = functions
+        """
+        | Metrics per function name
+        | |Accessors: Get|
+        """
+        super().__init__(inner)
+
+    def _wrap(self, name: str, function: typing.Callable) -> typing.Callable:
+        stats = self.functions[name]
+        latency = stats.latency
+        clock = time.perf_counter_ns
+        # Filter list size is -1 on fail, other functions return BOOL
+        failed = (lambda result: result == -1) if name == 'MagGetWindowFilterList' else (lambda result: not result)
+
+        def measured(*args):
+            started = clock()
+            try:
+                result = function(*args)
+            finally:
+                latency.add(clock() - started)
+                stats.calls += 1
+            if failed(result):
+                stats.errors += 1
+            return result
+        return measured
+
+
+_functions: typing.Dict[str, FunctionStats] = {}
+_lock = threading.Lock()
+
+
+def enable() -> MetricsBackend:
+    """
+    | Starts collecting metrics of current backend calls
+    | Backend set by :func:`.set_backend` afterwards isn't measured
+
+    :return: Measuring backend installed
+    """
+    with _lock:
+        backend = backends.get_backend()
+        if not isinstance(backend, MetricsBackend):
+            backend = MetricsBackend(backend, _functions)
+            backends.set_backend(backend)
+        return backend
+
+
+def disable():
+    """Stops collecting metrics, collected ones are kept until :func:`reset`"""
+    with _lock:
+        backend = backends.get_backend()
+        if isinstance(backend, MetricsBackend):
+            backends.set_backend(backend.inner)
+
+
+def is_enabled() -> bool:
+    """
+    :return: Are metrics collected
+    """
+    return isinstance(backends._backend, MetricsBackend)
+
+
+def stats() -> typing.Dict[str, FunctionStats]:
+    """
+    | Example:
+
+    >>> import win_magnification as mag
+    >>> with mag.use_backend(mag.backends.SimulatedBackend()):
+    ...     _ = enable()
+    ...     mag.initialize()
+    ...     mag.set_fullscreen_transform(2.0, (0, 0))
+    ...     mag.finalize()
+    ...     disable()
+    >>> stats()['MagSetFullscreenTransform'].calls
+    1
+    >>> reset()
+    >>> stats()
+    {}
+
+    :return: Copy of metrics collected, per name of function called
+    """
+    with _lock:
+        return {name: value.copy() for name, value in _functions.items() if value.calls}
+
+
+def reset():
+    """Forgets metrics collected"""
+    with _lock:
+        for value in _functions.values():
+            value.calls = value.errors = 0
+            value.latency.clear()
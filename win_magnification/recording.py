@@ -0,0 +1,335 @@
+"""
+| Recording of Magnification API calls into compact binary log and its timed replay
+| Log starts with :data:`MAGIC`, then each call stored as:
+  function code (byte), delay since previous call (varint, in microseconds),
+  arguments (little-endian, matrices as float32)
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import struct
+import time
+import typing
+from ctypes import wintypes
+
+from win_magnification import backends
+
+MAGIC = b'WMAGREC1'
+"""
+Header of each log (format version included)
+"""
+
+RECORDED_FUNCTIONS = (
+    'MagInitialize',
+    'MagUninitialize',
+    'MagSetFullscreenColorEffect',
+    'MagSetFullscreenTransform',
+    'MagSetColorEffect',
+    'MagSetWindowTransform',
+    'MagSetWindowSource',
+    'MagSetWindowFilterList',
+    'MagSetInputTransform',
+    'MagShowSystemCursor',
+)
+"""
+Names of functions recorded (position is function code)
+"""
+
+_CODES = {name: code for code, name in enumerate(RECORDED_FUNCTIONS)}
+
+_COLOR_MATRIX = struct.Struct('<25f')
+_TRANSFORM = struct.Struct('<q9f')
+_FULLSCREEN_TRANSFORM = struct.Struct('<fii')
+_HWND_FLAG = struct.Struct('<q?')
+_SOURCE = struct.Struct('<q4i')
+_FILTERS = struct.Struct('<qII')
+_HWND = struct.Struct('<q')
+_INPUT_TRANSFORM = struct.Struct('<?4i4i')
+_FLAG = struct.Struct('<?')
+
+
+class Call(typing.NamedTuple):
+    """
+    Single call read from log
+    """
+    timestamp: float
+    """Time since the first call (in seconds)"""
+    name: str
+    """Function name (one of :data:`RECORDED_FUNCTIONS`)"""
+    args: tuple
+    """Python values of arguments"""
+
+
+def _rectangle(value) -> typing.Tuple[int, int, int, int]:
+    return backends._to_rectangle(value)
+
+
+def _encode(name: str, args: tuple) -> bytes:
+    if name == 'MagSetFullscreenColorEffect':
+        return _COLOR_MATRIX.pack(*backends._deref(args[0]))
+    if name == 'MagSetFullscreenTransform':
+        return _FULLSCREEN_TRANSFORM.pack(*args)
+    if name == 'MagSetColorEffect':
+        hwnd, effect = args
+        if effect is None:
+            return _HWND_FLAG.pack(backends._as_int(hwnd), False)
+        return _HWND_FLAG.pack(backends._as_int(hwnd), True) + _COLOR_MATRIX.pack(*backends._deref(effect))
+    if name == 'MagSetWindowTransform':
+        return _TRANSFORM.pack(backends._as_int(args[0]), *backends._deref(args[1]))
+    if name == 'MagSetWindowSource':
+        return _SOURCE.pack(backends._as_int(args[0]), *_rectangle(args[1]))
+    if name == 'MagSetWindowFilterList':
+        hwnd, mode, count, hwnds = args
+        hwnds = backends._deref(hwnds) if count else ()
+        return _FILTERS.pack(backends._as_int(hwnd), mode, count) + \
+            b''.join(_HWND.pack(backends._as_int(value)) for value in hwnds[:count])
+    if name == 'MagSetInputTransform':
+        return _INPUT_TRANSFORM.pack(bool(args[0]), *_rectangle(args[1]), *_rectangle(args[2]))
+    if name == 'MagShowSystemCursor':
+        return _FLAG.pack(bool(args[0]))
+    return b''
+
+
+def _decode(name: str, data: bytes, offset: int) -> typing.Tuple[tuple, int]:
+    if name == 'MagSetFullscreenColorEffect':
+        return (_COLOR_MATRIX.unpack_from(data, offset),), offset + _COLOR_MATRIX.size
+    if name == 'MagSetFullscreenTransform':
+        return _FULLSCREEN_TRANSFORM.unpack_from(data, offset), offset + _FULLSCREEN_TRANSFORM.size
+    if name == 'MagSetColorEffect':
+        hwnd, has_effect = _HWND_FLAG.unpack_from(data, offset)
+        offset += _HWND_FLAG.size
+        if not has_effect:
+            return (hwnd, None), offset
+        return (hwnd, _COLOR_MATRIX.unpack_from(data, offset)), offset + _COLOR_MATRIX.size
+    if name == 'MagSetWindowTransform':
+        hwnd, *matrix = _TRANSFORM.unpack_from(data, offset)
+        return (hwnd, tuple(matrix)), offset + _TRANSFORM.size
+    if name == 'MagSetWindowSource':
+        hwnd, *rectangle = _SOURCE.unpack_from(data, offset)
+        return (hwnd, tuple(rectangle)), offset + _SOURCE.size
+    if name == 'MagSetWindowFilterList':
+        hwnd, mode, count = _FILTERS.unpack_from(data, offset)
+        offset += _FILTERS.size
+        hwnds = struct.unpack_from(f'<{count}q', data, offset)
+        return (hwnd, mode, hwnds), offset + count * _HWND.size
+    if name == 'MagSetInputTransform':
+        enabled, *rectangles = _INPUT_TRANSFORM.unpack_from(data, offset)
+        return (enabled, tuple(rectangles[:4]), tuple(rectangles[4:])), offset + _INPUT_TRANSFORM.size
+    if name == 'MagShowSystemCursor':
+        return _FLAG.unpack_from(data, offset), offset + _FLAG.size
+    return (), offset
+
+
+def _to_c_args(name: str, args: tuple, hwnds: typing.Mapping[int, int]) -> tuple:
+    if name == 'MagSetFullscreenColorEffect':
+        return backends.MAGCOLOREFFECT(*args[0]),
+    if name == 'MagSetColorEffect':
+        hwnd, effect = args
+        return hwnds.get(hwnd, hwnd), None if effect is None else backends.MAGCOLOREFFECT(*effect)
+    if name == 'MagSetWindowTransform':
+        return hwnds.get(args[0], args[0]), backends.MAGTRANSFORM(*args[1])
+    if name == 'MagSetWindowSource':
+        return hwnds.get(args[0], args[0]), wintypes.RECT(*args[1])
+    if name == 'MagSetWindowFilterList':
+        hwnd, mode, filtered = args
+        filtered = [hwnds.get(value, value) for value in filtered]
+        return hwnds.get(hwnd, hwnd), mode, len(filtered), (wintypes.HWND * len(filtered))(*filtered)
+    if name == 'MagSetInputTransform':
+        enabled, source, destination = args
+        return enabled, ctypes.pointer(wintypes.RECT(*source)), ctypes.pointer(wintypes.RECT(*destination))
+    return args
+
+
+def _write_varint(value: int) -> bytes:
+    result = bytearray()
+    while value >= 0x80:
+        result.append(value & 0x7F | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def _read_varint(data: bytes, offset: int) -> typing.Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+class RecordingBackend(backends.BackendProxy):
+    """
+    | Writes each call of :data:`RECORDED_FUNCTIONS` into **stream**,
+      then forwards it to **inner** backend
+    | Use :func:`record` to record calls of current backend
+    """
+
+    def __init__(
+        self,
+        inner: backends.Backend,
+        stream: typing.BinaryIO,
+        clock: typing.Callable[[], int] = time.perf_counter_ns,
+    ):
+        """
+        :param inner: Backend calls forwarded to
+        :param stream: Binary stream log written to
+        :param clock: Monotonic time source (in nanoseconds)
+        """
+        self.stream = stream
+        self.clock = clock
+        self.records = 0
+        """
+        | Count of calls recorded
+        | |Accessors: Get|
+        """
+        self._last: typing.Optional[int] = None
+        stream.write(MAGIC)
+        super().__init__(inner)
+
+    def _wrap(self, name: str, function: typing.Callable) -> typing.Callable:
+        code = _CODES.get(name)
+        if code is None:
+            return function
+        header = bytes((code,))
+
+        def recorded(*args):
+            now = self.clock() // 1000
+            delay = 0 if self._last is None else max(now - self._last, 0)
+            self._last = now
+            self.stream.write(header + _write_varint(delay) + _encode(name, args))
+            self.records += 1
+            return function(*args)
+        return recorded
+
+
+@contextlib.contextmanager
+def record(stream: typing.BinaryIO) -> typing.Iterator[RecordingBackend]:
+    """
+    | Use this *contextmanager* to record calls made inside
+    | Example:
+
+    >>> import io
+    >>> import win_magnification as mag
+    >>> log = io.BytesIO()
+    >>> with mag.use_backend(mag.backends.SimulatedBackend()):
+    ...     with record(log):
+    ...         mag.initialize()
+    ...         mag.set_fullscreen_transform(2.0, (10, 20))
+    ...         mag.finalize()
+    >>> [(call.name, call.args) for call in read(log.getvalue())]
+    [('MagInitialize', ()), ('MagSetFullscreenTransform', (2.0, 10, 20)), ('MagUninitialize', ())]
+
+    :param stream: Binary stream log written to
+    """
+    backend = RecordingBackend(backends.get_backend(), stream)
+    previous = backends.set_backend(backend)
+    try:
+        yield backend
+    finally:
+        backends.set_backend(previous)
+
+
+def read(data: bytes) -> typing.Iterator[Call]:
+    """
+    :param data: Whole log
+    :return: Calls recorded
+    :raises ValueError: If **data** isn't a log
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a call log")
+    offset = len(MAGIC)
+    timestamp = 0
+    while offset < len(data):
+        name = RECORDED_FUNCTIONS[data[offset]]
+        delay, offset = _read_varint(data, offset + 1)
+        timestamp += delay
+        args, offset = _decode(name, data, offset)
+        yield Call(timestamp / 1e6, name, args)
+
+
+class ReplayStats:
+    """
+    Result of :meth:`Replayer.replay`
+    """
+
+    def __init__(self, calls: int, errors: int, elapsed: float):
+        self.calls = calls
+        """
+        | Count of calls made
+        | |Accessors: Get|
+        """
+        self.errors = errors
+        """
+        | Count of calls failed
+        | |Accessors: Get|
+        """
+        self.elapsed = elapsed
+        """
+        | Time of replay (in seconds)
+        | |Accessors: Get|
+        """
+
+    @property
+    def throughput(self) -> float:
+        """
+        | Calls per second
+        | |Accessors: Get|
+        """
+        return self.calls / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class Replayer:
+    """
+    | Repeats calls recorded by :func:`record` on **backend**
+    | Window handles may be replaced using **hwnds**
+      (like windows created by :meth:`.SimulatedBackend.create_window`)
+    """
+
+    def __init__(
+        self,
+        backend: typing.Optional[backends.Backend] = None,
+        realtime: bool = True,
+        hwnds: typing.Optional[typing.Mapping[int, int]] = None,
+        clock: typing.Callable[[], float] = time.perf_counter,
+        sleep: typing.Callable[[float], typing.Any] = time.sleep,
+    ):
+        """
+        :param backend: Backend calls made on (default: current one)
+        :param realtime: Keep original timing, otherwise calls made as fast as possible
+        :param hwnds: Recorded window handles mapped to replayed ones
+        :param clock: Monotonic time source
+        :param sleep: Function to wait with
+        """
+        self.backend = backend
+        self.realtime = realtime
+        self.hwnds = hwnds or {}
+        self.clock = clock
+        self.sleep = sleep
+
+    def replay(self, log: typing.Union[bytes, typing.Iterable[Call]]) -> ReplayStats:
+        """
+        :param log: Whole log or calls read from it
+        :return: Count of calls, errors and replay speed
+        """
+        calls = read(log) if isinstance(log, (bytes, bytearray)) else log
+        backend = self.backend or backends.get_backend()
+        # Arguments converted before replay, so they don't affect timing
+        prepared = [
+            (call.timestamp, getattr(backend, call.name), _to_c_args(call.name, call.args, self.hwnds))
+            for call in calls
+        ]
+        errors = 0
+        started = self.clock()
+        for timestamp, function, args in prepared:
+            if self.realtime:
+                delay = started + timestamp - self.clock()
+                if delay > 0:
+                    self.sleep(delay)
+            if not function(*args):
+                errors += 1
+        return ReplayStats(len(prepared), errors, self.clock() - started)
@@ -4,9 +4,11 @@
 """
 from __future__ import annotations
 
+import array
 import functools
 import itertools
 import math
+import numbers
 import typing
 
 from win_magnification import types
@@ -221,7 +223,11 @@ to get transition effect
 """
 
 
-def get_transition(start: Matrix.Linear, end: Matrix.Linear) -> 'Transition':
+def get_transition(
+    start: Matrix.Linear,
+    end: Matrix.Linear,
+    steps: typing.Optional[int] = None,
+) -> 'Transition':
     """
     | Make function which returns **start** moved towards **end**
     | with scale of **value** (param of that function):
@@ -243,8 +249,14 @@ def get_transition(start: Matrix.Linear, end: Matrix.Linear) -> 'Transition':
     >>> move(-1.4)
     (-14.0, -14.0, -14.0)
 
+    | Pass **steps** to get :class:`TransitionTable` baked for that many steps:
+    >>> move = get_transition((0, 0, 0), (10, 10, 10), steps=4)
+    >>> move(0.5), move(0.6)
+    ((5.0, 5.0, 5.0), (5.0, 5.0, 5.0))
+
     :param start: :abbr:`Initial state (transit from)`
     :param end: :abbr:`Final state (transit to)`
+    :param steps: Count of steps to bake transition for (default: don't bake)
     :return: Transition function from **start** to **end** matrix
     """
     diff = tuple(
@@ -265,12 +277,247 @@ def get_transition(start: Matrix.Linear, end: Matrix.Linear) -> 'Transition':
             start[i] + diff[i] * value for i in range(len(start))
         )
 
+    if steps is not None:
+        return TransitionTable(transit, steps)
     return transit
 
 
-def combine_matrices(first: Matrix.Linear, second: Matrix.Linear):
+class TransitionTable:
+    """
+    | :data:`Transition` baked into contiguous float32 table of frames
+    | for **steps** evenly distributed values between 0 and 1
+    | Calling table gives nearest frame, values out of 0..1 bounds
+      are computed by the original **transition**
+    | First and last frames are returned as Python floats rounded to 9 decimal digits
+      (regardless of :attr:`Matrix.precision`), other frames are float32 values
+      (about 7 significant digits)
+    | Example:
+
+    >>> table = TransitionTable(get_transition((0, 0), (1, 2)), steps=4)
+    >>> table(0.25), table(0.3), table(1)
+    ((0.25, 0.5), (0.25, 0.5), (1.0, 2.0))
+    >>> table.interpolate(0.375)
+    (0.375, 0.75)
+    >>> table(2)
+    (2.0, 4.0)
+    >>> table.frame(2).tolist()
+    [0.5, 1.0]
+    >>> TransitionTable(get_transition((0,), (1,)), steps=0)
+    Traceback (most recent call last):
+    ...
+    ValueError: Steps count must be positive
+    """
+
+    def __init__(self, transition: Transition, steps: int):
+        """
+        :param transition: Function to bake, one of :mod:`.effects` or result of :func:`get_transition`
+        :param steps: Count of steps between 0 and 1 (frames count is **steps** + 1)
+        :raises ValueError: On non-positive **steps**
+        """
+        if steps < 1:
+            raise ValueError("Steps count must be positive")
+        self.transition = transition
+        """
+        | Original transition
+        | |Accessors: Get|
+        """
+        self.steps = steps
+        """
+        | Count of steps between 0 and 1
+        | |Accessors: Get|
+        """
+        accuracy = Matrix._ACCURACY
+        self._first = tuple(round(float(element), accuracy) for element in transition(0.0))
+        self._last = tuple(round(float(element), accuracy) for element in transition(1.0))
+        self.size = len(self._first)
+        """
+        | Count of elements in each frame
+        | |Accessors: Get|
+        """
+        self.table = array.array('f', itertools.chain(
+            self._first,
+            itertools.chain.from_iterable(
+                transition(i / steps) for i in range(1, steps)
+            ),
+            self._last,
+        ))
+        """
+        | All frames one after another
+        | |Accessors: Get|
+        """
+        self._view = memoryview(self.table)
+
+    def index(self, value: typing.Union[float, int]) -> typing.Optional[int]:
+        """
+        :param value: Float scale of transition
+        :return: Index of frame nearest to **value** or None if it's out of 0..1 bounds
+        """
+        if not 0.0 <= value <= 1.0:
+            return None
+        return int(value * self.steps + 0.5)
+
+    def frame(self, index: int) -> memoryview:
+        """
+        :param index: Frame number (0 <= **index** <= **steps**)
+        :return: Float32 view of frame, without copying
+        """
+        size = self.size
+        return self._view[index * size:(index + 1) * size]
+
+    def __call__(self, value: typing.Union[float, int] = 1.0) -> Matrix.Linear:
+        index = self.index(value)
+        if index is None:
+            return self.transition(value)
+        if index == 0:
+            return self._first
+        if index == self.steps:
+            return self._last
+        return tuple(self.frame(index))
+
+    def interpolate(self, value: typing.Union[float, int] = 1.0) -> Matrix.Linear:
+        """
+        | Linearly interpolates between two frames nearest to **value**
+        | Values out of 0..1 bounds are computed by the original **transition**
+
+        :param value: Float scale of transition
+        :return: Transition state for **value**
+        """
+        if not 0.0 <= value <= 1.0:
+            return self.transition(value)
+        position = value * self.steps
+        index = min(int(position), self.steps - 1)
+        weight = position - index
+        low, high = self.frame(index), self.frame(index + 1)
+        return tuple(
+            a + (b - a) * weight for a, b in zip(low, high)
+        )
+
+
+def _combine_3x3(first: Matrix.LinearLike, second: Matrix.LinearLike) -> Matrix.Linear:
+    (a00, a01, a02,
+     a10, a11, a12,
+     a20, a21, a22) = first
+    (b00, b01, b02,
+     b10, b11, b12,
+     b20, b21, b22) = second
+    if a20 == a21 == b20 == b21 == 0 and a22 == b22 == 1:
+        # Row-major product of affine transformations: last row stays (0, 0, 1)
+        return (
+            a00 * b00 + a01 * b10,
+            a00 * b01 + a01 * b11,
+            a00 * b02 + a01 * b12 + a02,
+            a10 * b00 + a11 * b10,
+            a10 * b01 + a11 * b11,
+            a10 * b02 + a11 * b12 + a12,
+            0.0, 0.0, 1.0,
+        )
+    # Row-major product, unrolled
+    return (
+        a00 * b00 + a01 * b10 + a02 * b20,
+        a00 * b01 + a01 * b11 + a02 * b21,
+        a00 * b02 + a01 * b12 + a02 * b22,
+        a10 * b00 + a11 * b10 + a12 * b20,
+        a10 * b01 + a11 * b11 + a12 * b21,
+        a10 * b02 + a11 * b12 + a12 * b22,
+        a20 * b00 + a21 * b10 + a22 * b20,
+        a20 * b01 + a21 * b11 + a22 * b21,
+        a20 * b02 + a21 * b12 + a22 * b22,
+    )
+
+
+def _combine_5x5(first: Matrix.LinearLike, second: Matrix.LinearLike) -> Matrix.Linear:
+    (a00, a01, a02, a03, a04,
+     a10, a11, a12, a13, a14,
+     a20, a21, a22, a23, a24,
+     a30, a31, a32, a33, a34,
+     a40, a41, a42, a43, a44) = first
+    (b00, b01, b02, b03, b04,
+     b10, b11, b12, b13, b14,
+     b20, b21, b22, b23, b24,
+     b30, b31, b32, b33, b34,
+     b40, b41, b42, b43, b44) = second
+    if a04 == a14 == a24 == a34 == b04 == b14 == b24 == b34 == 0 and a44 == b44 == 1:
+        # Row-major product of affine color transformations: last column stays (0, 0, 0, 0, 1)
+        return (
+            a00 * b00 + a01 * b10 + a02 * b20 + a03 * b30,
+            a00 * b01 + a01 * b11 + a02 * b21 + a03 * b31,
+            a00 * b02 + a01 * b12 + a02 * b22 + a03 * b32,
+            a00 * b03 + a01 * b13 + a02 * b23 + a03 * b33,
+            0.0,
+            a10 * b00 + a11 * b10 + a12 * b20 + a13 * b30,
+            a10 * b01 + a11 * b11 + a12 * b21 + a13 * b31,
+            a10 * b02 + a11 * b12 + a12 * b22 + a13 * b32,
+            a10 * b03 + a11 * b13 + a12 * b23 + a13 * b33,
+            0.0,
+            a20 * b00 + a21 * b10 + a22 * b20 + a23 * b30,
+            a20 * b01 + a21 * b11 + a22 * b21 + a23 * b31,
+            a20 * b02 + a21 * b12 + a22 * b22 + a23 * b32,
+            a20 * b03 + a21 * b13 + a22 * b23 + a23 * b33,
+            0.0,
+            a30 * b00 + a31 * b10 + a32 * b20 + a33 * b30,
+            a30 * b01 + a31 * b11 + a32 * b21 + a33 * b31,
+            a30 * b02 + a31 * b12 + a32 * b22 + a33 * b32,
+            a30 * b03 + a31 * b13 + a32 * b23 + a33 * b33,
+            0.0,
+            a40 * b00 + a41 * b10 + a42 * b20 + a43 * b30 + b40,
+            a40 * b01 + a41 * b11 + a42 * b21 + a43 * b31 + b41,
+            a40 * b02 + a41 * b12 + a42 * b22 + a43 * b32 + b42,
+            a40 * b03 + a41 * b13 + a42 * b23 + a43 * b33 + b43,
+            1.0,
+        )
+    # Row-major product, unrolled
+    return (
+        a00 * b00 + a01 * b10 + a02 * b20 + a03 * b30 + a04 * b40,
+        a00 * b01 + a01 * b11 + a02 * b21 + a03 * b31 + a04 * b41,
+        a00 * b02 + a01 * b12 + a02 * b22 + a03 * b32 + a04 * b42,
+        a00 * b03 + a01 * b13 + a02 * b23 + a03 * b33 + a04 * b43,
+        a00 * b04 + a01 * b14 + a02 * b24 + a03 * b34 + a04 * b44,
+        a10 * b00 + a11 * b10 + a12 * b20 + a13 * b30 + a14 * b40,
+        a10 * b01 + a11 * b11 + a12 * b21 + a13 * b31 + a14 * b41,
+        a10 * b02 + a11 * b12 + a12 * b22 + a13 * b32 + a14 * b42,
+        a10 * b03 + a11 * b13 + a12 * b23 + a13 * b33 + a14 * b43,
+        a10 * b04 + a11 * b14 + a12 * b24 + a13 * b34 + a14 * b44,
+        a20 * b00 + a21 * b10 + a22 * b20 + a23 * b30 + a24 * b40,
+        a20 * b01 + a21 * b11 + a22 * b21 + a23 * b31 + a24 * b41,
+        a20 * b02 + a21 * b12 + a22 * b22 + a23 * b32 + a24 * b42,
+        a20 * b03 + a21 * b13 + a22 * b23 + a23 * b33 + a24 * b43,
+        a20 * b04 + a21 * b14 + a22 * b24 + a23 * b34 + a24 * b44,
+        a30 * b00 + a31 * b10 + a32 * b20 + a33 * b30 + a34 * b40,
+        a30 * b01 + a31 * b11 + a32 * b21 + a33 * b31 + a34 * b41,
+        a30 * b02 + a31 * b12 + a32 * b22 + a33 * b32 + a34 * b42,
+        a30 * b03 + a31 * b13 + a32 * b23 + a33 * b33 + a34 * b43,
+        a30 * b04 + a31 * b14 + a32 * b24 + a33 * b34 + a34 * b44,
+        a40 * b00 + a41 * b10 + a42 * b20 + a43 * b30 + a44 * b40,
+        a40 * b01 + a41 * b11 + a42 * b21 + a43 * b31 + a44 * b41,
+        a40 * b02 + a41 * b12 + a42 * b22 + a43 * b32 + a44 * b42,
+        a40 * b03 + a41 * b13 + a42 * b23 + a43 * b33 + a44 * b43,
+        a40 * b04 + a41 * b14 + a42 * b24 + a43 * b34 + a44 * b44,
+    )
+
+
+def _combine_generic(first: Matrix.LinearLike, second: Matrix.LinearLike) -> Matrix.Linear:
+    row_len = get_matrix_side(len(first))
+    return tuple(itertools.chain(*([sum(
+        a * b for a, b in zip(
+            first[i * row_len:(1 + i) * row_len],
+            second[j::row_len]
+        )) for j in range(row_len)
+    ] for i in range(row_len)
+    )))
+
+
+_COMBINERS: typing.Dict[int, typing.Callable[[Matrix.LinearLike, Matrix.LinearLike], Matrix.Linear]] = {
+    9: _combine_3x3,
+    25: _combine_5x5,
+}
+"""Unrolled multiplication for transformation and color matrices"""
+
+
+def combine_matrices(first: Matrix.LinearLike, second: Matrix.LinearLike) -> Matrix.Linear:
     """
     | Multiplies matrices, can be used to combine color transformations
+    | 3x3 and 5x5 matrices are multiplied by unrolled code,
+      which also skips fixed row/column of affine transformations
     | Example:
     >>> A = (1, 2, 3, 4)
     >>> B = (5, 6, 7, 8)
@@ -280,22 +527,76 @@ def combine_matrices(first: Matrix.Linear, second: Matrix.Linear):
     Traceback (most recent call last):
     ...
     ValueError: Matrices must be the same size!
+    >>> combine_matrices(get_transform_matrix(2.0, 2.0), get_transform_matrix(1.0, 1.0, 3.0, 4.0))
+    (2.0, 0.0, -6.0, 0.0, 2.0, -8.0, 0.0, 0.0, 1.0)
 
     :param first: Matrix A
     :param second: Matrix B
     :return: A*B
     :raises ValueError: On matrices sizes mismatch
     """
-    if len(first) != len(second):
+    size = len(first)
+    if size != len(second):
         raise ValueError("Matrices must be the same size!")
-    row_len = get_matrix_side(len(first))
-    return tuple(itertools.chain(*([sum(
-        a * b for a, b in zip(
-            first[i * row_len:(1 + i) * row_len],
-            second[j::row_len]
-        )) for j in range(row_len)
-    ] for i in range(row_len)
-    )))
+    return _COMBINERS.get(size, _combine_generic)(first, second)
+
+
+def combine_chain(matrices: typing.Iterable[Matrix.LinearLike]) -> Matrix.Linear:
+    """
+    | Multiplies all **matrices** one by one (first applied first)
+    | Example:
+    >>> combine_chain([(1, 2, 3, 4), (5, 6, 7, 8), (1, 0, 0, 1)])
+    (19, 22, 43, 50)
+    >>> combine_chain([])
+    Traceback (most recent call last):
+    ...
+    ValueError: No matrices to combine
+
+    :param matrices: Matrices of the same size
+    :return: Product of all **matrices**
+    :raises ValueError: On matrices sizes mismatch or if there are no matrices
+    """
+    iterator = iter(matrices)
+    try:
+        result = tuple(next(iterator))
+    except StopIteration:
+        raise ValueError("No matrices to combine") from None
+    size = len(result)
+    combine = _COMBINERS.get(size, _combine_generic)
+    for matrix in iterator:
+        if len(matrix) != size:
+            raise ValueError("Matrices must be the same size!")
+        result = combine(result, matrix)
+    return result
+
+
+def combine_each(
+    matrix: Matrix.LinearLike,
+    matrices: typing.Iterable[Matrix.LinearLike],
+    before: bool = True,
+) -> typing.List[Matrix.Linear]:
+    """
+    | Multiplies **matrix** with each of **matrices**
+    | Example:
+    >>> combine_each((1, 2, 3, 4), [(1, 0, 0, 1), (5, 6, 7, 8)])
+    [(1, 2, 3, 4), (19, 22, 43, 50)]
+    >>> combine_each((1, 2, 3, 4), [(5, 6, 7, 8)], before=False)
+    [(23, 34, 31, 46)]
+
+    :param matrix: Matrix A
+    :param matrices: Matrices B of the same size
+    :param before: Compute A*B if True, B*A otherwise
+    :return: Products for each of **matrices**
+    :raises ValueError: On matrices sizes mismatch
+    """
+    size = len(matrix)
+    combine = _COMBINERS.get(size, _combine_generic)
+    result = []
+    for other in matrices:
+        if len(other) != size:
+            raise ValueError("Matrices must be the same size!")
+        result.append(combine(matrix, other) if before else combine(other, matrix))
+    return result
 
 
 def replace(func: typing.Callable) -> typing.Callable:
@@ -327,6 +628,7 @@ def replace(func: typing.Callable) -> typing.Callable:
 class Matrix:
     """
     :abbr:`Matrix (from linear algebra)` wrapper
+    | Values stored in compact float array, rounding is opt-in with **precision**
 
     .. automethod:: __str__
     .. automethod:: __matmul__
@@ -336,6 +638,7 @@ class Matrix:
     .. automethod:: __neg__
 
     """
+    __slots__ = ('_value', '_size', '_side_size', '_precision')
 
     Linear: 'typing.TypeAlias' = typing.Tuple[float, ...]
     """
@@ -367,22 +670,63 @@ class Matrix:
     """
 
     _ACCURACY = 8+1
-    '''All elements round precision'''
+    '''Round precision used by wrappers of magnifier matrices'''
 
-    def __init__(self):
-        self._value: 'Matrix.Linear' = tuple()
+    def __init__(self, precision: typing.Optional[int] = None):
+        """
+        :param precision: Count of digits to round elements to (default: don't round)
+        """
+        self._value: typing.Sequence[float] = self._pack(())
         self._size = 0
         self._side_size = 0
+        self._precision = precision
+
+    @staticmethod
+    def _pack(values: typing.Iterable[float]) -> typing.Sequence[float]:
+        return array.array('d', values)
+
+    @classmethod
+    def _new(cls, values: array.array, side_size: int, precision: typing.Optional[int]) -> Matrix:
+        # Skips all checks, values must be array of side_size ** 2 floats
+        matrix = Matrix.__new__(Matrix)
+        if precision is not None:
+            values = array.array('d', [round(element, precision) for element in values])
+        matrix._value = values
+        matrix._size = len(values)
+        matrix._side_size = side_size
+        matrix._precision = precision
+        return matrix
 
     def _resize(self, value: int):
+        side = math.isqrt(value)
+        if side * side != value:
+            raise ValueError("Matrix size must have natural square root!\n"
+                             f"Expect at least {side * side}, got {value}")
         self._size = value
-        side = get_matrix_side(self._size)
         self._side_size = side
-        side **= 2
-        if side != value:
-            raise ValueError("Matrix size must have natural square root!\n"
-                             f"Expect at least {side}, got {value}")
-        self._value = get_filled_matrix()
+        self._value = self._pack(get_filled_matrix(0.0, value))
+
+    @property
+    def precision(self) -> typing.Optional[int]:
+        """
+        | Count of digits elements rounded to on assignment, None to keep them as is
+        | Example:
+
+        >>> matrix = Matrix.from_linear((1/3, 1.0, 1.0, 1.0), precision=2)
+        >>> matrix.linear
+        (0.33, 1.0, 1.0, 1.0)
+        >>> (matrix * (1/3)).linear
+        (0.11, 0.33, 0.33, 0.33)
+        >>> Matrix.from_linear((1/3, 1.0, 1.0, 1.0)).linear[0] == 1/3
+        True
+
+        | |Accessors: Get Set|
+        """
+        return self._precision
+
+    @precision.setter
+    def precision(self, value: typing.Optional[int]):
+        self._precision = value
 
     @property
     def linear(self) -> Linear:
@@ -404,17 +748,20 @@ class Matrix:
 
         :raises ValueError: On size of new linear matrix musmatch the old one
         """
-        return self._value
+        return tuple(self._value)
 
     @linear.setter
     def linear(self, value: LinearLike) -> None:
         if len(value) != self._size:
             raise ValueError(f"Linear matrix size mismatch\n"
                              f"Expected {self._size}, got {len(value)}")
-        accuracy = self._ACCURACY
-        self._value = tuple(
-            round(float(element), accuracy) for element in value
-        )
+        precision = self._precision
+        if precision is None:
+            self._value = self._pack(array.array('d', value))
+        else:
+            self._value = self._pack([
+                round(float(element), precision) for element in value
+            ])
 
     @property
     def square(self) -> Square:
@@ -438,7 +785,7 @@ class Matrix:
 
         | |Accessors: Get Set|
         """
-        value = self._value
+        value = tuple(self._value)
         size = self._side_size
         return tuple(
             value[i * size:(i + 1) * size] for i in range(size)
@@ -473,11 +820,16 @@ class Matrix:
         TypeError: Can't multiply matrix and 'str'
 
         :raises TypeError: When unable to convert operand
+        :raises ValueError: On matrices sizes mismatch
         """
         matrix = self.from_any(other)
         if matrix is None:
             raise TypeError(f"Can't multiply matrix and {type(other).__name__!r}")
-        return Matrix.from_linear(combine_matrices(self.linear, matrix.linear))
+        return self._new(
+            array.array('d', combine_matrices(self._value, matrix._value)),
+            self._side_size,
+            self._precision,
+        )
 
     def __mul__(self, other: typing.Union[Any, int, float]):
         """
@@ -500,12 +852,26 @@ class Matrix:
         43.0  50.0
         """
         if isinstance(other, (int, float)):
-            origin_matrix = self._value
-            return Matrix.from_linear(tuple(
-                element * other for element in origin_matrix
-            ))
+            return self._new(
+                array.array('d', [element * other for element in self._value]),
+                self._side_size,
+                self._precision,
+            )
         return self @ other
 
+    def _elementwise(self, other: typing.Union[Any, int, float], sign: float) -> typing.Optional[Matrix]:
+        if isinstance(other, (int, float)):
+            other = sign * other
+            values = [element + other for element in self._value]
+        else:
+            matrix = self.from_any(other)
+            if matrix is None:
+                return None
+            if matrix._size != self._size:
+                raise ValueError("Matrices must be the same size!")
+            values = [a + sign * b for a, b in zip(self._value, matrix._value)]
+        return self._new(array.array('d', values), self._side_size, self._precision)
+
     def __add__(self, other: typing.Union[Any, int, float]):
         """
         | Add matrix/number to matrix
@@ -523,16 +889,12 @@ class Matrix:
         TypeError: Can't add 'str' to matrix
 
         :raises TypeError: When unable to convert operand
+        :raises ValueError: On matrices sizes mismatch
         """
-        if isinstance(other, (int, float)):
-            other = get_filled_matrix(float(other), self._size)
-        matrix = self.from_any(other)
-        if matrix is None:
+        result = self._elementwise(other, 1.0)
+        if result is None:
             raise TypeError(f"Can't add {type(other).__name__!r} to matrix")
-        matrix_a, matrix_b = self.linear, matrix.linear
-        return Matrix.from_linear(tuple(
-            matrix_a[i] + matrix_b[i] for i in range(len(matrix_b))
-        ))
+        return result
 
     def __sub__(self, other: typing.Union[Any, int, float]):
         """
@@ -551,16 +913,12 @@ class Matrix:
         TypeError: Can't subtract 'str' from matrix
 
         :raises TypeError: When unable to convert operand
+        :raises ValueError: On matrices sizes mismatch
         """
-        if isinstance(other, (int, float)):
-            other = get_filled_matrix(float(other), self._size)
-        matrix = self.from_any(other)
-        if matrix is None:
+        result = self._elementwise(other, -1.0)
+        if result is None:
             raise TypeError(f"Can't subtract {type(other).__name__!r} from matrix")
-        matrix_a, matrix_b = self.linear, matrix.linear
-        return Matrix.from_linear(tuple(
-            matrix_a[i] - matrix_b[i] for i in range(len(matrix_b))
-        ))
+        return result
 
     def __neg__(self):
         """
@@ -574,7 +932,7 @@ class Matrix:
         return self * -1
 
     @classmethod
-    def from_any(cls, value: Any) -> typing.Optional[Matrix]:
+    def from_any(cls, value: Any, precision: typing.Optional[int] = None) -> typing.Optional[Matrix]:
         """
         | Convert :abbr:`Linear (flat tuple)`/:abbr:`Square (tuple of tuples)` matrix
           to :class:`Matrix`
@@ -596,17 +954,26 @@ class Matrix:
 
         :param value: Source of raw data
         :type value: :attr:`Matrix.Any`
+        :param precision: Count of digits to round elements to (default: don't round)
         :return: Filled matrix, or None on conversion fails
         """
         if isinstance(value, Matrix):
             return value
-        matrix = cls.from_square(value)
+        try:
+            first = next(iter(value))
+        except (TypeError, StopIteration):
+            return cls.from_linear(value, precision)
+        # Numbers (including Fraction, Decimal, NumPy scalars) mean linear matrix,
+        # otherwise try both conversions
+        if isinstance(first, numbers.Number):
+            return cls.from_linear(value, precision)
+        matrix = cls.from_square(value, precision)
         if matrix is None:
-            matrix = cls.from_linear(value)
+            matrix = cls.from_linear(value, precision)
         return matrix
 
     @classmethod
-    def from_linear(cls, value: LinearLike) -> typing.Optional[Matrix]:
+    def from_linear(cls, value: LinearLike, precision: typing.Optional[int] = None) -> typing.Optional[Matrix]:
         """
         | Convert :abbr:`Linear (flat tuple)` matrix to :class:`Matrix`
         | Example:
@@ -620,12 +987,21 @@ class Matrix:
 
 
         :param value: Source of raw data
+        :param precision: Count of digits to round elements to (default: don't round)
         :return: Filled matrix, or None on conversion fails
         """
-
         try:
+            if cls is Matrix:
+                values = array.array('d', value)
+                size = len(values)
+                side = math.isqrt(size)
+                if side * side != size:
+                    return None
+                return cls._new(values, side, precision)
             size = len(value)
             matrix = cls()
+            if precision is not None:
+                matrix.precision = precision
             matrix._resize(size)
             matrix.linear = value
         except (TypeError, ValueError):
@@ -633,7 +1009,7 @@ class Matrix:
         return matrix
 
     @classmethod
-    def from_square(cls, value: SquareLike) -> typing.Optional[Matrix]:
+    def from_square(cls, value: SquareLike, precision: typing.Optional[int] = None) -> typing.Optional[Matrix]:
         """
         | Convert :abbr:`Square (tuple of tuples)` matrix
           to :class:`Matrix`
@@ -647,14 +1023,13 @@ class Matrix:
 
 
         :param value: Source of raw data
+        :param precision: Count of digits to round elements to (default: don't round)
         :return: Filled matrix, or None on conversion fails
         """
-
         try:
             size = len(value)
-            matrix = cls()
-            matrix._resize(size ** 2)
-            matrix.square = value
-        except (TypeError, ValueError):
+            if any(len(row) != size for row in value):
+                return None
+            return cls.from_linear(tuple(itertools.chain.from_iterable(value)), precision)
+        except TypeError:
             return None
-        return matrix
@@ -0,0 +1,263 @@
+"""
+| Keeping magnified area on target (like pointer)
+  and source of custom magnifier window in sync with it
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import time
+import typing
+
+from win_magnification import const
+from win_magnification import types
+
+Point: 'typing.TypeAlias' = typing.Tuple[int, int]
+"""
+Screen coordinates (x, y)
+"""
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return low if value < low else high if value > high else value
+
+
+class PointerFollower:
+    """
+    | Computes fullscreen magnifier offsets, which keep pointer in view
+    | Pointer moves freely inside **deadzone** (centered part of view),
+      view is moved only when pointer leaves it
+    | Offset emitted only when it actually changes,
+      other samples are counted in :attr:`suppressed`
+    | Example:
+
+    >>> follower = PointerFollower((0, 0, 1000, 1000), deadzone=0.5)
+    >>> stream = [(500, 500), (510, 505), (600, 500), (700, 500), (1000, 1000)]
+    >>> list(follower.follow(stream, scale=2.0))
+    [(250, 250), (325, 250), (500, 500)]
+    >>> follower.emitted, follower.suppressed
+    (3, 2)
+    """
+
+    def __init__(
+        self,
+        screen: types.Rectangle,
+        deadzone: float = 0.5,
+        smoothing: float = 0.0,
+        clamp_to_screen: bool = True,
+    ):
+        """
+        :param screen: Desktop rectangle (left, top, right, bottom) magnified
+        :param deadzone: Part of view (0 <= deadzone <= 1) pointer moves in without view movement,
+            use 0 to keep pointer centered
+        :param smoothing: Part of movement (0 <= smoothing < 1) postponed to the next samples,
+            use 0 to move view immediately
+        :param clamp_to_screen: Don't let view leave **screen**
+        :raises ValueError: On invalid arguments
+        """
+        if not 0 <= deadzone <= 1:
+            raise ValueError("Deadzone must be in range [0, 1]")
+        if not 0 <= smoothing < 1:
+            raise ValueError("Smoothing must be in range [0, 1)")
+        self.screen = screen
+        self.deadzone = deadzone
+        self.smoothing = smoothing
+        self.clamp_to_screen = clamp_to_screen
+        self.offset: typing.Optional[Point] = None
+        """
+        | Last offset emitted
+        | |Accessors: Get|
+        """
+        self.emitted = 0
+        """
+        | Count of samples, which moved view
+        | |Accessors: Get|
+        """
+        self.suppressed = 0
+        """
+        | Count of samples, which didn't move view
+        | |Accessors: Get|
+        """
+        self._position: typing.Optional[typing.Tuple[float, float]] = None
+
+    def reset(self, offset: typing.Optional[Point] = None):
+        """
+        Forgets view position, so next sample emits offset
+
+        :param offset: Current offset of view (default: unknown, center view on next sample)
+        """
+        self.offset = offset
+        self._position = None if offset is None else (float(offset[0]), float(offset[1]))
+
+    def update(self, position: Point, scale: float) -> typing.Optional[Point]:
+        """
+        Moves view to keep pointer in it
+
+        :param position: Pointer position
+        :param scale: Current magnification factor
+        :return: New offset, or None if view isn't moved
+        """
+        left, top, right, bottom = self.screen
+        width, height = (right - left) / scale, (bottom - top) / scale
+        if self._position is None:
+            x, y = position[0] - width / 2, position[1] - height / 2
+        else:
+            x, y = self._position
+            target_x = self._follow_axis(x, position[0], width)
+            target_y = self._follow_axis(y, position[1], height)
+            x += (target_x - x) * (1 - self.smoothing)
+            y += (target_y - y) * (1 - self.smoothing)
+        if self.clamp_to_screen:
+            x = _clamp(x, left, max(left, right - width))
+            y = _clamp(y, top, max(top, bottom - height))
+        limit = const.FULLSCREEN_OFFSET_LIMIT
+        x, y = _clamp(x, -limit, limit), _clamp(y, -limit, limit)
+        self._position = x, y
+        offset = round(x), round(y)
+        if offset == self.offset:
+            self.suppressed += 1
+            return None
+        self.offset = offset
+        self.emitted += 1
+        return offset
+
+    def follow(self, positions: typing.Iterable[Point], scale: float) -> typing.Iterator[Point]:
+        """
+        Feeds **positions** to :meth:`update`
+
+        :param positions: Pointer positions stream
+        :param scale: Current magnification factor
+        :return: Offsets emitted
+        """
+        for position in positions:
+            offset = self.update(position, scale)
+            if offset is not None:
+                yield offset
+
+    def _follow_axis(self, start: float, position: float, size: float) -> float:
+        margin = size * (1 - self.deadzone) / 2
+        if position < start + margin:
+            return position - margin
+        if position > start + size - margin:
+            return position - size + margin
+        return start
+
+
+class SourceTracker:
+    """
+    | Merges source rectangle changes of custom magnifier window
+      (like move, resize and paint notifications) into at most one write per frame
+    | :meth:`notify` only remembers rectangle, :meth:`flush` writes the latest one
+      if it actually changed
+    | Example:
+
+    >>> writes = []
+    >>> now = 0.0
+    >>> tracker = SourceTracker(writes.append, fps=10, clock=lambda: now)
+    >>> for x in range(5):
+    ...     tracker.notify((x, 0, 100, 100))
+    ...     _ = tracker.flush()
+    >>> tracker.pending
+    (4, 0, 100, 100)
+    >>> now = 0.1
+    >>> tracker.flush()
+    True
+    >>> tracker.notify((4, 0, 100, 100))
+    >>> tracker.flush(force=True)
+    False
+    >>> writes
+    [(0, 0, 100, 100), (4, 0, 100, 100)]
+    >>> tracker.notifications, tracker.writes, tracker.suppressed
+    (6, 2, 4)
+    """
+
+    def __init__(
+        self,
+        write: typing.Callable[[types.Rectangle], typing.Any],
+        fps: float = 60,
+        clock: typing.Callable[[], float] = time.perf_counter,
+    ):
+        """
+        :param write: Function to write source rectangle with (like :func:`.set_source` wrapper)
+        :param fps: Maximum count of writes per second
+        :param clock: Monotonic time source
+        :raises ValueError: If **fps** isn't positive
+        """
+        if fps <= 0:
+            raise ValueError("Frame rate must be positive")
+        self.write = write
+        self.interval = 1 / fps
+        """
+        | Minimal time between writes (in seconds)
+        | |Accessors: Get Set|
+        """
+        self.clock = clock
+        self.rectangle: typing.Optional[types.Rectangle] = None
+        """
+        | Last rectangle written
+        | |Accessors: Get|
+        """
+        self.pending: typing.Optional[types.Rectangle] = None
+        """
+        | Rectangle waiting for :meth:`flush`
+        | |Accessors: Get|
+        """
+        self.notifications = 0
+        """
+        | Count of rectangles received
+        | |Accessors: Get|
+        """
+        self.writes = 0
+        """
+        | Count of rectangles written
+        | |Accessors: Get|
+        """
+        self._written_at: typing.Optional[float] = None
+
+    @property
+    def suppressed(self) -> int:
+        """
+        | Count of rectangles merged into later ones, unchanged or still pending
+        | |Accessors: Get|
+        """
+        return self.notifications - self.writes
+
+    def reset(self):
+        """
+        Forgets rectangle written, so next one written even if unchanged
+        (use it when source may be changed elsewhere, like after window handle change)
+        """
+        self.rectangle = None
+        self._written_at = None
+
+    def notify(self, rectangle: types.Rectangle):
+        """
+        Remembers new source rectangle, replacing pending one
+
+        :param rectangle: Current source rectangle
+        """
+        self.notifications += 1
+        self.pending = tuple(rectangle)  # type: ignore
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        | Writes :attr:`pending` rectangle if it differs from written one
+          and :attr:`interval` passed since previous write
+        | Rectangle postponed by frame limit stays pending until next call
+
+        :param force: Ignore frame limit (when called once per frame already, like from frame timer)
+        :return: Was rectangle written
+        """
+        rectangle = self.pending
+        if rectangle is None:
+            return False
+        now = self.clock()
+        if not force and self._written_at is not None and now - self._written_at < self.interval:
+            return False
+        self.pending = None
+        if rectangle == self.rectangle:
+            return False
+        self.write(rectangle)
+        self.rectangle = rectangle
+        self._written_at = now
+        self.writes += 1
+        return True
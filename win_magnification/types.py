@@ -105,3 +105,17 @@ InputTransform: 'typing.TypeAlias' = typing.Tuple[bool, Rectangle, Rectangle]
   that defines the area of the screen where the magnified screen content is displayed.
 | Pen and touch input in this rectangle is mapped to the source rectangle.
 """
+
+
+class Snapshot(typing.NamedTuple):
+    """
+    | Whole state of Magnification API, see :meth:`.WinMagnificationAPI.snapshot`
+    | Window values are None, if no magnification window was bound
+    """
+    fullscreen_transform: FullscreenTransform
+    fullscreen_color_effect: ColorMatrix
+    input_transform: InputTransform
+    window_source: typing.Optional[Rectangle] = None
+    window_transform: typing.Optional[TransformationMatrix] = None
+    window_color_effect: typing.Optional[ColorMatrix] = None
+    window_filters: typing.Optional[typing.Tuple[int, ...]] = None
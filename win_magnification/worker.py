@@ -0,0 +1,170 @@
+"""
+| Dedicated thread which owns Magnification API and executes calls of any thread
+| Author: MaxBQb
+"""
+from __future__ import annotations
+
+import threading
+import typing
+from concurrent.futures import Future
+
+from win_magnification import _functional_wrapper
+
+T = typing.TypeVar('T')
+
+_Call: 'typing.TypeAlias' = typing.Tuple[Future, typing.Callable, tuple, dict]
+
+
+class MagnificationWorker:
+    """
+    | Thread which :func:`.initialize` Magnification API, executes submitted calls
+      and :func:`.finalize` it on :meth:`shutdown`
+    | Since Magnification API must be accessed from a single thread,
+      this is the way to drive it from many threads
+    | Calls queued between wakeups are executed as one batch,
+      so producers only contend for a short queue append
+    | Example:
+
+    >>> import win_magnification as mag
+    >>> with mag.use_backend(mag.backends.SimulatedBackend()):
+    ...     with MagnificationWorker() as worker:
+    ...         future = worker.submit(mag.set_fullscreen_transform, 2.0, (10, 20))
+    ...         worker.call(mag.get_fullscreen_transform)
+    (2.0, (10, 20))
+    """
+
+    def __init__(self, name: str = 'MagnificationWorker'):
+        """
+        :param name: Name of worker thread
+        """
+        self.name = name
+        self.batches = 0
+        """
+        | Count of wakeups with calls executed
+        | |Accessors: Get|
+        """
+        self._queue: typing.List[_Call] = []
+        self._condition = threading.Condition(threading.Lock())
+        self._thread: typing.Optional[threading.Thread] = None
+        self._closing = False
+
+    @property
+    def is_running(self) -> bool:
+        """
+        | Worker started and not yet stopped
+        | |Accessors: Get|
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_worker_thread(self) -> bool:
+        """
+        | Is current thread the worker one
+        | |Accessors: Get|
+        """
+        return self._thread is threading.current_thread()
+
+    def start(self) -> 'MagnificationWorker':
+        """
+        Starts worker thread and waits for Magnification API initialization
+
+        :return: This worker
+        :raises RuntimeError: If worker already started
+        :raises OSError: If initialization failed
+        """
+        if self._thread is not None:
+            raise RuntimeError("Worker can only be started once")
+        started: Future = Future()
+        self._thread = threading.Thread(target=self._run, args=(started,), name=self.name, daemon=True)
+        self._thread.start()
+        started.result()
+        return self
+
+    def submit(self, function: typing.Callable[..., T], *args, **kwargs) -> 'Future[T]':
+        """
+        Schedules **function** call on worker thread
+
+        :param function: Function to call
+        :param args: Positional arguments of **function**
+        :param kwargs: Keyword arguments of **function**
+        :return: Future result of call
+        :raises RuntimeError: If worker is shut down
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("Cannot submit calls after shutdown")
+            self._queue.append((future, function, args, kwargs))
+            # Worker drains whole queue per wakeup, so only first call notifies it
+            if len(self._queue) == 1:
+                self._condition.notify()
+        return future
+
+    def call(self, function: typing.Callable[..., T], *args, **kwargs) -> T:
+        """
+        Calls **function** on worker thread and waits for result.
+        Called from worker thread, calls **function** immediately
+
+        :param function: Function to call
+        :param args: Positional arguments of **function**
+        :param kwargs: Keyword arguments of **function**
+        :return: Result of **function**
+        :raises RuntimeError: If worker is shut down
+        """
+        if self.is_worker_thread:
+            return function(*args, **kwargs)
+        return self.submit(function, *args, **kwargs).result()
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stops accepting calls, executes (or cancels) queued ones,
+        then finalizes Magnification API
+
+        :param wait: Wait for worker thread to finish
+        :param cancel_pending: Cancel calls not yet started instead of executing them
+        """
+        with self._condition:
+            self._closing = True
+            if cancel_pending:
+                pending, self._queue = self._queue, []
+                for future, *_ in pending:
+                    future.cancel()
+            self._condition.notify()
+        if wait and self._thread is not None and not self.is_worker_thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MagnificationWorker':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def _run(self, started: Future):
+        try:
+            _functional_wrapper.initialize()
+        except BaseException as e:
+            with self._condition:
+                self._closing = True
+            started.set_exception(e)
+            return
+        started.set_result(None)
+        try:
+            while True:
+                with self._condition:
+                    while not self._queue and not self._closing:
+                        self._condition.wait()
+                    batch, self._queue = self._queue, []
+                    if not batch:
+                        break
+                self.batches += 1
+                for future, function, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        result = function(*args, **kwargs)
+                    except BaseException as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(result)
+        finally:
+            _functional_wrapper.finalize()